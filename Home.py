@@ -3,18 +3,18 @@ from datetime import datetime
 import calendar
 import sys
 from pathlib import Path
-import pandas as pd
-# Add the root directory to Python path
+# Add the root directory to Python path, once as the script reruns on every interaction
 root_path = Path(__file__).parent
-sys.path.append(str(root_path))
+if str(root_path) not in sys.path:
+    sys.path.append(str(root_path))
 
 from database.db_manager import (
     init_db,
-    init_settings_tables,
-    get_transactions,
-    get_category_thresholds
+    init_settings_tables
 )
 from utils.helpers import format_currency
+from utils.aggregates import compute_month_stats
+from utils.caching import refresh_data_version
 
 # Configure the page
 st.set_page_config(
@@ -24,33 +24,23 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Main title, drawn before the database work so the page paints right away
+st.title("Welcome to Money Manager 💰")
+
 # Initialize database and settings
 init_db()
 init_settings_tables()
 
-# Main title
-st.title("Welcome to Money Manager 💰")
-
 # Quick Stats Section
 def display_quick_stats():
-    df = get_transactions()
-    if not df.empty:
-        df['date'] = pd.to_datetime(df['date'])
-        current_month = datetime.now().month
-        current_year = datetime.now().year
-        
-        # Filter for current month
-        current_month_mask = (df['date'].dt.month == current_month) & \
-                           (df['date'].dt.year == current_year)
-        current_month_data = df[current_month_mask]
-        
-        # Calculate metrics
-        current_month_income = current_month_data[
-            current_month_data['type'] == 'Income'
-        ]['amount'].sum()
-        current_month_expenses = abs(current_month_data[
-            current_month_data['type'] == 'Expense'
-        ]['amount'].sum())
+    current_month = datetime.now().month
+    current_year = datetime.now().year
+    
+    # Cached per data version and precomputed at server start by utils.warmup
+    stats = compute_month_stats(refresh_data_version(), current_year, current_month)
+    if stats['has_transactions']:
+        current_month_income = stats['income']
+        current_month_expenses = stats['expenses']
         current_month_balance = current_month_income - current_month_expenses
         
         # Display metrics
@@ -84,45 +74,20 @@ def display_quick_stats():
         with col4:
             st.metric(
                 "Transactions",
-                len(current_month_data),
+                stats['transaction_count'],
                 help="Number of transactions this month"
             )
         
         # Check budget alerts
-        budget_df = get_category_thresholds()
-        if not budget_df.empty:
-            expenses_by_category = current_month_data[
-                current_month_data['type'] == 'Expense'
-            ].groupby('category')['amount'].sum().abs()
-            
-            alerts = []
-            for category in expenses_by_category.index:
-                budget_limit = budget_df[
-                    budget_df['category'] == category
-                ]['monthly_limit'].iloc[0] if len(budget_df[
-                    budget_df['category'] == category
-                ]) > 0 else 0.0
-                
-                if budget_limit > 0:
-                    spent = expenses_by_category[category]
-                    percentage = (spent / budget_limit) * 100
-                    
-                    if percentage >= 90:
-                        alerts.append({
-                            'category': category,
-                            'spent': spent,
-                            'budget': budget_limit,
-                            'percentage': percentage
-                        })
-            
-            if alerts:
-                st.warning("⚠️ Budget Alerts")
-                for alert in alerts:
-                    st.markdown(f"""
-                    - **{alert['category']}**: Spent {format_currency(alert['spent'])} 
-                    of {format_currency(alert['budget'])} 
-                    ({alert['percentage']:.1f}% of budget)
-                    """)
+        alerts = stats['budget_alerts']
+        if alerts:
+            st.warning("⚠️ Budget Alerts")
+            for alert in alerts:
+                st.markdown(f"""
+                - **{alert['category']}**: Spent {format_currency(alert['spent'])} 
+                of {format_currency(alert['budget'])} 
+                ({alert['percentage']:.1f}% of budget)
+                """)
 
 # Main content sections
 tab1, tab2 = st.tabs(["Getting Started", "Quick Stats"])
@@ -0,0 +1,69 @@
+"""Check that the data layer imports quickly and without Streamlit
+
+Usage: python benchmarks/core_import_check.py [--runs 5] [--budget-ms 100]
+
+Imports the modules batch jobs use in fresh interpreters and reports the
+median cold import time, measured with -X importtime, and any heavy module
+they pulled in. Exits with status 1 when the import is over budget or loads
+Streamlit, pandas, NumPy or PyArrow.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+root_path = Path(__file__).parent.parent
+
+CORE_MODULES = ['database.core', 'database.errors', 'utils.helpers']
+HEAVY_MODULES = ['streamlit', 'pandas', 'numpy', 'pyarrow']
+
+def import_once():
+    """Import the core modules in a fresh interpreter, returning the import time in ms and the heavy modules loaded"""
+    code = (f"import sys, {', '.join(CORE_MODULES)}\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=root_path, capture_output=True, text=True, check=True)
+
+    # importtime lines are "import time: self | cumulative | name", top-level
+    # modules aren't indented
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit() and not name.startswith('  '):
+            total_us += int(cumulative)
+    heavy = [m for m in result.stdout.strip().split(',') if m]
+    return total_us / 1000, heavy
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=100)
+    args = parser.parse_args()
+
+    times = []
+    heavy = set()
+    for _ in range(args.runs):
+        elapsed, loaded = import_once()
+        times.append(elapsed)
+        heavy.update(loaded)
+
+    median = statistics.median(times)
+    print(f"import {', '.join(CORE_MODULES)}: median {median:.1f} ms, "
+          f"max {max(times):.1f} ms over {args.runs} runs")
+
+    failed = False
+    if heavy:
+        print(f"FAILED: the core imported {', '.join(sorted(heavy))}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAILED: over the {args.budget_ms:g} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK: the core imports within budget and without heavy modules")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Time the reruns of the analytics and reports pages when a section's selector changes
+
+Usage: python benchmarks/fragment_rerun_benchmark.py [--rows 20000] [--repeat 5]
+                                                     [--before REV] [--after REV]
+
+Runs each page of two versions of the app with Streamlit's AppTest, against
+copies of one temporary database with --rows transactions: --before, by
+default the commit before the pages were split into fragments, and --after,
+by default the working tree. After a cold run the month selector of the
+monthly section is changed --repeat times, rerunning the whole script as
+AppTest does, and, when the section is a fragment, rerunning only the
+fragment as the browser does. Reports the median of each.
+
+AppTest has no API for fragment reruns; they are requested the way the
+server does, with a fragment scoped RerunData, so that column depends on
+Streamlit internals. data/transactions.db is never touched.
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root_path = Path(__file__).parent.parent
+
+BEFORE_FRAGMENTS = '73a6cd6^'
+
+# (name, page, label of the selector, function of the fragment holding it)
+SCENARIOS = [
+    ('analytics month', 'pages/3_data_visualization.py', 'Select Month', 'monthly_section'),
+    ('reports month', 'pages/7_Reports.py', 'Select Month', 'monthly_report'),
+]
+
+def find_fragment(at, function_name):
+    """Get the id of the fragment running function_name, None when the page has none"""
+    for fragment_id, fragment in at._fragment_storage._fragments.items():
+        wrapped = [cell.cell_contents for cell in fragment.__closure__ or []]
+        if any(getattr(item, '__name__', None) == function_name for item in wrapped):
+            return fragment_id
+    return None
+
+def child(tree, page, label, function_name, repeat):
+    """Run a scenario in this fresh interpreter and print the timings as JSON"""
+    from functools import partial
+    from unittest import mock
+
+    from streamlit.runtime.scriptrunner import RerunData
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    def selector(at):
+        return next(widget for widget in at.selectbox if widget.label == label)
+
+    def rerun(at, index, fragment_id=None):
+        start = time.perf_counter()
+        if fragment_id is None:
+            selector(at).select_index(index).run()
+        else:
+            scoped = partial(RerunData, fragment_id_queue=[fragment_id], is_fragment_scoped_rerun=True)
+            with mock.patch.object(local_script_runner, 'RerunData', scoped):
+                selector(at).select_index(index).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        return (time.perf_counter() - start) * 1000
+
+    at = AppTest.from_file(str(Path(tree) / page), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    # Alternate between the last two months, so every run changes the selection
+    n_options = len(selector(at).options)
+    indices = [n_options - 2 - i % 2 for i in range(repeat)]
+
+    full_ms = [rerun(at, index) for index in indices]
+    fragment_id = find_fragment(at, function_name)
+    fragment_ms = [rerun(at, index, fragment_id) for index in indices] if fragment_id is not None else None
+
+    print(json.dumps({
+        'cold_ms': cold_ms,
+        'full_rerun_ms': statistics.median(full_ms),
+        'fragment_rerun_ms': statistics.median(fragment_ms) if fragment_ms else None
+    }))
+
+def extract_tree(rev, destination):
+    """Copy the app at a git revision, or the working tree when rev is None, without its data"""
+    if rev is None:
+        shutil.copytree(root_path, destination, ignore=shutil.ignore_patterns('.git', 'data', '__pycache__'))
+        return
+    destination.mkdir()
+    archive = subprocess.run(['git', 'archive', rev], cwd=root_path, capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', str(destination)], input=archive.stdout, check=True)
+
+def create_database(db_path, n_rows, seed=0):
+    """Create a database with n_rows random transactions over the last two years"""
+    # Imported here, the children import the data layer of the tree they run
+    import numpy as np
+    import pandas as pd
+
+    sys.path.append(str(root_path))
+    from database import core
+
+    core.DB_PATH = db_path
+    core.init_db()
+    core.init_settings_tables()
+
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize()
+    income = rng.random(n_rows) < 0.1
+    amounts = np.round(rng.gamma(2, 30, n_rows), 2)
+    core.import_transactions(pd.DataFrame({
+        'date': (today - pd.to_timedelta(rng.integers(0, 730, n_rows), unit='D')).strftime('%Y-%m-%d'),
+        'type': np.where(income, 'Income', 'Expense'),
+        'category': np.where(income, 'Income', rng.choice(['Groceries', 'Housing', 'Utilities'], n_rows)),
+        'amount': np.where(income, amounts * 10, -amounts),
+        'comment': [f'row {i}' for i in range(n_rows)]
+    }))
+
+def run_scenario(tree, page, label, function_name, repeat):
+    """Run a scenario in a fresh interpreter inside tree"""
+    result = subprocess.run(
+        [sys.executable, __file__, '--child', str(tree), page, label, function_name, str(repeat)],
+        cwd=tree, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{page} in {tree} failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    if len(sys.argv) == 7 and sys.argv[1] == '--child':
+        tree = sys.argv[2]
+        sys.path.insert(0, tree)
+        child(tree, sys.argv[3], sys.argv[4], sys.argv[5], int(sys.argv[6]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5, help="Selector changes per kind of rerun")
+    parser.add_argument('--before', default=BEFORE_FRAGMENTS, help=f"Revision to compare, default {BEFORE_FRAGMENTS}")
+    parser.add_argument('--after', help="Revision to compare against it, default the working tree")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db_path = tmp / 'benchmark.db'
+        create_database(db_path, args.rows)
+
+        trees = {}
+        for name, rev in (('before', args.before), ('after', args.after)):
+            trees[name] = tmp / name
+            extract_tree(rev, trees[name])
+            # Every version reads data/transactions.db of its own tree
+            (trees[name] / 'data').mkdir()
+            shutil.copy(db_path, trees[name] / 'data' / 'transactions.db')
+
+        print(f"{'scenario':<18} {'version':<8} {'cold ms':>9} {'full rerun ms':>14} {'fragment rerun ms':>18}")
+        for scenario, page, label, function_name in SCENARIOS:
+            for name, tree in trees.items():
+                timings = run_scenario(tree, page, label, function_name, args.repeat)
+                fragment = timings['fragment_rerun_ms']
+                print(f"{scenario:<18} {name:<8} {timings['cold_ms']:>9.0f} {timings['full_rerun_ms']:>14.0f} "
+                      f"{fragment if fragment is not None else float('nan'):>18.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""Load-test concurrent sessions against a copy of the transactions database
+
+Usage: python benchmarks/load_test.py [--sessions 16] [--duration 10] [--mode thread|process]
+                                      [--journal-mode delete|wal] [--mix save=40,read=20,search=30,edit=10]
+                                      [--backend sqlite|memory]
+
+Every session runs a loop of db_manager calls picked from the mix, the way
+page reruns do, and the harness reports throughput, p50/p99 latency and the
+rate of "database is locked" errors per operation. Runs against a temporary
+database, data/transactions.db is never touched. --backend memory runs the
+same loop against MemoryBackend as a baseline without any I/O.
+"""
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the root directory to Python path
+root_path = Path(__file__).parent.parent
+sys.path.append(str(root_path))
+
+from database import core, db_manager
+from database.memory_backend import MemoryBackend
+
+OPERATIONS = ['save', 'read', 'search', 'edit']
+DEFAULT_MIX = 'save=40,read=20,search=30,edit=10'
+
+# Rows touched by a single editor save in the Transaction Management page
+EDIT_BATCH = 5
+
+CATEGORIES = ['Housing', 'Groceries', 'Food & Dining', 'Utilities', 'Shopping', 'Transportation']
+SEARCH_TERMS = ['', 'rent', 'Groceries', 'coffee', 'Food']
+
+class ErrorRecorder:
+    """Stand-in for streamlit in db_manager that records st.error messages per thread"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def error(self, message):
+        self.messages.append(str(message))
+
+    @property
+    def messages(self):
+        if not hasattr(self._local, 'messages'):
+            self._local.messages = []
+        return self._local.messages
+
+    def take(self):
+        """Return and clear the messages recorded by the calling thread"""
+        messages = list(self.messages)
+        self.messages.clear()
+        return messages
+
+def parse_mix(mix):
+    """Parse "op=weight,..." into a probability vector aligned with OPERATIONS"""
+    weights = dict.fromkeys(OPERATIONS, 0.0)
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        if name.strip() not in weights:
+            raise ValueError(f"Unknown operation in mix: {name}")
+        weights[name.strip()] = float(weight)
+    total = sum(weights.values())
+    return np.array([weights[op] / total for op in OPERATIONS])
+
+def create_database(db_path, n_rows, journal_mode, backend, seed=0):
+    """Create a database with n_rows random transactions"""
+    core.DB_PATH = db_path
+    if backend == 'memory':
+        core.set_backend(MemoryBackend())
+    db_manager.init_db()
+
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 1000, n_rows), unit='D')
+    types = np.where(rng.random(n_rows) < 0.2, 'Income', 'Expense')
+    amounts = np.round(rng.gamma(2, 40, n_rows), 2) * np.where(types == 'Income', 1, -1)
+    rows = pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'type': types,
+        'category': np.where(types == 'Income', 'Income', rng.choice(CATEGORIES, n_rows)),
+        'amount': amounts,
+        'comment': rng.choice(['-', 'rent', 'coffee', 'weekly shop'], n_rows)
+    })
+
+    if backend == 'memory':
+        db_manager.import_transactions(rows)
+        return
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(f'PRAGMA journal_mode={journal_mode}')
+    conn.executemany("INSERT INTO transactions (date, type, category, amount, comment) VALUES (?,?,?,?,?)",
+                     rows.itertuples(index=False))
+    conn.commit()
+    conn.close()
+
+def run_operation(op, rng, max_id):
+    """Run one db_manager call the way the matching page does"""
+    if op == 'save':
+        db_manager.save_transaction(
+            '2024-01-01', 'Expense', str(rng.choice(CATEGORIES)), -float(rng.integers(1, 200)), 'load test'
+        )
+    elif op == 'read':
+        db_manager.get_transactions()
+    elif op == 'search':
+        db_manager.search_transactions(str(rng.choice(SEARCH_TERMS)), min_amount=float(rng.integers(0, 50)))
+    elif op == 'edit':
+        # An editor save updates every changed row one call at a time
+        for transaction_id in rng.integers(1, max_id, EDIT_BATCH):
+            db_manager.update_transaction(
+                int(transaction_id), '2024-01-02', 'Expense',
+                str(rng.choice(CATEGORIES)), -float(rng.integers(1, 200)), 'edited'
+            )
+
+def run_session(session_id, db_path, duration, probabilities, max_id, recorder=None):
+    """Run one session's loop for duration seconds and return its samples"""
+    if recorder is None:
+        # Process workers install their own recorder
+        recorder = ErrorRecorder()
+        db_manager.st = recorder
+        core.DB_PATH = db_path
+
+    rng = np.random.default_rng(session_id)
+    samples = []
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        op = OPERATIONS[rng.choice(len(OPERATIONS), p=probabilities)]
+        start = time.perf_counter()
+        run_operation(op, rng, max_id)
+        latency = time.perf_counter() - start
+
+        errors = recorder.take()
+        samples.append((
+            op,
+            latency,
+            bool(errors),
+            any('database is locked' in message for message in errors)
+        ))
+
+    return samples
+
+def summarize(samples, elapsed):
+    """Aggregate samples into one row per operation plus a total row"""
+    df = pd.DataFrame(samples, columns=['operation', 'latency', 'error', 'locked'])
+
+    def stats(group):
+        latency_ms = group['latency'].to_numpy() * 1000
+        return pd.Series({
+            'ops': len(group),
+            'ops/s': len(group) / elapsed,
+            'p50 ms': np.percentile(latency_ms, 50),
+            'p99 ms': np.percentile(latency_ms, 99),
+            'error %': group['error'].mean() * 100,
+            'locked %': group['locked'].mean() * 100
+        })
+
+    rows = {op: stats(group) for op, group in df.groupby('operation')}
+    rows['total'] = stats(df)
+    return pd.DataFrame(rows).T
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds each session runs")
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--journal-mode', choices=['delete', 'wal'], default='delete')
+    parser.add_argument('--rows', type=int, default=20_000, help="Transactions in the seeded database")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="Operation weights, e.g. " + DEFAULT_MIX)
+    parser.add_argument('--backend', choices=['sqlite', 'memory'], default='sqlite')
+    args = parser.parse_args()
+    if args.backend == 'memory' and args.mode == 'process':
+        parser.error("the memory backend lives in one process, use --mode thread")
+
+    probabilities = parse_mix(args.mix)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'load_test.db'
+        create_database(db_path, args.rows, args.journal_mode, args.backend)
+
+        storage = f"journal_mode={args.journal_mode}" if args.backend == 'sqlite' else "memory backend"
+        print(f"{args.sessions} {args.mode} sessions for {args.duration:g}s, "
+              f"{storage}, {args.rows:,} rows, mix {args.mix}")
+
+        if args.mode == 'thread':
+            recorder = ErrorRecorder()
+            db_manager.st = recorder
+            with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+                futures = [
+                    pool.submit(run_session, i, db_path, args.duration, probabilities, args.rows, recorder)
+                    for i in range(args.sessions)
+                ]
+                samples = [s for future in futures for s in future.result()]
+        else:
+            with ProcessPoolExecutor(max_workers=args.sessions,
+                                     mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [
+                    pool.submit(run_session, i, db_path, args.duration, probabilities, args.rows)
+                    for i in range(args.sessions)
+                ]
+                samples = [s for future in futures for s in future.result()]
+
+    # Every session runs for the same duration, so throughput is measured over it
+    print(summarize(samples, args.duration).round(2).to_string())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Profile the cold start of every page: what it imports and how soon it paints
+
+Usage: python benchmarks/page_startup_profile.py [--rows 20000] [--top 6] [--page PATH ...]
+                                                 [--output FILE] [--baseline FILE]
+
+Each page runs with Streamlit's AppTest in a fresh interpreter that has only
+imported Streamlit, the way the first session after a server start finds it,
+against a temporary database with --rows transactions. Reports the time to
+the page's first element, the cold and warm script times and the modules
+the page imported, by cumulative -X importtime. Modules the test harness
+loads itself, pandas among them, don't show up. --output records the
+results as JSON, --baseline prints the change from such a recording.
+data/transactions.db is never touched.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the root directory to Python path
+root_path = Path(__file__).parent.parent
+sys.path.append(str(root_path))
+
+from database import core
+
+MARKER = 'page-startup-profile: page starts'
+
+def child(page, db_path):
+    """Run a page cold then warm in this fresh interpreter and print the timings as JSON"""
+    import time
+
+    import streamlit  # noqa: F401, imported by the server before any page
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+
+    first_delta = []
+    enqueue = ScriptRunContext.enqueue
+
+    def timed_enqueue(self, msg):
+        if not first_delta and msg.WhichOneof('type') == 'delta':
+            first_delta.append(time.perf_counter())
+        enqueue(self, msg)
+
+    ScriptRunContext.enqueue = timed_enqueue
+
+    # -X importtime lines after this one are the page's imports
+    print(MARKER, file=sys.stderr, flush=True)
+    core.DB_PATH = Path(db_path)
+
+    at = AppTest.from_file(str(root_path / page), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+    first_paint_ms = (first_delta[0] - start) * 1000 if first_delta else None
+
+    start = time.perf_counter()
+    at.run()
+    warm_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        'first_paint_ms': first_paint_ms,
+        'cold_ms': cold_ms,
+        'warm_ms': warm_ms,
+        'exceptions': [e.value for e in at.exception]
+    }))
+
+def page_imports(stderr):
+    """Get the modules imported after the marker with their cumulative import time in ms"""
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+
+    imports = {}
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level imports aren't indented
+        if cumulative.strip().isdigit() and not name.startswith('  '):
+            imports[name.strip()] = int(cumulative) / 1000
+    return imports
+
+def profile_page(page, db_path):
+    """Profile one page in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', __file__, '--child', page, str(db_path)],
+        cwd=root_path, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{page} failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['imports'] = page_imports(result.stderr)
+    return timings
+
+def create_database(db_path, n_rows, seed=0):
+    """Create a database with n_rows random transactions over the last two years"""
+    core.DB_PATH = db_path
+    core.init_db()
+    core.init_settings_tables()
+
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize()
+    income = rng.random(n_rows) < 0.1
+    amounts = np.round(rng.gamma(2, 30, n_rows), 2)
+    core.import_transactions(pd.DataFrame({
+        'date': (today - pd.to_timedelta(rng.integers(0, 730, n_rows), unit='D')).strftime('%Y-%m-%d'),
+        'type': np.where(income, 'Income', 'Expense'),
+        'category': np.where(income, 'Income', rng.choice(['Groceries', 'Housing', 'Utilities'], n_rows)),
+        'amount': np.where(income, amounts * 10, -amounts),
+        'comment': [f'row {i}' for i in range(n_rows)]
+    }))
+    core.update_category_threshold('Groceries', 500)
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--top', type=int, default=6, help="Imports listed per page")
+    parser.add_argument('--page', action='append', help="Page to profile, default all")
+    parser.add_argument('--output', type=Path, help="Write the results as JSON")
+    parser.add_argument('--baseline', type=Path, help="Results written by an earlier --output run")
+    args = parser.parse_args()
+    baseline = json.loads(args.baseline.read_text()) if args.baseline is not None else {}
+
+    pages = args.page or ['Home.py'] + sorted(
+        str(path.relative_to(root_path)) for path in (root_path / 'pages').glob('[0-9]*.py')
+    )
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'profile.db'
+        create_database(db_path, args.rows)
+
+        print(f"{'page':<36} {'first paint ms':>14} {'cold ms':>9} {'warm ms':>9}")
+        for page in pages:
+            timings = profile_page(page, db_path)
+            results[page] = timings
+
+            first_paint = timings['first_paint_ms']
+            print(f"{page:<36} {first_paint if first_paint is not None else float('nan'):>14.0f} "
+                  f"{timings['cold_ms']:>9.0f} {timings['warm_ms']:>9.0f}")
+            top_imports = sorted(timings['imports'].items(), key=lambda item: -item[1])[:args.top]
+            for name, ms in top_imports:
+                print(f"    {name:<32} {ms:>14.1f}")
+            for exception in timings['exceptions']:
+                print(f"    exception: {exception}")
+            if page in baseline:
+                before = baseline[page]
+                print(f"    {'change from baseline':<32} "
+                      f"{(first_paint or 0) - (before['first_paint_ms'] or 0):>+14.0f} "
+                      f"{timings['cold_ms'] - before['cold_ms']:>+9.0f} "
+                      f"{timings['warm_ms'] - before['warm_ms']:>+9.0f}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark recurring transaction generation with a large number of schedules
+
+Usage: python benchmarks/recurrence_benchmark.py [--schedules 100000]
+
+Runs against a temporary database, data/transactions.db is never touched.
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add the root directory to Python path
+root_path = Path(__file__).parent.parent
+sys.path.append(str(root_path))
+
+from database import core
+from utils.recurrence import FREQUENCIES, expand_occurrences
+
+def create_schedules(db_path, n_schedules, today, seed=0):
+    """Fill a fresh database with random schedules that all became due in the last 60 days"""
+    rng = np.random.default_rng(seed)
+    with mock.patch.object(core, 'DB_PATH', db_path):
+        core.init_db()
+
+    starts = today - pd.to_timedelta(rng.integers(0, 60, n_schedules), unit='D')
+    has_end = rng.random(n_schedules) < 0.3
+    ends = starts + pd.to_timedelta(rng.integers(0, 720, n_schedules), unit='D')
+    schedules = pd.DataFrame({
+        'start_date': starts.strftime('%Y-%m-%d'),
+        'type': np.where(rng.random(n_schedules) < 0.2, 'Income', 'Expense'),
+        'category': rng.choice(['Housing', 'Utilities', 'Insurance', 'Savings'], n_schedules),
+        'amount': np.round(rng.gamma(2, 50, n_schedules), 2),
+        'comment': '-',
+        'frequency': rng.choice(list(FREQUENCIES), n_schedules),
+        'end_date': np.where(has_end, ends.strftime('%Y-%m-%d'), None)
+    })
+    schedules['next_due_date'] = schedules['start_date']
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany("""INSERT INTO fixed_transactions
+                     (start_date, type, category, amount, comment, frequency, end_date, next_due_date)
+                     VALUES (?,?,?,?,?,?,?,?)""",
+                     schedules.itertuples(index=False))
+    conn.commit()
+    conn.close()
+
+def timed(label, func):
+    """Run func once and print how long it took"""
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<45} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+def generate_on(db_path, day):
+    """Run generate_recurring_transactions as if today were day"""
+    fake_datetime = mock.Mock(wraps=datetime)
+    fake_datetime.now.return_value = day
+    with mock.patch.object(core, 'DB_PATH', db_path), \
+         mock.patch.object(core, 'datetime', fake_datetime):
+        core.generate_recurring_transactions()
+
+def count_rows(db_path, table):
+    """Count the rows of a table"""
+    conn = sqlite3.connect(db_path)
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--schedules', type=int, default=100_000)
+    args = parser.parse_args()
+
+    today = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'benchmark.db'
+        timed(f"create {args.schedules:,} schedules", lambda: create_schedules(db_path, args.schedules, today))
+
+        with mock.patch.object(core, 'DB_PATH', db_path):
+            fixed_df = core.get_fixed_transactions()
+
+        occurrences = timed("expand all schedules over the next year",
+                            lambda: expand_occurrences(fixed_df, today, today + timedelta(days=365)))
+        print(f"{'':<45} {len(occurrences):>10,} occurrences")
+
+        timed("generate: backlog of the last 60 days", lambda: generate_on(db_path, today))
+        print(f"{'':<45} {count_rows(db_path, 'transactions'):>10,} transactions posted")
+
+        timed("generate: same day again (nothing due)", lambda: generate_on(db_path, today))
+        timed("generate: next day", lambda: generate_on(db_path, today + timedelta(days=1)))
+        timed("generate: one month later", lambda: generate_on(db_path, today + timedelta(days=31)))
+        print(f"{'':<45} {count_rows(db_path, 'transactions'):>10,} transactions posted")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Check that concurrent recurring generation never posts an occurrence twice
+
+Usage: python benchmarks/recurring_race_check.py [--schedules 2000] [--threads 8] [--processes 4] [--rounds 5]
+
+Each round creates due schedules in a temporary database, then runs
+generate_recurring_transactions from several threads and processes at the
+same moment, the way simultaneous page loads do. The posted rows must match
+the schedule expansion exactly. Exits with status 1 on any duplicate or
+missing occurrence.
+"""
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the root directory to Python path
+root_path = Path(__file__).parent.parent
+sys.path.append(str(root_path))
+
+from database import core
+from utils.recurrence import FREQUENCIES, expand_occurrences
+
+def create_schedules(db_path, n_schedules, seed):
+    """Create schedules that started in the last 90 days, each with a unique comment"""
+    core.DB_PATH = db_path
+    core.init_db()
+
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp(datetime.now().date())
+    schedules = pd.DataFrame({
+        'start_date': (today - pd.to_timedelta(rng.integers(0, 90, n_schedules), unit='D')).strftime('%Y-%m-%d'),
+        'type': 'Expense',
+        'category': 'Utilities',
+        'amount': -np.round(rng.gamma(2, 50, n_schedules), 2),
+        'comment': [f'schedule {i}' for i in range(n_schedules)],
+        'frequency': rng.choice(list(FREQUENCIES), n_schedules)
+    })
+    schedules['next_due_date'] = schedules['start_date']
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany("""INSERT INTO fixed_transactions
+                     (start_date, type, category, amount, comment, frequency, next_due_date)
+                     VALUES (?,?,?,?,?,?,?)""",
+                     schedules.itertuples(index=False))
+    conn.commit()
+    conn.close()
+
+def generate_in_threads(db_path, n_threads, start_at):
+    """Run generate_recurring_transactions from n_threads threads released together"""
+    core.DB_PATH = db_path
+    barrier = threading.Barrier(n_threads)
+
+    def run():
+        barrier.wait()
+        core.generate_recurring_transactions()
+
+    # Line the processes up on the same wall-clock moment as well
+    delay = start_at - datetime.now().timestamp()
+    if delay > 0:
+        threading.Event().wait(delay)
+
+    threads = [threading.Thread(target=run) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def check_round(db_path, n_schedules, n_threads, n_processes, pool, seed):
+    """Run one round and return the number of duplicate and missing occurrences"""
+    create_schedules(db_path, n_schedules, seed)
+    with sqlite3.connect(db_path) as conn:
+        fixed_df = pd.read_sql_query("SELECT * FROM fixed_transactions", conn)
+    expected = expand_occurrences(fixed_df, fixed_df['start_date'].min(), datetime.now())
+
+    start_at = datetime.now().timestamp() + 1
+    futures = [pool.submit(generate_in_threads, db_path, n_threads, start_at) for _ in range(n_processes)]
+    generate_in_threads(db_path, n_threads, start_at)
+    for future in futures:
+        future.result()
+
+    with sqlite3.connect(db_path) as conn:
+        posted = pd.read_sql_query("SELECT date, comment FROM transactions", conn)
+
+    posted_counts = posted.groupby(['date', 'comment']).size()
+    expected_counts = expected.groupby(['date', 'comment']).size()
+    counts = pd.concat([posted_counts, expected_counts], axis=1, keys=['posted', 'expected']).fillna(0)
+
+    duplicates = int((counts['posted'] - counts['expected']).clip(lower=0).sum())
+    missing = int((counts['expected'] - counts['posted']).clip(lower=0).sum())
+    print(f"round {seed}: {len(expected):,} occurrences expected, {len(posted):,} posted, "
+          f"{duplicates} duplicates, {missing} missing")
+    return duplicates, missing
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--schedules', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8, help="Threads per process")
+    parser.add_argument('--processes', type=int, default=4, help="Extra worker processes")
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max(args.processes, 1),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        for seed in range(args.rounds):
+            with tempfile.TemporaryDirectory() as tmp:
+                duplicates, missing = check_round(
+                    Path(tmp) / 'race.db', args.schedules, args.threads, args.processes, pool, seed
+                )
+                failures += duplicates + missing
+
+    if failures:
+        print("FAILED: concurrent generation posted duplicate or missing occurrences")
+        sys.exit(1)
+    print("OK: every occurrence was posted exactly once")
+
+if __name__ == '__main__':
+    main()
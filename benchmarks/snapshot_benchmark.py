@@ -0,0 +1,96 @@
+"""Benchmark loading all transactions from SQLite against the Arrow snapshot
+
+Usage: python benchmarks/snapshot_benchmark.py [--rows 5000000]
+
+Runs against a temporary database, data/transactions.db is never touched.
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add the root directory to Python path
+root_path = Path(__file__).parent.parent
+sys.path.append(str(root_path))
+
+from database import core
+from database.snapshot import get_snapshot_path, read_snapshot
+
+def create_transactions(db_path, n_rows, seed=0):
+    """Fill a fresh database with random transactions over the last five years"""
+    rng = np.random.default_rng(seed)
+    with mock.patch.object(core, 'DB_PATH', db_path):
+        core.init_db()
+
+    dates = pd.Timestamp('today').normalize() - pd.to_timedelta(rng.integers(0, 5 * 365, n_rows), unit='D')
+    rows = pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'type': np.where(rng.random(n_rows) < 0.2, 'Income', 'Expense'),
+        'category': rng.choice(['Housing', 'Food', 'Transportation', 'Utilities', 'Salary'], n_rows),
+        'amount': np.round(rng.gamma(2, 50, n_rows), 2),
+        'comment': rng.choice(['-', 'groceries', 'rent', 'fuel', 'power bill'], n_rows)
+    })
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO transactions (date, type, category, amount, comment) VALUES (?,?,?,?,?)",
+                     rows.itertuples(index=False))
+    conn.commit()
+    conn.close()
+
+def add_transactions(db_path, n_rows):
+    """Insert and update a few transactions, as a day of data entry would"""
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO transactions (date, type, category, amount, comment) VALUES (?,?,?,?,?)",
+                     [(pd.Timestamp('today').strftime('%Y-%m-%d'), 'Expense', 'Food', 12.5, 'lunch')] * n_rows)
+    conn.execute("UPDATE transactions SET amount = amount + 1 WHERE id <= ?", (n_rows,))
+    conn.commit()
+    conn.close()
+
+def timed(label, func):
+    """Run func once and print how long it took"""
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<45} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+def load_from_sqlite():
+    """Load every transaction the way load_transactions did before the snapshot"""
+    df = core.get_transactions()
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'benchmark.db'
+        timed(f"create {args.rows:,} transactions", lambda: create_transactions(db_path, args.rows))
+
+        with mock.patch.object(core, 'DB_PATH', db_path):
+            timed("load from SQLite and parse dates", load_from_sqlite)
+            timed("load with stale snapshot (rebuild)", core.get_transactions_snapshot)
+            timed("load with current snapshot", core.get_transactions_snapshot)
+            timed("memory-map snapshot only",
+                  lambda: read_snapshot(get_snapshot_path(db_path)))
+
+            add_transactions(db_path, 100)
+            df = timed("load after 200 changes (incremental)", core.get_transactions_snapshot)
+            expected = load_from_sqlite()
+
+        size_mb = get_snapshot_path(db_path).stat().st_size / 1024 ** 2
+        print(f"{'snapshot size':<45} {size_mb:>10.1f} MB")
+
+        pd.testing.assert_frame_equal(df.sort_values('id', ignore_index=True),
+                                      expected.sort_values('id', ignore_index=True), check_dtype=False)
+        print("OK: snapshot matches the database")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import pandas as pd
+
+class StorageBackend:
+    """Interface of the storage behind database.core
+
+    database.core's functions call these methods, so pages and batch jobs
+    depend on it only and the storage can be swapped with core.set_backend.
+    Dates are ISO 'YYYY-MM-DD' strings and frames use the column names of the
+    SQLite schema. Methods raise on failure.
+    """
+
+    # Setup
+
+    def init_transactions(self):
+        """Create or migrate the transactions and fixed transactions storage"""
+        raise NotImplementedError
+
+    def migrate(self):
+        """Bring stored data up to the current schema"""
+
+    def init_settings(self):
+        """Create the settings, thresholds and custom categories storage with default settings"""
+        raise NotImplementedError
+
+    def get_shared_cache_path(self):
+        """Get where processes sharing this storage share computed results, None for no sharing"""
+        return None
+
+    # Transactions
+
+    def queue_transaction(self, date, trans_type, category, amount, comment):
+        """Store a new transaction, returning a Future resolving to its id"""
+        raise NotImplementedError
+
+    def import_transactions(self, rows):
+        """Store rows that have a content_hash not stored yet, returning how many were stored"""
+        raise NotImplementedError
+
+    def update_transaction(self, transaction_id, date, trans_type, category, amount, comment):
+        """Update a transaction, returning whether it was found"""
+        raise NotImplementedError
+
+    def delete_transaction(self, transaction_id):
+        """Delete a transaction, returning whether it was found"""
+        raise NotImplementedError
+
+    def get_transactions(self, years=None):
+        """Get the id, date, type, category, amount and comment of every transaction, or of some years"""
+        raise NotImplementedError
+
+    def load_transactions(self):
+        """Get every transaction with dates parsed, as fast as the storage allows"""
+        df = self.get_transactions()
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def get_transaction_by_id(self, transaction_id):
+        """Get one transaction as a Series, or None"""
+        raise NotImplementedError
+
+    def search_transactions(self, search_term="", min_amount=None, max_amount=None):
+        """Get the transactions whose comment or category contains a term, within amount bounds"""
+        raise NotImplementedError
+
+    def get_transaction_years(self):
+        """Get every year that has transactions, newest first"""
+        raise NotImplementedError
+
+    # Aggregates
+
+    def get_transactions_between(self, start_date, end_date):
+        """Get the transactions dated from start_date up to, but excluding, end_date"""
+        raise NotImplementedError
+
+    def get_expense_totals(self, start_date, end_date, category=None):
+        """Get absolute expense totals per category from start_date up to, but excluding, end_date"""
+        raise NotImplementedError
+
+    # Recurring transactions
+
+    def add_fixed_transaction(self, start_date, trans_type, category, amount, comment,
+                              frequency, end_date):
+        """Store a new fixed transaction whose first occurrence is due on start_date, returning its id"""
+        raise NotImplementedError
+
+    def get_fixed_transactions(self):
+        """Get every fixed transaction"""
+        raise NotImplementedError
+
+    def post_due_transactions(self, today):
+        """Post the occurrences due up to today exactly once and move the schedules past today"""
+        raise NotImplementedError
+
+    # Archives
+
+    def get_archived_years(self):
+        """Get the years moved to archive storage"""
+        return []
+
+    def archive_year(self, year):
+        """Move a year out of the main storage, returning the number of rows moved"""
+        raise NotImplementedError(f"{type(self).__name__} does not archive years")
+
+    def restore_year(self, year):
+        """Move an archived year back, returning the number of rows moved"""
+        raise NotImplementedError(f"{type(self).__name__} does not archive years")
+
+    def find_archived_year(self, transaction_id):
+        """Get the archived year holding a transaction, or None"""
+        return None
+
+    # Settings and categories
+
+    def get_setting(self, setting_key):
+        """Get a setting value, or None"""
+        raise NotImplementedError
+
+    def update_setting(self, setting_key, setting_value):
+        """Insert or replace a setting"""
+        raise NotImplementedError
+
+    def get_category_thresholds(self):
+        """Get the category and monthly_limit of every threshold"""
+        raise NotImplementedError
+
+    def update_category_threshold(self, category, monthly_limit):
+        """Insert or replace a category threshold"""
+        raise NotImplementedError
+
+    def get_custom_categories(self):
+        """Get the custom categories"""
+        raise NotImplementedError
+
+    def add_custom_category(self, category):
+        """Add a custom category, ignoring existing ones"""
+        raise NotImplementedError
+
+    def delete_custom_category(self, category):
+        """Delete a custom category"""
+        raise NotImplementedError
+
+    # Change journal
+
+    def get_change_seq(self):
+        """Get the seq of the latest change, 0 before the first one"""
+        raise NotImplementedError
+
+    def get_changes(self, since_seq, tables=None):
+        """Get the changes after since_seq, oldest first, or None when they are no longer known"""
+        raise NotImplementedError
+
+    def prune_changes(self, keep=None):
+        """Drop all but the latest keep changes (a backend default with None), returning how many were dropped"""
+        return 0
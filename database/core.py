@@ -0,0 +1,491 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from database.errors import (
+    ArchiveError,
+    ArchivedTransactionError,
+    MoneyManagerError,
+    StorageError,
+    TransactionNotFoundError
+)
+
+# Pandas, NumPy and the backends are imported where they are used, so batch
+# jobs importing this module don't pay for them up front.
+
+# Get the current directory
+current_dir = Path(__file__).parent.parent
+DB_PATH = current_dir / 'data' / 'transactions.db'
+
+DEFAULT_CATEGORIES = [
+    "Housing", "Transportation", "Groceries", "Food & Dining",
+    "Shopping", "Entertainment", "Healthcare", "Education",
+    "Utilities", "Insurance", "Savings", "Investments",
+    "Income", "Other"
+]
+
+TRANSACTION_COLUMNS = ['id', 'date', 'type', 'category', 'amount', 'comment']
+FIXED_TRANSACTION_COLUMNS = ['id', 'start_date', 'type', 'category', 'amount', 'comment',
+                             'last_generated_date', 'frequency', 'end_date', 'next_due_date']
+
+# Backend set with set_backend, None means SQLite on DB_PATH
+_backend = None
+
+def set_backend(backend):
+    """Store data in another StorageBackend, or in SQLite on DB_PATH again with None
+
+    Tests and benchmarks use this to run against, for example, a MemoryBackend.
+    """
+    global _backend
+    _backend = backend
+
+def get_backend():
+    """Get the storage backend every function of this module works on"""
+    if _backend is not None:
+        return _backend
+    from database.sqlite_backend import SqliteBackend
+    return SqliteBackend(DB_PATH)
+
+# Storage operations made by each thread, so a page can count its own
+_operations = threading.local()
+
+def get_operation_count():
+    """Get how many storage operations the calling thread has made through this module
+
+    An operation is one call of a function of this module, however many
+    queries the backend runs for it; calls made from inside it aren't
+    counted again.
+    """
+    return getattr(_operations, 'count', 0)
+
+@contextmanager
+def _storage_errors(action):
+    """Raise any failure other than our own errors as a StorageError naming the action
+
+    Also counts the operation for get_operation_count.
+    """
+    depth = getattr(_operations, 'depth', 0)
+    if depth == 0:
+        _operations.count = get_operation_count() + 1
+    _operations.depth = depth + 1
+    try:
+        yield
+    except MoneyManagerError:
+        raise
+    except Exception as e:
+        raise StorageError(f"Error {action}: {str(e)}") from e
+    finally:
+        _operations.depth = depth
+
+def init_db():
+    """Initialize the database and create the data directory if it doesn't exist"""
+    with _storage_errors("initializing database"):
+        get_backend().init_transactions()
+
+def queue_transaction(date, trans_type, category, amount, comment):
+    """Queue a new transaction for the writer and return a Future resolving to its id
+
+    Transactions queued together, from this or any other session, are
+    committed in one batch.
+    """
+    with _storage_errors("saving transaction"):
+        return get_backend().queue_transaction(date, trans_type, category, amount, comment)
+
+def save_transaction(date, trans_type, category, amount, comment):
+    """Save a new transaction and return its id"""
+    with _storage_errors("saving transaction"):
+        return queue_transaction(date, trans_type, category, amount, comment).result()
+
+def import_transactions(df):
+    """Import transactions, skipping rows that were already imported
+
+    df has date, type, category, amount (signed) and comment columns, plus an
+    optional external_id. Rows are matched on their content hash, so a row
+    already stored, in an archived year too, is skipped. Identical rows are
+    numbered within df, so df should hold one statement; rows of several
+    statements can be imported together when each was hashed on its own
+    into a content_hash column.
+    Returns the number of imported and skipped rows.
+    """
+    from utils.content_hash import content_hashes
+
+    with _storage_errors("importing transactions"):
+        rows = df.assign(
+            external_id=df['external_id'] if 'external_id' in df else None,
+            content_hash=df['content_hash'] if 'content_hash' in df else content_hashes(df)
+        )[['date', 'type', 'category', 'amount', 'comment', 'external_id', 'content_hash']]
+
+        imported = get_backend().import_transactions(rows)
+        return imported, len(rows) - imported
+
+def save_fixed_transaction(start_date, trans_type, category, amount, comment,
+                           frequency=None, end_date=None):
+    """Save a new fixed transaction and return its id
+
+    frequency defaults to utils.recurrence.DEFAULT_FREQUENCY.
+    """
+    if frequency is None:
+        from utils.recurrence import DEFAULT_FREQUENCY
+        frequency = DEFAULT_FREQUENCY
+
+    with _storage_errors("saving fixed transaction"):
+        return get_backend().add_fixed_transaction(start_date, trans_type, category, amount, comment,
+                                                   frequency, end_date)
+
+def get_fixed_transactions():
+    """Retrieve all fixed (recurring) transactions"""
+    with _storage_errors("retrieving fixed transactions"):
+        return get_backend().get_fixed_transactions()
+
+def generate_recurring_transactions():
+    """Post the occurrences of fixed transactions that are due up to today
+
+    Each occurrence is posted exactly once, even when several sessions or
+    processes run this at the same time.
+    """
+    with _storage_errors("generating recurring transactions"):
+        today = datetime.now().strftime('%Y-%m-%d')
+        get_backend().post_due_transactions(today)
+
+def get_scheduled_transactions(start_date, end_date):
+    """Get the occurrences of fixed transactions in a date range that haven't been posted yet"""
+    from utils.recurrence import pending_occurrences
+
+    fixed_df = get_fixed_transactions()
+    with _storage_errors("retrieving scheduled transactions"):
+        return pending_occurrences(fixed_df, start_date, end_date)
+
+def get_archived_years():
+    """Get the years that have been moved to archive databases"""
+    with _storage_errors("retrieving archived years"):
+        return get_backend().get_archived_years()
+
+def get_transaction_years():
+    """Get every year that has transactions, archived years included"""
+    with _storage_errors("retrieving transaction years"):
+        return get_backend().get_transaction_years()
+
+def archive_year(year):
+    """Move the transactions of a closed year into their own archive database
+
+    Rows keep their ids and can be moved back with restore_year. Returns the
+    number of rows archived.
+    """
+    if year >= datetime.now().year:
+        raise ArchiveError(f"Only past years can be archived, {year} is not closed yet")
+
+    with _storage_errors(f"archiving {year}"):
+        return get_backend().archive_year(year)
+
+def restore_year(year):
+    """Move an archived year back into the main database and remove its archive
+
+    Returns the number of rows restored.
+    """
+    if year not in get_archived_years():
+        raise ArchiveError(f"{year} is not archived")
+
+    with _storage_errors(f"restoring {year}"):
+        return get_backend().restore_year(year)
+
+def _not_found(transaction_id):
+    """Get the error for a transaction id that isn't in the main storage"""
+    year = get_backend().find_archived_year(int(transaction_id))
+    if year is not None:
+        return ArchivedTransactionError(transaction_id, year)
+    return TransactionNotFoundError(transaction_id)
+
+def get_transactions(years=None):
+    """Retrieve transactions from the database and its archives
+
+    Pending recurring transactions are posted first. With a list of years
+    only those years are read: the main table through its date index, plus
+    the archives of the ones that are archived.
+    """
+    generate_recurring_transactions()
+
+    with _storage_errors("retrieving transactions"):
+        return get_backend().get_transactions(years)
+
+def get_transactions_snapshot():
+    """Retrieve all transactions with parsed dates from the columnar snapshot
+
+    The snapshot is a memory-mapped Arrow file, so loading it takes
+    milliseconds, and it is brought up to date from the change journal.
+    """
+    # Pending recurring transactions must be written before loading
+    generate_recurring_transactions()
+
+    with _storage_errors("loading transactions snapshot"):
+        return get_backend().load_transactions()
+
+def get_change_seq():
+    """Get the seq of the latest change in the change journal, 0 before the first one"""
+    with _storage_errors("reading change journal"):
+        return get_backend().get_change_seq()
+
+def get_changes(since_seq, tables=None):
+    """Get the changes recorded after since_seq, oldest first
+
+    Consumers remember the seq they are current for and apply only these
+    rows: table_name, row_key (the id, setting key or category of the row)
+    and operation ('insert', 'update' or 'delete'). Returns None when the
+    journal has been pruned past since_seq, the consumer then has to reload
+    everything.
+    """
+    with _storage_errors("reading change journal"):
+        return get_backend().get_changes(since_seq, tables)
+
+def prune_change_journal(keep=None):
+    """Drop all but the latest keep changes of the change journal, returning how many were dropped
+
+    Consumers behind the dropped changes reload everything. Runs at warm-up
+    and from the maintenance command, never on page loads.
+    """
+    with _storage_errors("pruning change journal"):
+        return get_backend().prune_changes(keep)
+
+def get_data_version():
+    """Return a token that changes whenever journaled data changes, None if unknown
+
+    The token is the latest seq of the change journal, so every server
+    process using the database sees the same token, and WAL checkpoints or
+    other writes that don't change the data don't invalidate caches.
+    """
+    try:
+        return str(get_change_seq())
+    except MoneyManagerError:
+        return None
+
+def init_settings_tables():
+    """Initialize the settings tables in the database"""
+    with _storage_errors("initializing settings tables"):
+        get_backend().init_settings()
+
+def get_setting(setting_key):
+    """Get a single setting value, None if it isn't set"""
+    with _storage_errors("retrieving setting"):
+        return get_backend().get_setting(setting_key)
+
+def update_setting(setting_key, setting_value):
+    """Update a single setting"""
+    with _storage_errors("updating setting"):
+        get_backend().update_setting(setting_key, setting_value)
+
+def get_category_thresholds():
+    """Get all category thresholds"""
+    with _storage_errors("retrieving category thresholds"):
+        return get_backend().get_category_thresholds()
+
+def update_category_threshold(category, monthly_limit):
+    """Update or insert a category threshold"""
+    with _storage_errors("updating category threshold"):
+        get_backend().update_category_threshold(category, monthly_limit)
+
+def _month_range(year, month):
+    """Get the first day of a month and of the month after it as ISO dates"""
+    start_date = f"{year}-{month:02d}-01"
+    if month == 12:
+        end_date = f"{year + 1}-01-01"
+    else:
+        end_date = f"{year}-{month + 1:02d}-01"
+    return start_date, end_date
+
+def check_category_threshold(category, amount, date):
+    """Check if a transaction would exceed the monthly threshold
+
+    Returns whether it would, the threshold and the month's spending so far.
+    """
+    with _storage_errors("checking category threshold"):
+        backend = get_backend()
+
+        # Get the threshold for this category
+        thresholds = backend.get_category_thresholds().set_index('category')['monthly_limit']
+
+        if category in thresholds.index:
+            threshold = thresholds[category]
+
+            # Get total spending for this category from the start of the month up to the date
+            transaction_date = datetime.strptime(date, '%Y-%m-%d')
+            month_start = transaction_date.replace(day=1).strftime('%Y-%m-%d')
+            day_after = (transaction_date + timedelta(days=1)).strftime('%Y-%m-%d')
+            current_total = backend.get_expense_totals(month_start, day_after, category).sum()
+
+            # Check if adding this amount would exceed the threshold
+            if (current_total + abs(amount)) > threshold:
+                return True, threshold, current_total
+
+        return False, 0, 0
+
+def update_transaction(transaction_id, date, trans_type, category, amount, comment):
+    """Update an existing transaction
+
+    Raises TransactionNotFoundError, or ArchivedTransactionError when its year
+    is archived, if there is no such transaction to update.
+    """
+    # Convert amount to float and ensure it's negative for expenses
+    amount = float(amount)
+    if trans_type == "Expense" and amount > 0:
+        amount = -amount
+
+    with _storage_errors("updating transaction"):
+        if not get_backend().update_transaction(
+            int(transaction_id), date, trans_type, category, amount, str(comment)
+        ):
+            raise _not_found(transaction_id)
+
+def delete_transaction(transaction_id):
+    """Delete a transaction by its ID
+
+    Raises TransactionNotFoundError, or ArchivedTransactionError when its year
+    is archived, if there is no such transaction to delete.
+    """
+    with _storage_errors("deleting transaction"):
+        if not get_backend().delete_transaction(int(transaction_id)):
+            raise _not_found(transaction_id)
+
+def search_transactions(search_term="", min_amount=None, max_amount=None):
+    """Search transactions based on various criteria, archived years included"""
+    with _storage_errors("searching transactions"):
+        return get_backend().search_transactions(search_term, min_amount, max_amount)
+
+def generate_monthly_report(year, month):
+    """Generate a monthly financial report
+
+    Returns the month's transactions and a summary, empty when there are none.
+    """
+    from utils.budget import compute_budget_status
+
+    with _storage_errors("generating monthly report"):
+        # Get transactions for the specified month
+        df = get_backend().get_transactions_between(*_month_range(year, month))
+
+        if df.empty:
+            return df, {}
+
+        # Calculate summary statistics
+        summary = {
+            'total_income': df[df['type'] == 'Income']['amount'].sum(),
+            'total_expenses': abs(df[df['type'] == 'Expense']['amount'].sum()),
+            'transaction_count': len(df),
+            'category_breakdown': df[df['type'] == 'Expense'].groupby('category')['amount'].sum().abs(),
+            'daily_expenses': df[df['type'] == 'Expense'].groupby('date')['amount'].sum().abs()
+        }
+
+        # Get category thresholds and calculate budget status
+        thresholds_df = get_backend().get_category_thresholds()
+        budget_status = compute_budget_status(
+            summary['category_breakdown'],
+            thresholds_df,
+            categories=thresholds_df['category']
+        )
+        for row in budget_status.itertuples(index=False):
+            summary[f'{row.category}_budget_status'] = {
+                'budget': row.budget,
+                'spent': row.spent,
+                'remaining': row.remaining,
+                'percentage': row.percentage
+            }
+
+        return df, summary
+
+def generate_yearly_report(year):
+    """Generate a yearly financial report
+
+    Returns the year's transactions with parsed dates and a summary, empty when
+    there are none.
+    """
+    import pandas as pd
+
+    with _storage_errors("generating yearly report"):
+        # Get transactions for the specified year
+        df = get_backend().get_transactions_between(f"{year}-01-01", f"{year + 1}-01-01")
+
+        if df.empty:
+            return df, {}
+
+        # Convert date to datetime for grouping
+        df['date'] = pd.to_datetime(df['date'])
+
+        # Calculate summary statistics
+        summary = {
+            'total_income': df[df['type'] == 'Income']['amount'].sum(),
+            'total_expenses': abs(df[df['type'] == 'Expense']['amount'].sum()),
+            'transaction_count': len(df),
+            'monthly_avg_income': df[df['type'] == 'Income']['amount'].sum() / 12,
+            'monthly_avg_expenses': abs(df[df['type'] == 'Expense']['amount'].sum()) / 12,
+            'category_yearly': df[df['type'] == 'Expense'].groupby('category')['amount'].sum().abs(),
+            'monthly_breakdown': df.groupby([df['date'].dt.month, 'type'])['amount'].sum().unstack(),
+            'growth_rates': df.groupby(df['date'].dt.month)['amount'].sum().pct_change()
+        }
+
+        return df, summary
+
+def get_transaction_by_id(transaction_id):
+    """Get a single transaction by its ID, None if there is none"""
+    with _storage_errors("retrieving transaction"):
+        return get_backend().get_transaction_by_id(transaction_id)
+
+def get_budget(category):
+    """Get the budget amount for a category, 0 without one"""
+    with _storage_errors("retrieving budget"):
+        thresholds = get_backend().get_category_thresholds().set_index('category')['monthly_limit']
+        return thresholds.get(category, 0)
+
+def get_monthly_category_spending(category, year, month):
+    """Get total spending for a category in a specific month"""
+    with _storage_errors("getting monthly category spending"):
+        totals = get_backend().get_expense_totals(*_month_range(year, month), category)
+        return float(totals.sum())
+
+def get_budget_summary():
+    """Get the budget, spending, remaining amount and percentage used of every budgeted category this month"""
+    from utils.budget import compute_budget_status
+
+    with _storage_errors("getting budget summary"):
+        backend = get_backend()
+
+        # Get current month and year
+        now = datetime.now()
+
+        # Get all categories and their budgets
+        budgets_df = backend.get_category_thresholds()
+
+        # Get this month's spending for every category in a single query
+        spending = backend.get_expense_totals(*_month_range(now.year, now.month))
+
+        budget_status = compute_budget_status(spending, budgets_df, categories=budgets_df['category'])
+
+        summary = {}
+        for row in budget_status.itertuples(index=False):
+            summary[row.category] = {
+                'budget': row.budget,
+                'spent': row.spent,
+                'remaining': row.remaining,
+                'percentage': row.percentage
+            }
+
+        return summary
+
+def migrate_database():
+    """Migrate database to new schema if needed"""
+    with _storage_errors("migrating database"):
+        get_backend().migrate()
+
+def get_all_categories():
+    """Get all categories including default and custom ones"""
+    with _storage_errors("retrieving categories"):
+        custom_categories = get_backend().get_custom_categories()
+
+        return sorted(set(DEFAULT_CATEGORIES + list(custom_categories)))
+
+def add_custom_category(category):
+    """Add a new custom category"""
+    with _storage_errors("adding custom category"):
+        get_backend().add_custom_category(category)
+
+def delete_custom_category(category):
+    """Delete a custom category"""
+    with _storage_errors("deleting custom category"):
+        get_backend().delete_custom_category(category)
@@ -0,0 +1,24 @@
+class MoneyManagerError(Exception):
+    """Base of the errors raised by database.core"""
+
+class StorageError(MoneyManagerError):
+    """The storage failed, the message names the operation and the cause"""
+
+class TransactionNotFoundError(MoneyManagerError):
+    """No stored transaction has the id"""
+
+    def __init__(self, transaction_id, message=None):
+        super().__init__(message or f"Transaction {transaction_id} not found")
+        self.transaction_id = transaction_id
+
+class ArchivedTransactionError(TransactionNotFoundError):
+    """The transaction belongs to an archived year and can't be changed"""
+
+    def __init__(self, transaction_id, year):
+        super().__init__(transaction_id,
+                         f"Transaction {transaction_id} belongs to archived year {year}, "
+                         f"restore the year in Settings to change it")
+        self.year = year
+
+class ArchiveError(MoneyManagerError):
+    """A year can't be archived or restored"""
@@ -0,0 +1,263 @@
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from database.backend import StorageBackend
+from utils.recurrence import next_due_dates, pending_occurrences
+
+TRANSACTION_COLUMNS = ['date', 'type', 'category', 'amount', 'comment', 'external_id', 'content_hash']
+FIXED_COLUMNS = ['start_date', 'type', 'category', 'amount', 'comment', 'last_generated_date',
+                 'frequency', 'end_date', 'next_due_date']
+CHANGE_COLUMNS = ['seq', 'table_name', 'row_key', 'operation', 'changed_at']
+
+class _Table:
+    """Rows of one table in a DataFrame indexed by id
+
+    Appended rows are collected and concatenated on the next read, so a burst
+    of single inserts doesn't copy the whole table each time.
+    """
+
+    def __init__(self, columns):
+        self._frame = pd.DataFrame(
+            {column: pd.Series(dtype=float if column == 'amount' else object) for column in columns},
+            index=pd.Index([], dtype=np.int64, name='id')
+        )
+        self._pending = []
+        self.next_id = 1
+
+    def append(self, rows):
+        """Append a frame of rows with new ids and return the ids"""
+        ids = np.arange(self.next_id, self.next_id + len(rows), dtype=np.int64)
+        self.next_id += len(rows)
+        rows = rows.reindex(columns=self._frame.columns).set_axis(pd.Index(ids, name='id'))
+        self._pending.append(rows)
+        return ids
+
+    @property
+    def frame(self):
+        if self._pending:
+            self._frame = pd.concat([self._frame, *self._pending])
+            self._pending = []
+        return self._frame
+
+    @frame.setter
+    def frame(self, frame):
+        self._pending = []
+        self._frame = frame
+
+class MemoryBackend(StorageBackend):
+    """Storage in pandas frames of the current process, lost when it exits
+
+    Meant for tests and benchmarks: it behaves like SqliteBackend, including
+    the change journal, without any file or SQL. Archiving years is not
+    supported.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._transactions = _Table(TRANSACTION_COLUMNS)
+        self._fixed = _Table(FIXED_COLUMNS)
+        self._settings = {}
+        self._thresholds = {}
+        self._custom_categories = set()
+        self._changes = []
+
+    def _record(self, table_name, row_keys, operation):
+        """Journal a change to rows, as the SQLite triggers do"""
+        changed_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        for row_key in row_keys:
+            seq = len(self._changes) + 1
+            self._changes.append((seq, table_name, row_key, operation, changed_at))
+
+    # Setup
+
+    def init_transactions(self):
+        pass
+
+    def init_settings(self):
+        with self._lock:
+            for setting_key, setting_value in (('currency_symbol', '$'), ('currency_position', 'before')):
+                if setting_key not in self._settings:
+                    self._settings[setting_key] = setting_value
+                    self._record('general_settings', [setting_key], 'insert')
+
+    # Transactions
+
+    def queue_transaction(self, date, trans_type, category, amount, comment):
+        future = Future()
+        with self._lock:
+            ids = self._transactions.append(pd.DataFrame({
+                'date': [date], 'type': [trans_type], 'category': [category],
+                'amount': [float(amount)], 'comment': [comment]
+            }))
+            self._record('transactions', ids.tolist(), 'insert')
+        future.set_result(int(ids[0]))
+        return future
+
+    def import_transactions(self, rows):
+        with self._lock:
+            known = self._transactions.frame['content_hash']
+            new_rows = rows[~rows['content_hash'].isin(known)].drop_duplicates('content_hash')
+            ids = self._transactions.append(new_rows.astype({'amount': float}))
+            self._record('transactions', ids.tolist(), 'insert')
+        return len(new_rows)
+
+    def update_transaction(self, transaction_id, date, trans_type, category, amount, comment):
+        with self._lock:
+            frame = self._transactions.frame
+            if transaction_id not in frame.index:
+                return False
+            frame.loc[transaction_id, ['date', 'type', 'category', 'amount', 'comment']] = [
+                date, trans_type, category, amount, comment
+            ]
+            self._record('transactions', [transaction_id], 'update')
+        return True
+
+    def delete_transaction(self, transaction_id):
+        with self._lock:
+            frame = self._transactions.frame
+            if transaction_id not in frame.index:
+                return False
+            self._transactions.frame = frame.drop(transaction_id)
+            self._record('transactions', [transaction_id], 'delete')
+        return True
+
+    def _select(self, mask=None):
+        """Get the transactions matching a mask with the columns of get_transactions"""
+        with self._lock:
+            frame = self._transactions.frame
+            if mask is not None:
+                frame = frame[mask(frame)]
+            return frame[['date', 'type', 'category', 'amount', 'comment']].reset_index()
+
+    def get_transactions(self, years=None):
+        if years is None:
+            return self._select()
+        return self._select(lambda df: df['date'].str[:4].astype(int).isin(list(years)))
+
+    def get_transaction_by_id(self, transaction_id):
+        df = self._select(lambda df: df.index == transaction_id)
+        return df.iloc[0] if not df.empty else None
+
+    def search_transactions(self, search_term="", min_amount=None, max_amount=None):
+        def mask(df):
+            keep = pd.Series(True, index=df.index)
+            if search_term:
+                # LIKE is case-insensitive
+                keep &= (df['comment'].str.contains(search_term, case=False, regex=False)
+                         | df['category'].str.contains(search_term, case=False, regex=False))
+            if min_amount is not None and min_amount > 0:
+                keep &= df['amount'].abs() >= min_amount
+            if max_amount is not None and max_amount > 0:
+                keep &= df['amount'].abs() <= max_amount
+            return keep
+
+        return self._select(mask)
+
+    def get_transaction_years(self):
+        with self._lock:
+            years = self._transactions.frame['date'].str[:4].astype(int).unique()
+        return sorted(years.tolist(), reverse=True)
+
+    # Aggregates
+
+    def get_transactions_between(self, start_date, end_date):
+        # In date order, as SQLite reads them through the date index
+        df = self._select(lambda df: (df['date'] >= start_date) & (df['date'] < end_date))
+        return df.sort_values('date', kind='stable', ignore_index=True)
+
+    def get_expense_totals(self, start_date, end_date, category=None):
+        def mask(df):
+            keep = (df['type'] == 'Expense') & (df['date'] >= start_date) & (df['date'] < end_date)
+            if category is not None:
+                keep &= df['category'] == category
+            return keep
+
+        expenses = self._select(mask)
+        return expenses['amount'].abs().groupby(expenses['category']).sum().rename('total')
+
+    # Recurring transactions
+
+    def add_fixed_transaction(self, start_date, trans_type, category, amount, comment,
+                              frequency, end_date):
+        with self._lock:
+            # The first occurrence is due on the start date
+            ids = self._fixed.append(pd.DataFrame({
+                'start_date': [start_date], 'type': [trans_type], 'category': [category],
+                'amount': [float(amount)], 'comment': [comment], 'last_generated_date': [None],
+                'frequency': [frequency], 'end_date': [end_date], 'next_due_date': [start_date]
+            }))
+            self._record('fixed_transactions', ids.tolist(), 'insert')
+        return int(ids[0])
+
+    def get_fixed_transactions(self):
+        with self._lock:
+            return self._fixed.frame.reset_index()
+
+    def post_due_transactions(self, today):
+        with self._lock:
+            fixed = self._fixed.frame
+            fixed_df = fixed[fixed['next_due_date'].notna() & (fixed['next_due_date'] <= today)].reset_index()
+            if fixed_df.empty:
+                return
+
+            due = pending_occurrences(fixed_df, fixed_df['next_due_date'].min(), today)
+            if not due.empty:
+                ids = self._transactions.append(due[['date', 'type', 'category', 'amount', 'comment']])
+                self._record('transactions', ids.tolist(), 'insert')
+
+            # Move every due schedule past today, ended schedules get no next date
+            last_dates = due.drop_duplicates('fixed_id', keep='last').set_index('fixed_id')['date']
+            fixed = fixed.copy()
+            fixed.loc[fixed_df['id'], 'last_generated_date'] = fixed_df['id'].map(last_dates).to_numpy()
+            fixed.loc[fixed_df['id'], 'next_due_date'] = np.asarray(next_due_dates(fixed_df, today), dtype=object)
+            self._fixed.frame = fixed
+            self._record('fixed_transactions', fixed_df['id'].tolist(), 'update')
+
+    # Settings and categories
+
+    def get_setting(self, setting_key):
+        with self._lock:
+            return self._settings.get(setting_key)
+
+    def update_setting(self, setting_key, setting_value):
+        with self._lock:
+            self._settings[setting_key] = setting_value
+            self._record('general_settings', [setting_key], 'insert')
+
+    def get_category_thresholds(self):
+        with self._lock:
+            return pd.DataFrame(list(self._thresholds.items()), columns=['category', 'monthly_limit'])
+
+    def update_category_threshold(self, category, monthly_limit):
+        with self._lock:
+            self._thresholds[category] = float(monthly_limit)
+            self._record('category_thresholds', [category], 'insert')
+
+    def get_custom_categories(self):
+        with self._lock:
+            return list(self._custom_categories)
+
+    def add_custom_category(self, category):
+        with self._lock:
+            self._custom_categories.add(category)
+
+    def delete_custom_category(self, category):
+        with self._lock:
+            self._custom_categories.discard(category)
+
+    # Change journal
+
+    def get_change_seq(self):
+        with self._lock:
+            return len(self._changes)
+
+    def get_changes(self, since_seq, tables=None):
+        with self._lock:
+            changes = pd.DataFrame(self._changes[since_seq:], columns=CHANGE_COLUMNS)
+        if tables is not None:
+            changes = changes[changes['table_name'].isin(list(tables))].reset_index(drop=True)
+        return changes
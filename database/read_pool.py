@@ -0,0 +1,90 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Idle connections kept open per database file
+MAX_IDLE = 8
+
+# Page cache per connection in KiB (negative values are KiB for SQLite)
+CACHE_SIZE_KIB = 64 * 1024
+
+# Bytes of the database file read through memory mapping
+MMAP_SIZE = 256 * 1024 * 1024
+
+def readonly_uri(db_path):
+    """Build the URI opening a database file in read-only mode"""
+    return Path(db_path).resolve().as_uri() + '?mode=ro'
+
+def connect_readonly(db_path, query_only=True):
+    """Open a read-only connection tuned for long analytical reads
+
+    The file is opened with mode=ro, so the connection can never take the
+    write lock. In WAL mode its reads run on a snapshot and don't block the
+    writer, nor does the writer block them. query_only additionally rejects
+    writes to the temp schema; pass False to create temporary views.
+    """
+    conn = sqlite3.connect(readonly_uri(db_path), uri=True, check_same_thread=False)
+    if query_only:
+        conn.execute('PRAGMA query_only = ON')
+    conn.execute(f'PRAGMA cache_size = -{CACHE_SIZE_KIB}')
+    conn.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    return conn
+
+class ReadPool:
+    """Pool of read-only connections to one database file
+
+    Connections are reused across reruns and sessions so their page cache
+    stays warm. Each connection is used by one thread at a time.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue(maxsize=MAX_IDLE)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with block"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = connect_readonly(self.db_path)
+
+        try:
+            yield conn
+        except Exception:
+            conn.close()
+            raise
+
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_read_pool(db_path):
+    """Get the read pool of a database file"""
+    key = str(db_path)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ReadPool(db_path)
+        return _pools[key]
+
+def close_read_pool(db_path):
+    """Close and forget the pool of a database file that is about to be moved or deleted"""
+    with _pools_lock:
+        pool = _pools.pop(str(db_path), None)
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+def get_snapshot_path(db_path):
+    """Get the path of the columnar snapshot of a database's transactions"""
+    db_path = Path(db_path)
+    return db_path.parent / 'snapshots' / f"{db_path.stem}.arrow"
+
+def read_snapshot(snapshot_path):
+    """Load a snapshot as a DataFrame together with the metadata it was written with
+
+    The Arrow IPC file is memory-mapped and converted without copying numeric
+    and date columns (and string columns where pandas stores strings in
+    Arrow), so loading costs milliseconds regardless of the number of rows.
+    Returns (None, {}) when there is no snapshot.
+    """
+    try:
+        source = pa.memory_map(str(snapshot_path))
+    except FileNotFoundError:
+        return None, {}
+
+    reader = ipc.open_file(source)
+    metadata = {
+        key.decode(): value.decode()
+        for key, value in (reader.schema.metadata or {}).items()
+    }
+    return reader.read_all().to_pandas(split_blocks=True), metadata
+
+def write_snapshot(snapshot_path, df, metadata):
+    """Write a DataFrame as an uncompressed Arrow IPC snapshot with string metadata
+
+    The file is written next to its destination and renamed into place, so
+    readers never see a partial snapshot.
+    """
+    snapshot_path = Path(snapshot_path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        str(key).encode(): str(value).encode() for key, value in metadata.items()
+    })
+
+    fd, tmp_path = tempfile.mkstemp(dir=snapshot_path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,749 @@
+import json
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from database.backend import StorageBackend
+from database.read_pool import close_read_pool, connect_readonly, get_read_pool, readonly_uri
+from database.snapshot import get_snapshot_path, read_snapshot, write_snapshot
+from database.write_queue import BUSY_TIMEOUT, get_write_queue
+from utils.content_hash import content_hashes
+from utils.recurrence import next_due_dates, pending_occurrences
+
+# Latest changes kept in the change journal, older ones are pruned at warm-up
+# and by the maintenance command
+CHANGE_RETENTION = 100_000
+
+def _year_filter(years):
+    """Build a WHERE clause and its parameters selecting whole years by date range"""
+    ranges = " OR ".join("(date >= ? AND date < ?)" for _ in years)
+    params = [bound for year in years for bound in (f"{year}-01-01", f"{year + 1}-01-01")]
+    return f"WHERE {ranges}", params
+
+def _create_change_journal(c, tables):
+    """Create the change journal and the triggers recording every change to tables
+
+    tables maps each table to the column identifying its rows. The journal's
+    AUTOINCREMENT seq only ever grows, even when old entries are pruned.
+    """
+    c.execute('''CREATE TABLE IF NOT EXISTS transaction_changes
+                 (seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                  table_name TEXT NOT NULL,
+                  row_key NOT NULL,
+                  operation TEXT NOT NULL,
+                  changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)''')
+
+    for table, key in tables.items():
+        for operation, row in (('insert', 'NEW'), ('update', 'NEW'), ('delete', 'OLD')):
+            c.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_{operation}_journal
+                          AFTER {operation.upper()} ON {table}
+                          BEGIN
+                              INSERT INTO transaction_changes (table_name, row_key, operation)
+                              VALUES ('{table}', {row}.{key}, '{operation}');
+                          END''')
+
+class SqliteBackend(StorageBackend):
+    """Storage in a SQLite database file, with closed years in archive files
+
+    Writes go through the file's single-writer queue, analytical reads through
+    its pool of read-only connections.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+
+    def connect(self):
+        """Open a read-write connection to the database file"""
+        return sqlite3.connect(self.db_path)
+
+    # Setup
+
+    def init_transactions(self):
+        # Create data directory if it doesn't exist
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self.connect()
+        c = conn.cursor()
+
+        # Write-ahead logging lets the read-only analytics connections read
+        # from a snapshot while the writer commits
+        c.execute('PRAGMA journal_mode=WAL')
+
+        # Create tables with proper IDs
+        c.execute('''CREATE TABLE IF NOT EXISTS transactions
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      date TEXT NOT NULL,
+                      type TEXT NOT NULL,
+                      category TEXT NOT NULL,
+                      amount REAL NOT NULL,
+                      comment TEXT NOT NULL,
+                      external_id TEXT,
+                      content_hash TEXT)''')
+
+        c.execute('''CREATE TABLE IF NOT EXISTS fixed_transactions
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      start_date TEXT NOT NULL,
+                      type TEXT NOT NULL,
+                      category TEXT NOT NULL,
+                      amount REAL NOT NULL,
+                      comment TEXT NOT NULL,
+                      last_generated_date TEXT,
+                      frequency TEXT NOT NULL DEFAULT 'monthly',
+                      end_date TEXT,
+                      next_due_date TEXT)''')
+
+        # Create indices for better performance
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_transactions_date
+                     ON transactions(date)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_transactions_type
+                     ON transactions(type)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_transactions_category
+                     ON transactions(category)''')
+
+        conn.commit()
+        conn.close()
+
+        # Run migration to ensure schema is up to date
+        self.migrate()
+
+    def migrate(self):
+        conn = self.connect()
+        c = conn.cursor()
+
+        # Check transactions table
+        cursor = c.execute('PRAGMA table_info(transactions)')
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'id' not in columns:
+            # Create new transactions table with id
+            c.execute('''CREATE TABLE IF NOT EXISTS transactions_new
+                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                          date TEXT NOT NULL,
+                          type TEXT NOT NULL,
+                          category TEXT NOT NULL,
+                          amount REAL NOT NULL,
+                          comment TEXT NOT NULL)''')
+
+            # Copy data from old table to new table
+            c.execute('''INSERT INTO transactions_new (date, type, category, amount, comment)
+                         SELECT date, type, category, amount, comment FROM transactions''')
+
+            # Drop old table and rename new table
+            c.execute('DROP TABLE IF EXISTS transactions')
+            c.execute('ALTER TABLE transactions_new RENAME TO transactions')
+
+            # Recreate indices
+            c.execute('''CREATE INDEX IF NOT EXISTS idx_transactions_date
+                         ON transactions(date)''')
+            c.execute('''CREATE INDEX IF NOT EXISTS idx_transactions_type
+                         ON transactions(type)''')
+            c.execute('''CREATE INDEX IF NOT EXISTS idx_transactions_category
+                         ON transactions(category)''')
+
+        # Check fixed_transactions table
+        cursor = c.execute('PRAGMA table_info(fixed_transactions)')
+        ft_columns = [row[1] for row in cursor.fetchall()]
+
+        if 'id' not in ft_columns:
+            # Create new fixed_transactions table with id
+            c.execute('''CREATE TABLE IF NOT EXISTS fixed_transactions_new
+                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                          start_date TEXT NOT NULL,
+                          type TEXT NOT NULL,
+                          category TEXT NOT NULL,
+                          amount REAL NOT NULL,
+                          comment TEXT NOT NULL,
+                          last_generated_date TEXT)''')
+
+            # Copy data from old table to new table if it exists
+            c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='fixed_transactions'")
+            if c.fetchone():
+                c.execute('''INSERT INTO fixed_transactions_new
+                            (start_date, type, category, amount, comment, last_generated_date)
+                            SELECT start_date, type, category, amount, comment, last_generated_date
+                            FROM fixed_transactions''')
+
+                # Drop old table
+                c.execute('DROP TABLE IF EXISTS fixed_transactions')
+
+            c.execute('ALTER TABLE fixed_transactions_new RENAME TO fixed_transactions')
+
+        # Add recurrence rule columns to older fixed_transactions tables
+        cursor = c.execute('PRAGMA table_info(fixed_transactions)')
+        ft_columns = [row[1] for row in cursor.fetchall()]
+
+        if 'next_due_date' not in ft_columns:
+            c.execute("ALTER TABLE fixed_transactions ADD COLUMN frequency TEXT NOT NULL DEFAULT 'monthly'")
+            c.execute('ALTER TABLE fixed_transactions ADD COLUMN end_date TEXT')
+            c.execute('ALTER TABLE fixed_transactions ADD COLUMN next_due_date TEXT')
+
+            # Existing schedules are due from the occurrence after their last posted one
+            fixed_df = pd.read_sql_query("""
+                SELECT id, start_date, frequency, end_date, last_generated_date
+                FROM fixed_transactions
+            """, conn)
+            posted = fixed_df['last_generated_date'].notna()
+            next_due = fixed_df['start_date'].astype(object)
+            next_due[posted] = next_due_dates(fixed_df[posted], fixed_df.loc[posted, 'last_generated_date'])
+            c.executemany('UPDATE fixed_transactions SET next_due_date = ? WHERE id = ?',
+                          zip(next_due, fixed_df['id'].tolist()))
+
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_fixed_next_due
+                     ON fixed_transactions(next_due_date)''')
+
+        # Add the import deduplication columns to older transactions tables
+        cursor = c.execute('PRAGMA table_info(transactions)')
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'content_hash' not in columns:
+            c.execute('ALTER TABLE transactions ADD COLUMN external_id TEXT')
+            c.execute('ALTER TABLE transactions ADD COLUMN content_hash TEXT')
+
+            # Hash existing rows so re-importing a statement imported before is skipped
+            existing = pd.read_sql_query("""
+                SELECT id, date, type, category, amount, comment
+                FROM transactions
+                ORDER BY id
+            """, conn)
+            if not existing.empty:
+                c.executemany('UPDATE transactions SET content_hash = ? WHERE id = ?',
+                              zip(content_hashes(existing), existing['id'].tolist()))
+
+        c.execute('''CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_content_hash
+                     ON transactions(content_hash)''')
+
+        # Journal changes so caches can update incrementally
+        _create_change_journal(c, {'transactions': 'id', 'fixed_transactions': 'id'})
+
+        conn.commit()
+        conn.close()
+
+    def init_settings(self):
+        conn = self.connect()
+        c = conn.cursor()
+
+        # Create general settings table
+        c.execute('''CREATE TABLE IF NOT EXISTS general_settings
+                     (setting_key TEXT PRIMARY KEY,
+                      setting_value TEXT NOT NULL)''')
+
+        # Create category thresholds table
+        c.execute('''CREATE TABLE IF NOT EXISTS category_thresholds
+                     (category TEXT PRIMARY KEY,
+                      monthly_limit REAL NOT NULL)''')
+
+        # Create custom categories table
+        c.execute('''CREATE TABLE IF NOT EXISTS custom_categories
+                     (category TEXT PRIMARY KEY)''')
+
+        # Insert default settings if they don't exist
+        c.execute('''INSERT OR IGNORE INTO general_settings (setting_key, setting_value)
+                     VALUES ('currency_symbol', '$')''')
+        c.execute('''INSERT OR IGNORE INTO general_settings (setting_key, setting_value)
+                     VALUES ('currency_position', 'before')''')
+
+        _create_change_journal(c, {'general_settings': 'setting_key', 'category_thresholds': 'category'})
+
+        conn.commit()
+        conn.close()
+
+    def get_shared_cache_path(self):
+        return self.db_path.parent / 'cache' / f"{self.db_path.stem}.db"
+
+    # Transactions
+
+    def queue_transaction(self, date, trans_type, category, amount, comment):
+        return get_write_queue(self.db_path).submit(
+            "INSERT INTO transactions (date, type, category, amount, comment) VALUES (?,?,?,?,?)",
+            (date, trans_type, category, amount, comment)
+        )
+
+    def import_transactions(self, rows):
+        # Archived years are outside the unique index, rows already archived are dropped first
+        rows = rows[~rows['content_hash'].isin(self._archived_hashes(rows['date']))]
+
+        # Duplicates are skipped by INSERT OR IGNORE on the unique content hash index
+        return get_write_queue(self.db_path).submit_many(
+            """INSERT OR IGNORE INTO transactions
+               (date, type, category, amount, comment, external_id, content_hash)
+               VALUES (?,?,?,?,?,?,?)""",
+            rows.astype(object).where(rows.notna(), None).itertuples(index=False)
+        ).result()
+
+    def _archived_hashes(self, dates):
+        """Get the content hashes stored in the archives of the years among dates"""
+        years = set(pd.to_numeric(dates.astype(str).str[:4], errors='coerce').dropna().astype(int))
+        archived = [year for year in self.get_archived_years() if year in years]
+
+        hashes = set()
+        for year in archived:
+            with get_read_pool(self.get_archive_path(year)).connection() as conn:
+                c = conn.execute("SELECT content_hash FROM transactions WHERE content_hash IS NOT NULL")
+                hashes.update(row[0] for row in c.fetchall())
+        return hashes
+
+    def update_transaction(self, transaction_id, date, trans_type, category, amount, comment):
+        rows_affected = get_write_queue(self.db_path).submit(
+            """UPDATE transactions
+               SET date = ?,
+                   type = ?,
+                   category = ?,
+                   amount = ?,
+                   comment = ?
+               WHERE id = ?""",
+            (date, trans_type, category, amount, comment, transaction_id),
+            returning='rowcount'
+        ).result()
+        return rows_affected > 0
+
+    def delete_transaction(self, transaction_id):
+        rows_affected = get_write_queue(self.db_path).submit(
+            "DELETE FROM transactions WHERE id = ?",
+            (transaction_id,),
+            returning='rowcount'
+        ).result()
+        return rows_affected > 0
+
+    def get_transactions(self, years=None):
+        # Only select specific columns and ensure no duplicates
+        query = """
+        SELECT DISTINCT id, date, type, category, amount, comment
+        FROM transactions
+        """
+        params = []
+        if years is not None:
+            where, params = _year_filter(years)
+            query += where
+
+        return self._query_each_file(query, params, years)
+
+    def load_transactions(self):
+        """Get every transaction with parsed dates from the columnar snapshot
+
+        The snapshot is a memory-mapped Arrow file, so loading it takes
+        milliseconds. It records the change journal seq it is current for: when
+        transactions changed since, only the changed rows are read again, and the
+        snapshot is only rebuilt from scratch when the journal no longer reaches
+        back that far or most rows changed.
+        """
+        change_seq = self.get_change_seq()
+        snapshot_path = get_snapshot_path(self.db_path)
+
+        df, metadata = read_snapshot(snapshot_path)
+        changes = None
+        if df is not None and 'change_seq' in metadata:
+            changes = self.get_changes(int(metadata['change_seq']), tables=['transactions'])
+            if changes is not None and changes.empty:
+                return df
+
+        if changes is None or changes['row_key'].nunique() > len(df) // 2:
+            df = self.get_transactions()
+            df['date'] = pd.to_datetime(df['date'])
+        else:
+            df = self._apply_transaction_changes(df, changes['row_key'].unique())
+
+        write_snapshot(snapshot_path, df, {'change_seq': change_seq})
+        return df
+
+    def _apply_transaction_changes(self, df, changed_ids):
+        """Replace the rows of changed transaction ids with their current version
+
+        Changed rows are read again by id from the main database and every
+        archive, so rows moved by archive_year or restore_year are found wherever
+        they are now. Deleted rows are simply not found again.
+        """
+        fresh = self._query_each_file("""
+            SELECT id, date, type, category, amount, comment
+            FROM transactions
+            WHERE id IN (SELECT value FROM json_each(?))
+        """, [json.dumps([int(i) for i in changed_ids])])
+        fresh = fresh.drop_duplicates('id')
+        fresh['date'] = pd.to_datetime(fresh['date'])
+
+        return pd.concat([df[~df['id'].isin(changed_ids)], fresh], ignore_index=True)
+
+    def get_transaction_by_id(self, transaction_id):
+        conn = self.connect()
+        query = "SELECT *, rowid as id FROM transactions WHERE id = ?"
+        df = pd.read_sql_query(query, conn, params=[transaction_id])
+        conn.close()
+        return df.iloc[0] if not df.empty else None
+
+    def search_transactions(self, search_term="", min_amount=None, max_amount=None):
+        # Build the query dynamically
+        query = """
+        SELECT DISTINCT id, date, type, category, amount, comment
+        FROM transactions
+        WHERE 1=1
+        """
+        params = []
+
+        if search_term:
+            query += " AND (comment LIKE ? OR category LIKE ?)"
+            params.extend([f"%{search_term}%", f"%{search_term}%"])
+
+        if min_amount is not None and min_amount > 0:
+            query += " AND ABS(amount) >= ?"
+            params.append(min_amount)
+
+        if max_amount is not None and max_amount > 0:
+            query += " AND ABS(amount) <= ?"
+            params.append(max_amount)
+
+        # Read the data into a DataFrame, archived years included
+        return self._query_each_file(query, params)
+
+    def get_transaction_years(self):
+        with get_read_pool(self.db_path).connection() as conn:
+            c = conn.execute("SELECT DISTINCT CAST(substr(date, 1, 4) AS INTEGER) FROM transactions")
+            years = {row[0] for row in c.fetchall()}
+        return sorted(years | set(self.get_archived_years()), reverse=True)
+
+    def _query_each_file(self, query, params=(), years=None):
+        """Run a query on the transactions table of the main database and of archives
+
+        Only the archives of the given years are opened, all of them when years is
+        None. Reading file by file avoids SQLite's limit on attached databases.
+        """
+        archived = self.get_archived_years()
+        if years is not None:
+            archived = [year for year in archived if year in set(years)]
+
+        frames = []
+        for path in [self.db_path] + [self.get_archive_path(year) for year in archived]:
+            with get_read_pool(path).connection() as conn:
+                frames.append(pd.read_sql_query(query, conn, params=list(params)))
+
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def connect_transactions(self, years=None):
+        """Open a connection with an all_transactions view over current and archived data
+
+        The connection is read-only. The archives of the given years (all archives
+        when years is None) are attached and combined with the main transactions table in a temporary
+        UNION ALL view, so queries for the current year only touch the main file.
+        """
+        conn = connect_readonly(self.db_path, query_only=False)
+        archived = self.get_archived_years()
+        if years is not None:
+            archived = [year for year in archived if year in set(years)]
+
+        columns = "id, date, type, category, amount, comment"
+        selects = [f"SELECT {columns} FROM main.transactions"]
+        for year in archived:
+            conn.execute(f"ATTACH DATABASE ? AS archive_{year}", (readonly_uri(self.get_archive_path(year)),))
+            selects.append(f"SELECT {columns} FROM archive_{year}.transactions")
+
+        conn.execute("CREATE TEMP VIEW all_transactions AS " + " UNION ALL ".join(selects))
+        return conn
+
+    # Aggregates
+
+    def get_transactions_between(self, start_date, end_date):
+        # Only the archives of the years in the range are attached; end_date is
+        # excluded, so a range ending on January 1st doesn't reach into that year
+        last_year = (date.fromisoformat(end_date[:10]) - timedelta(days=1)).year
+        conn = self.connect_transactions(list(range(int(start_date[:4]), last_year + 1)))
+
+        query = """
+        SELECT id, date, type, category, amount, comment
+        FROM all_transactions
+        WHERE date >= ? AND date < ?
+        """
+
+        df = pd.read_sql_query(query, conn, params=[start_date, end_date])
+        conn.close()
+        return df
+
+    def get_expense_totals(self, start_date, end_date, category=None):
+        query = """
+            SELECT category, SUM(ABS(amount)) as total
+            FROM transactions
+            WHERE type = 'Expense'
+            AND date >= ?
+            AND date < ?
+        """
+        params = [start_date, end_date]
+        if category is not None:
+            query += " AND category = ?"
+            params.append(category)
+
+        conn = self.connect()
+        spending_df = pd.read_sql_query(query + " GROUP BY category", conn, params=params)
+        conn.close()
+        return spending_df.set_index('category')['total']
+
+    # Recurring transactions
+
+    def add_fixed_transaction(self, start_date, trans_type, category, amount, comment,
+                              frequency, end_date):
+        # The first occurrence is due on the start date
+        return get_write_queue(self.db_path).submit(
+            """INSERT INTO fixed_transactions
+               (start_date, type, category, amount, comment, last_generated_date,
+                frequency, end_date, next_due_date)
+               VALUES (?,?,?,?,?,?,?,?,?)""",
+            (start_date, trans_type, category, amount, comment, None,
+             frequency, end_date, start_date)
+        ).result()
+
+    def get_fixed_transactions(self):
+        conn = self.connect()
+        df = pd.read_sql_query("""
+            SELECT id, start_date, type, category, amount, comment, last_generated_date,
+                   frequency, end_date, next_due_date
+            FROM fixed_transactions
+        """, conn)
+        conn.close()
+        return df
+
+    def post_due_transactions(self, today):
+        """Post the occurrences of fixed transactions that are due up to today
+
+        Only schedules whose next_due_date has been reached are read, through the
+        index on that column, so the cost depends on what is due rather than on the
+        number of schedules. Concurrent runs from several sessions or processes are
+        serialized by the write lock, so each occurrence is posted exactly once.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        c = conn.cursor()
+
+        # Most calls have nothing due, check that without taking the write lock
+        c.execute("SELECT 1 FROM fixed_transactions WHERE next_due_date <= ? LIMIT 1", (today,))
+        if c.fetchone() is None:
+            conn.close()
+            return
+
+        # Hold the write lock from reading the due schedules until they are moved
+        # past today; a concurrent run waits here and then finds nothing due
+        c.execute('BEGIN IMMEDIATE')
+        fixed_df = pd.read_sql_query("""
+            SELECT id, start_date, type, category, amount, comment, last_generated_date,
+                   frequency, end_date, next_due_date
+            FROM fixed_transactions
+            WHERE next_due_date <= ?
+        """, conn, params=[today])
+
+        if fixed_df.empty:
+            conn.rollback()
+            conn.close()
+            return
+
+        due = pending_occurrences(fixed_df, fixed_df['next_due_date'].min(), today)
+
+        if not due.empty:
+            c.executemany("""INSERT INTO transactions
+                           (date, type, category, amount, comment)
+                           VALUES (?,?,?,?,?)""",
+                          due[['date', 'type', 'category', 'amount', 'comment']].itertuples(index=False))
+
+        # Move every due schedule past today, ended schedules get no next date.
+        # Occurrences are sorted by date, so the last one per schedule is its latest
+        last_dates = due.drop_duplicates('fixed_id', keep='last').set_index('fixed_id')['date']
+        updates = pd.DataFrame({
+            'last_generated_date': fixed_df['id'].map(last_dates),
+            'next_due_date': next_due_dates(fixed_df, today),
+            'id': fixed_df['id']
+        })
+        c.executemany("""UPDATE fixed_transactions
+                       SET last_generated_date = ?, next_due_date = ?
+                       WHERE id = ?""",
+                      updates.itertuples(index=False))
+
+        conn.commit()
+        conn.close()
+
+    # Archives
+
+    def get_archive_path(self, year):
+        """Get the path of the archive database holding a closed year"""
+        return self.db_path.parent / 'archive' / f"{self.db_path.stem}_{year}.db"
+
+    def get_archived_years(self):
+        archive_dir = self.db_path.parent / 'archive'
+        prefix = f"{self.db_path.stem}_"
+        return sorted(
+            int(path.stem[len(prefix):])
+            for path in archive_dir.glob(f"{prefix}*.db")
+            if path.stem[len(prefix):].isdigit()
+        )
+
+    def archive_year(self, year):
+        """Move the transactions of a year into their own archive database
+
+        Rows are copied and deleted in one transaction, keeping their ids, and can
+        be moved back with restore_year. A year without transactions gets no
+        archive file.
+        """
+        where, params = _year_filter([year])
+        with get_read_pool(self.db_path).connection() as conn:
+            if conn.execute(f"SELECT 1 FROM transactions {where} LIMIT 1", params).fetchone() is None:
+                return 0
+
+        archive_path = self.get_archive_path(year)
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            c = conn.cursor()
+            c.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+            c.execute('''CREATE TABLE IF NOT EXISTS archive.transactions
+                         (id INTEGER PRIMARY KEY,
+                          date TEXT NOT NULL,
+                          type TEXT NOT NULL,
+                          category TEXT NOT NULL,
+                          amount REAL NOT NULL,
+                          comment TEXT NOT NULL,
+                          external_id TEXT,
+                          content_hash TEXT)''')
+            c.execute('''CREATE INDEX IF NOT EXISTS archive.idx_transactions_date
+                         ON transactions(date)''')
+
+            c.execute('BEGIN IMMEDIATE')
+            try:
+                c.execute(f"""INSERT INTO archive.transactions
+                             SELECT id, date, type, category, amount, comment, external_id, content_hash
+                             FROM main.transactions {where}""", params)
+                archived = c.rowcount
+                c.execute(f"DELETE FROM main.transactions {where}", params)
+                c.execute('COMMIT')
+            except Exception:
+                # Release the write lock at once rather than when the connection is collected
+                c.execute('ROLLBACK')
+                raise
+
+            c.execute("DETACH DATABASE archive")
+        finally:
+            conn.close()
+        return archived
+
+    def restore_year(self, year):
+        """Move an archived year back into the main database and remove its archive"""
+        archive_path = self.get_archive_path(year)
+
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            c = conn.cursor()
+            c.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+
+            # Imports skip archived rows, but a copy imported before that keeps its
+            # hash and the restored row drops it
+            c.execute('BEGIN IMMEDIATE')
+            try:
+                c.execute("""INSERT INTO main.transactions
+                             (id, date, type, category, amount, comment, external_id, content_hash)
+                             SELECT id, date, type, category, amount, comment, external_id,
+                                    CASE WHEN content_hash IN (SELECT content_hash FROM main.transactions)
+                                         THEN NULL ELSE content_hash END
+                             FROM archive.transactions""")
+                restored = c.rowcount
+                c.execute('COMMIT')
+            except Exception:
+                # Release the write lock at once rather than when the connection is collected
+                c.execute('ROLLBACK')
+                raise
+
+            c.execute("DETACH DATABASE archive")
+        finally:
+            conn.close()
+        close_read_pool(archive_path)
+        archive_path.unlink()
+        return restored
+
+    def find_archived_year(self, transaction_id):
+        for year in self.get_archived_years():
+            conn = sqlite3.connect(self.get_archive_path(year))
+            found = conn.execute("SELECT 1 FROM transactions WHERE id = ?", (transaction_id,)).fetchone()
+            conn.close()
+            if found:
+                return year
+        return None
+
+    # Settings and categories
+
+    def get_setting(self, setting_key):
+        conn = self.connect()
+        c = conn.cursor()
+        c.execute("SELECT setting_value FROM general_settings WHERE setting_key = ?", (setting_key,))
+        result = c.fetchone()
+        conn.close()
+        return result[0] if result else None
+
+    def update_setting(self, setting_key, setting_value):
+        get_write_queue(self.db_path).submit(
+            """INSERT OR REPLACE INTO general_settings (setting_key, setting_value)
+               VALUES (?, ?)""",
+            (setting_key, setting_value)
+        ).result()
+
+    def get_category_thresholds(self):
+        conn = self.connect()
+        df = pd.read_sql_query("SELECT * FROM category_thresholds", conn)
+        conn.close()
+        return df
+
+    def update_category_threshold(self, category, monthly_limit):
+        get_write_queue(self.db_path).submit(
+            """INSERT OR REPLACE INTO category_thresholds (category, monthly_limit)
+               VALUES (?, ?)""",
+            (category, monthly_limit)
+        ).result()
+
+    def get_custom_categories(self):
+        conn = self.connect()
+        c = conn.cursor()
+        c.execute("SELECT category FROM custom_categories")
+        custom_categories = [row[0] for row in c.fetchall()]
+        conn.close()
+        return custom_categories
+
+    def add_custom_category(self, category):
+        get_write_queue(self.db_path).submit(
+            "INSERT OR IGNORE INTO custom_categories (category) VALUES (?)",
+            (category,)
+        ).result()
+
+    def delete_custom_category(self, category):
+        get_write_queue(self.db_path).submit(
+            "DELETE FROM custom_categories WHERE category = ?",
+            (category,)
+        ).result()
+
+    # Change journal
+
+    def get_change_seq(self):
+        with get_read_pool(self.db_path).connection() as conn:
+            row = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'transaction_changes'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    def prune_changes(self, keep=None):
+        if keep is None:
+            keep = CHANGE_RETENTION
+        return get_write_queue(self.db_path).submit(
+            """DELETE FROM transaction_changes
+               WHERE seq <= (SELECT MAX(seq) FROM transaction_changes) - ?""",
+            (keep,),
+            returning='rowcount'
+        ).result()
+
+    def get_changes(self, since_seq, tables=None):
+        columns = ['seq', 'table_name', 'row_key', 'operation', 'changed_at']
+        latest = self.get_change_seq()
+        if since_seq >= latest:
+            return pd.DataFrame(columns=columns)
+
+        with get_read_pool(self.db_path).connection() as conn:
+            first = conn.execute("SELECT MIN(seq) FROM transaction_changes").fetchone()[0]
+            if first is None or since_seq < first - 1:
+                return None
+
+            query = f"SELECT {', '.join(columns)} FROM transaction_changes WHERE seq > ?"
+            params = [since_seq]
+            if tables is not None:
+                query += f" AND table_name IN ({', '.join('?' for _ in tables)})"
+                params += list(tables)
+            return pd.read_sql_query(query + " ORDER BY seq", conn, params=params)
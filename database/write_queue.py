@@ -0,0 +1,121 @@
+import atexit
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+# Most statements committed together in one transaction
+MAX_BATCH = 512
+
+# Seconds to wait for another process holding the database lock
+BUSY_TIMEOUT = 30
+
+class WriteQueue:
+    """Single writer that owns the write connection of one database file
+
+    Statements submitted from any thread are queued and executed by a
+    background thread. Everything waiting in the queue when the thread wakes up
+    is committed in one transaction, so a burst of writes from many sessions
+    pays for a single lock acquisition and fsync. Each statement runs in its own
+    savepoint, so a failing statement only fails its own future.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=f"sqlite-writer-{db_path}", daemon=True)
+        self._thread.start()
+
+    def submit(self, sql, params=(), returning='lastrowid'):
+        """Queue a statement and return a Future resolving once it is committed
+
+        The Future's result is the cursor's lastrowid (the new id of an INSERT)
+        or, with returning='rowcount', the number of rows changed.
+        """
+        if returning not in ('lastrowid', 'rowcount'):
+            raise ValueError(f"Unknown returning value: {returning}")
+        future = Future()
+        self._queue.put(('execute', sql, params, returning, future))
+        return future
+
+    def submit_many(self, sql, rows):
+        """Queue a statement for every row of parameters, executed and committed together
+
+        Returns a Future resolving to the total number of rows changed.
+        """
+        future = Future()
+        self._queue.put(('executemany', sql, list(rows), 'rowcount', future))
+        return future
+
+    def close(self):
+        """Commit everything already queued and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while batch[-1] is not None and len(batch) < MAX_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stopping = batch[-1] is None
+                writes = [item for item in batch if item is not None]
+                if writes:
+                    self._commit(conn, writes)
+                if stopping:
+                    break
+        finally:
+            conn.close()
+
+    def _commit(self, conn, writes):
+        """Execute a batch of writes in one transaction and resolve their futures"""
+        results = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for method, sql, params, returning, future in writes:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute('SAVEPOINT write')
+                try:
+                    cursor = getattr(conn, method)(sql, params)
+                    results.append((future, getattr(cursor, returning)))
+                    conn.execute('RELEASE write')
+                except Exception as e:
+                    conn.execute('ROLLBACK TO write')
+                    conn.execute('RELEASE write')
+                    future.set_exception(e)
+            conn.execute('COMMIT')
+        except Exception as e:
+            # The whole transaction failed, e.g. the database stayed locked
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            for *_, future in writes:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in results:
+            future.set_result(result)
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+def get_write_queue(db_path):
+    """Get the write queue of a database file, starting its writer on first use"""
+    key = str(db_path)
+    with _queues_lock:
+        if key not in _queues:
+            _queues[key] = WriteQueue(db_path)
+        return _queues[key]
+
+@atexit.register
+def _close_queues():
+    with _queues_lock:
+        for write_queue in _queues.values():
+            write_queue.close()
+        _queues.clear()
@@ -0,0 +1,280 @@
+"""Batch jobs on the Money Manager data, without the Streamlit UI
+
+Usage: python -m moneymanager [--db PATH] COMMAND ...
+
+  import FILE [FILE ...]         Import transactions CSV files, skipping rows already imported
+  generate-recurring             Post the recurring transactions that are due up to today
+  export [-o PATH]               Write transactions to a CSV or Excel file, or CSV to stdout
+  report YEAR [MONTH] [--json]   Print a yearly or monthly report
+  warm-up                        Precompute what the first page loads need, logging each step's time
+  serve [STREAMLIT OPTIONS]      Warm up, then run the Streamlit app in the same process
+  maintenance [--keep-changes N] Prune the change journal to its latest changes
+
+Exits with status 1 when a command fails or an import file is rejected.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from database import core
+from database.errors import MoneyManagerError
+
+# Rows handed to the writer per import, bounding the memory a batch holds
+IMPORT_BATCH_ROWS = 50_000
+
+HOME_PAGE = Path(__file__).parent.parent / 'Home.py'
+
+def _parse_files(paths, valid_categories, workers):
+    """Parse CSV files, in worker processes when there are several, yielding (path, rows, errors) in order"""
+    from utils.csv_import import parse_transactions_csv
+
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield (path, *parse_transactions_csv(path, valid_categories))
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths)),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        results = pool.map(parse_transactions_csv, paths, repeat(valid_categories))
+        for path, (rows, errors) in zip(paths, results):
+            yield path, rows, errors
+
+def cmd_import(args):
+    """Parse the files in parallel and import them from this process only
+
+    Worker processes only read, validate and hash; every write goes through
+    this process in batches, so the database sees one writer doing bulk
+    inserts. Each file is hashed on its own, so the result doesn't depend on
+    which files share a batch.
+    """
+    import pandas as pd
+
+    valid_categories = core.get_all_categories()
+    imported = skipped = 0
+    rejected = []
+    batch = []
+
+    def flush():
+        nonlocal imported, skipped
+        if batch:
+            batch_imported, batch_skipped = core.import_transactions(pd.concat(batch, ignore_index=True))
+            imported += batch_imported
+            skipped += batch_skipped
+            batch.clear()
+
+    for path, rows, errors in _parse_files(args.files, valid_categories, args.workers):
+        if errors:
+            rejected.append(path)
+            print(f"{path}: rejected", file=sys.stderr)
+            for error in errors:
+                print(f"  - {error}", file=sys.stderr)
+            continue
+
+        print(f"{path}: {len(rows):,} rows")
+        batch.append(rows)
+        if sum(len(rows) for rows in batch) >= args.batch_rows:
+            flush()
+    flush()
+
+    print(f"Imported {imported:,} transactions, skipped {skipped:,} already imported")
+    if rejected:
+        print(f"{len(rejected)} of {len(args.files)} files rejected", file=sys.stderr)
+        return 1
+    return 0
+
+def cmd_generate_recurring(args):
+    """Post the due recurring transactions and report how many transactions were added"""
+    since_seq = core.get_change_seq()
+    core.generate_recurring_transactions()
+
+    changes = core.get_changes(since_seq, ['transactions'])
+    if changes is None:
+        print("Posted the due recurring transactions")
+    else:
+        posted = int((changes['operation'] == 'insert').sum())
+        print(f"Posted {posted:,} recurring transactions")
+    return 0
+
+def cmd_export(args):
+    """Write transactions, of some years or a month, with signed amounts"""
+    if args.month is not None and len(args.year or []) != 1:
+        print("--month needs exactly one --year", file=sys.stderr)
+        return 2
+
+    df = core.get_transactions(years=args.year)
+    if args.month is not None:
+        df = df[df['date'].str[5:7] == f"{args.month:02d}"]
+    df = df.sort_values(['date', 'id'], ignore_index=True)
+
+    if args.output is None:
+        df.to_csv(sys.stdout, index=False)
+        return 0
+
+    if args.output.suffix.lower() == '.xlsx':
+        df.to_excel(args.output, sheet_name='Transactions', index=False)
+    else:
+        df.to_csv(args.output, index=False)
+    print(f"Exported {len(df):,} transactions to {args.output}")
+    return 0
+
+def _plain(value):
+    """Convert report values to JSON-friendly types"""
+    if hasattr(value, 'to_dict'):
+        return {str(key): _plain(item) for key, item in value.to_dict().items()}
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+def cmd_report(args):
+    """Print the summary of a monthly or yearly report"""
+    from utils.helpers import format_currency, format_signed_currency
+
+    if args.month is None:
+        _, summary = core.generate_yearly_report(args.year)
+        title = f"Report for {args.year}"
+        breakdown = summary.get('category_yearly')
+    else:
+        _, summary = core.generate_monthly_report(args.year, args.month)
+        title = f"Report for {args.year}-{args.month:02d}"
+        breakdown = summary.get('category_breakdown')
+
+    if args.json:
+        json.dump(_plain(summary), sys.stdout, indent=2, default=str)
+        print()
+        return 0
+
+    print(title)
+    if not summary:
+        print("No transactions")
+        return 0
+
+    print(f"{'Total income':<30} {format_currency(summary['total_income']):>15}")
+    print(f"{'Total expenses':<30} {format_currency(summary['total_expenses']):>15}")
+    net_income = summary['total_income'] - summary['total_expenses']
+    print(f"{'Net income':<30} {format_signed_currency(net_income):>15}")
+    print(f"{'Transactions':<30} {summary['transaction_count']:>15,}")
+
+    if breakdown is not None and not breakdown.empty:
+        print("\nExpenses by category")
+        for category, total in breakdown.sort_values(ascending=False).items():
+            print(f"  {category:<28} {format_currency(total):>15}")
+
+    budgets = {key[:-len('_budget_status')]: value for key, value in summary.items()
+               if key.endswith('_budget_status')}
+    if budgets:
+        print("\nBudgets")
+        for category, status in budgets.items():
+            print(f"  {category:<28} {format_currency(status['spent']):>15} of "
+                  f"{format_currency(status['budget'])} ({status['percentage']:.0f}%)")
+    return 0
+
+def _log_warm_up():
+    """Log the warm-up steps to stderr"""
+    logging.basicConfig(format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    logging.getLogger('utils.warmup').setLevel(logging.INFO)
+    # The caches are filled before Streamlit's runtime exists on purpose.
+    # Streamlit sets its loggers' levels on import, so import it first
+    import streamlit  # noqa: F401
+    logging.getLogger('streamlit.runtime.caching.cache_data_api').setLevel(logging.ERROR)
+
+def cmd_warm_up(args):
+    """Fill the transactions snapshot and the shared cache read by the server processes"""
+    from utils.warmup import warm_up
+
+    _log_warm_up()
+    warm_up()
+    return 0
+
+def cmd_serve(args):
+    """Warm up this process, then run the Streamlit server in it
+
+    The server reuses the Streamlit caches filled by the warm-up, so the
+    first session is served from warm caches. A failed warm-up is logged and
+    the server starts anyway.
+    """
+    from streamlit.web import cli as streamlit_cli
+
+    from utils.warmup import warm_up
+
+    _log_warm_up()
+    try:
+        warm_up()
+    except Exception:
+        logging.getLogger(__name__).exception("Warm-up failed, starting cold")
+
+    return streamlit_cli.main(['run', str(HOME_PAGE), *args.streamlit_options], standalone_mode=False)
+
+def cmd_maintenance(args):
+    """Prune the change journal, which only grows between prunes"""
+    pruned = core.prune_change_journal(args.keep_changes)
+    print(f"Pruned {pruned:,} changes from the change journal")
+    return 0
+
+def build_parser():
+    """Build the argument parser of every command"""
+    parser = argparse.ArgumentParser(prog='python -m moneymanager', description=__doc__.splitlines()[0])
+    parser.add_argument('--db', type=Path, help=f"Database file, default {core.DB_PATH}")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="Import transactions CSV files")
+    import_parser.add_argument('files', nargs='+', type=Path)
+    import_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                               help="Processes parsing files, default one per CPU")
+    import_parser.add_argument('--batch-rows', type=int, default=IMPORT_BATCH_ROWS,
+                               help="Rows written per bulk insert")
+    import_parser.set_defaults(handler=cmd_import)
+
+    generate_parser = commands.add_parser('generate-recurring', help="Post due recurring transactions")
+    generate_parser.set_defaults(handler=cmd_generate_recurring)
+
+    export_parser = commands.add_parser('export', help="Export transactions to CSV or Excel")
+    export_parser.add_argument('--year', type=int, action='append', help="Only this year, can be repeated")
+    export_parser.add_argument('--month', type=int, choices=range(1, 13), metavar='MONTH',
+                               help="Only this month of the --year")
+    export_parser.add_argument('-o', '--output', type=Path, help="CSV or .xlsx file, default CSV to stdout")
+    export_parser.set_defaults(handler=cmd_export)
+
+    report_parser = commands.add_parser('report', help="Print a yearly or monthly report")
+    report_parser.add_argument('year', type=int)
+    report_parser.add_argument('month', type=int, nargs='?', choices=range(1, 13), metavar='MONTH')
+    report_parser.add_argument('--json', action='store_true', help="Print the summary as JSON")
+    report_parser.set_defaults(handler=cmd_report)
+
+    warm_up_parser = commands.add_parser('warm-up', help="Precompute what the first page loads need")
+    warm_up_parser.set_defaults(handler=cmd_warm_up)
+
+    serve_parser = commands.add_parser('serve', help="Warm up, then run the Streamlit app")
+    serve_parser.add_argument('streamlit_options', nargs=argparse.REMAINDER,
+                              help="Passed to streamlit run, e.g. --server.port 8501")
+    serve_parser.set_defaults(handler=cmd_serve)
+
+    maintenance_parser = commands.add_parser('maintenance', help="Prune the change journal")
+    maintenance_parser.add_argument('--keep-changes', type=int,
+                                    help="Latest changes to keep, default the backend's retention")
+    maintenance_parser.set_defaults(handler=cmd_maintenance)
+
+    return parser
+
+def main(argv=None):
+    """Run a command and return its exit status"""
+    args = build_parser().parse_args(argv)
+    if args.db is not None:
+        core.DB_PATH = args.db
+
+    try:
+        core.init_db()
+        core.init_settings_tables()
+        return args.handler(args)
+    except MoneyManagerError as e:
+        print(str(e), file=sys.stderr)
+        return 1
@@ -5,18 +5,22 @@ from pathlib import Path
 import pandas as pd
 import io
 
-# Add the root directory to Python path
+# Add the root directory to Python path, once as the script reruns on every interaction
 root_path = Path(__file__).parent.parent
-sys.path.append(str(root_path))
+if str(root_path) not in sys.path:
+    sys.path.append(str(root_path))
 
 from database.db_manager import (
     save_transaction,
+    import_transactions,
     save_fixed_transaction,
     get_transactions,
     check_category_threshold,
     get_all_categories
 )
+from utils.csv_import import to_import_rows, validate_transactions_csv
 from utils.helpers import format_amount, format_currency
+from utils.recurrence import DEFAULT_FREQUENCY, FREQUENCIES
 
 st.set_page_config(
     page_title="Data Entry - Money Manager",
@@ -119,7 +123,7 @@ with tab1:
 # Fixed Transaction Tab
 with tab2:
     with st.form("fixed_transaction_form", clear_on_submit=True):
-        st.info("Fixed transactions will be automatically added each month on the selected day.")
+        st.info("Fixed transactions will be automatically added on every occurrence of the selected schedule.")
         
         col1, col2 = st.columns(2)
         
@@ -131,10 +135,10 @@ with tab2:
             )
             
             amount = st.number_input(
-                "Monthly Amount",
+                "Amount",
                 min_value=0.0,
                 step=0.01,
-                help="Enter the monthly transaction amount"
+                help="Enter the amount of each occurrence"
             )
             
             category = st.selectbox(
@@ -157,6 +161,22 @@ with tab2:
                 help="Add any notes about this fixed transaction",
                 key="fixed_comment"
             )
+            
+            frequency = st.selectbox(
+                "Frequency",
+                list(FREQUENCIES),
+                index=list(FREQUENCIES).index(DEFAULT_FREQUENCY),
+                format_func=str.capitalize,
+                help="Select how often the transaction repeats",
+                key="fixed_frequency"
+            )
+            
+            end_date = st.date_input(
+                "End Date (optional)",
+                value=None,
+                help="Leave empty to repeat indefinitely",
+                key="fixed_end_date"
+            )
 
         # Submit button
         fixed_submitted = st.form_submit_button(
@@ -168,6 +188,8 @@ with tab2:
     if fixed_submitted:
         if amount <= 0:
             st.error("Please enter an amount greater than 0")
+        elif end_date is not None and end_date < start_date:
+            st.error("The end date must be on or after the start date")
         else:
             # Check threshold for fixed expenses
             threshold_warning = None
@@ -185,7 +207,7 @@ with tab2:
                     - This transaction: {format_currency(amount)}
                     - New total: {format_currency(current_total + amount)}
                     
-                    Note: This warning is for the initial transaction. The same amount will be added each month.
+                    Note: This warning is for the initial transaction. The same amount will be added on every occurrence.
                     """
             
             # Display warning if threshold is exceeded
@@ -201,10 +223,13 @@ with tab2:
                 trans_type,
                 category,
                 formatted_amount,
-                comment
+                comment,
+                frequency,
+                end_date.strftime("%Y-%m-%d") if end_date else None
             ):
                 st.success("Fixed transaction saved successfully! ✅")
-                st.info(f"This transaction will be automatically added every month on day {start_date.day}")
+                until = f" until {end_date.strftime('%Y-%m-%d')}" if end_date else ""
+                st.info(f"This transaction will be automatically added {frequency} from {start_date.strftime('%Y-%m-%d')}{until}")
                 st.balloons()
 
 # Bulk Import Tab
@@ -220,7 +245,9 @@ with tab3:
         - category
         - amount (positive number)
         - comment (optional)
+        - external_id (optional, e.g. the bank's transaction reference)
     - The first row should be the header row
+    - Rows that were already imported are skipped, so overlapping files can be re-uploaded
     """)
     
     # File uploader
@@ -235,89 +262,35 @@ with tab3:
             st.subheader("Preview of uploaded data")
             st.dataframe(df.head(), use_container_width=True)
             
-            # Validate columns
-            required_columns = ['date', 'type', 'category', 'amount', 'comment']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            # Validate columns and data
+            validation_errors = validate_transactions_csv(df, get_all_categories())
             
-            if missing_columns:
-                st.error(f"Missing required columns: {', '.join(missing_columns)}")
+            if validation_errors:
+                st.error("Validation errors found:")
+                for error in validation_errors:
+                    st.write(f"- {error}")
             else:
-                # Validate data types and format
-                validation_errors = []
-                
-                # Check date format
-                try:
-                    pd.to_datetime(df['date'])
-                except:
-                    validation_errors.append("Date column should be in YYYY-MM-DD format")
-                
-                # Check transaction types
-                invalid_types = df[~df['type'].isin(['Income', 'Expense'])]['type'].unique()
-                if len(invalid_types) > 0:
-                    validation_errors.append(f"Invalid transaction types found: {', '.join(invalid_types)}")
-                
-                # Check categories
-                valid_categories = get_all_categories()
-                invalid_categories = df[~df['category'].isin(valid_categories)]['category'].unique()
-                if len(invalid_categories) > 0:
-                    validation_errors.append(f"Invalid categories found: {', '.join(invalid_categories)}")
-                
-                # Check amounts
-                if not pd.to_numeric(df['amount'], errors='coerce').notnull().all():
-                    validation_errors.append("All amounts must be valid numbers")
-                
-                if validation_errors:
-                    st.error("Validation errors found:")
-                    for error in validation_errors:
-                        st.write(f"- {error}")
-                else:
-                    # Add import button
-                    if st.button("Import Transactions", type="primary"):
-                        success_count = 0
-                        error_count = 0
-                        
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        for index, row in df.iterrows():
-                            try:
-                                # Format amount based on transaction type
-                                amount = abs(float(row['amount']))
-                                formatted_amount = format_amount(amount, row['type'])
-                                
-                                # Save transaction
-                                if save_transaction(
-                                    row['date'],
-                                    row['type'],
-                                    row['category'],
-                                    formatted_amount,
-                                    str(row['comment']) if pd.notna(row['comment']) else "-"
-                                ):
-                                    success_count += 1
-                                else:
-                                    error_count += 1
-                                
-                                # Update progress
-                                progress = (index + 1) / len(df)
-                                progress_bar.progress(progress)
-                                status_text.text(f"Processing transactions... {index + 1}/{len(df)}")
-                                
-                            except Exception as e:
-                                error_count += 1
-                                st.error(f"Error processing row {index + 1}: {str(e)}")
-                        
-                        # Show final results
-                        if success_count > 0:
-                            st.success(f"""
-                            Import completed!
-                            - Successfully imported: {success_count} transactions
-                            - Failed to import: {error_count} transactions
-                            """)
-                            if success_count == len(df):
-                                st.balloons()
-                        else:
-                            st.error("Failed to import any transactions. Please check the data and try again.")
-                        
+                # Add import button
+                if st.button("Import Transactions", type="primary"):
+                    rows = to_import_rows(df)
+                    
+                    with st.spinner(f"Importing {len(rows)} transactions..."):
+                        success_count, skipped_count = import_transactions(rows)
+                    
+                    # Show final results
+                    if success_count > 0:
+                        st.success(f"""
+                        Import completed!
+                        - Successfully imported: {success_count} transactions
+                        - Skipped as already imported: {skipped_count} transactions
+                        """)
+                        if success_count == len(df):
+                            st.balloons()
+                    elif skipped_count > 0 and skipped_count == len(rows):
+                        st.info(f"All {skipped_count} transactions were already imported, nothing to do.")
+                    else:
+                        st.error("Failed to import any transactions. Please check the data and try again.")
+                    
         except Exception as e:
             st.error(f"Error reading CSV file: {str(e)}")
             st.info("Please make sure your CSV file is properly formatted and try again.")
\ No newline at end of file
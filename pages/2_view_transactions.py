@@ -1,14 +1,18 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import sys
 from pathlib import Path
 
-# Add the root directory to Python path
+# Add the root directory to Python path, once as the script reruns on every interaction
 root_path = Path(__file__).parent.parent
-sys.path.append(str(root_path))
+if str(root_path) not in sys.path:
+    sys.path.append(str(root_path))
 
-from database.db_manager import get_transactions, DB_PATH, get_all_categories
-from utils.helpers import format_currency
+from database.db_manager import DB_PATH, get_all_categories
+from utils.caching import get_cached_transactions
+from utils.helpers import format_currency, format_currencies
+from utils.memory import track_memory
 
 st.set_page_config(
     page_title="View Transactions - Money Manager",
@@ -18,14 +22,11 @@ st.set_page_config(
 
 st.title("View Transactions 📊")
 
-# Get transactions
-df = get_transactions()
+# Get transactions, shared read-only by all sessions: this page filters
+# them through row positions and only builds a frame for the table shown
+df, _ = get_cached_transactions()
 
 if not df.empty:
-    # Check if 'category' column exists, if not, add it with default value
-    if 'category' not in df.columns:
-        df['category'] = 'Other'  # Add default category for old entries
-    
     # Add filters in an expander
     with st.expander("Filters", expanded=True):
         col1, col2 = st.columns(2)
@@ -34,7 +35,7 @@ if not df.empty:
             # Date filter
             date_range = st.date_input(
                 "Select Date Range",
-                [pd.to_datetime(df['date']).min(), pd.to_datetime(df['date']).max()],
+                [df['date'].min(), df['date'].max()],
                 key='date_range'
             )
         
@@ -59,24 +60,30 @@ if not df.empty:
         
         # Filter by category
         mask = (
-            (pd.to_datetime(df['date']).dt.date >= date_range[0]) &
-            (pd.to_datetime(df['date']).dt.date <= date_range[1]) &
+            (df['date'] >= pd.Timestamp(date_range[0])) &
+            (df['date'] < pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)) &
             (df['type'].isin(trans_type)) &
             (df['category'].isin(selected_categories))
         )
     else:
         # Filter without category if we don't have meaningful categories
         mask = (
-            (pd.to_datetime(df['date']).dt.date >= date_range[0]) &
-            (pd.to_datetime(df['date']).dt.date <= date_range[1]) &
+            (df['date'] >= pd.Timestamp(date_range[0])) &
+            (df['date'] < pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)) &
             (df['type'].isin(trans_type))
         )
     
-    filtered_df = df.loc[mask].copy()
+    # Positions of the matching rows, newest first
+    positions = np.flatnonzero(mask.to_numpy())
+    positions = positions[np.argsort(df['date'].to_numpy()[positions], kind='stable')[::-1]]
+    
+    amounts = df['amount'].to_numpy()[positions]
+    is_income = (df['type'] == 'Income').to_numpy()[positions]
+    is_expense = (df['type'] == 'Expense').to_numpy()[positions]
     
-    # Sort by date
-    filtered_df['date'] = pd.to_datetime(filtered_df['date'])
-    filtered_df = filtered_df.sort_values('date', ascending=False)
+    def totals_by_category(rows):
+        """Sum the amounts of the rows at these positions per category"""
+        return df['amount'].iloc[rows].groupby(df['category'].iloc[rows].to_numpy()).sum()
     
     # Display summary metrics
     st.subheader("Summary")
@@ -84,8 +91,8 @@ if not df.empty:
     # Summary by type (Income/Expense)
     col1, col2, col3 = st.columns(3)
     
-    total_income = filtered_df[filtered_df['type'] == 'Income']['amount'].sum()
-    total_expense = abs(filtered_df[filtered_df['type'] == 'Expense']['amount'].sum())
+    total_income = amounts[is_income].sum()
+    total_expense = abs(amounts[is_expense].sum())
     balance = total_income - total_expense
     
     col1.metric(
@@ -117,26 +124,26 @@ if not df.empty:
         
         with cat_col1:
             st.write("Income by Category")
-            income_by_cat = filtered_df[filtered_df['type'] == 'Income'].groupby('category')['amount'].sum()
+            income_by_cat = totals_by_category(positions[is_income])
             if not income_by_cat.empty:
                 income_df = pd.DataFrame({
                     'Category': income_by_cat.index,
                     'Amount': income_by_cat.values
                 })
-                income_df['Amount'] = income_df['Amount'].apply(format_currency)
+                income_df['Amount'] = format_currencies(income_df['Amount'])
                 st.dataframe(income_df, use_container_width=True, hide_index=True)
             else:
                 st.info("No income transactions in selected period")
         
         with cat_col2:
             st.write("Expenses by Category")
-            expense_by_cat = filtered_df[filtered_df['type'] == 'Expense'].groupby('category')['amount'].sum()
+            expense_by_cat = totals_by_category(positions[is_expense])
             if not expense_by_cat.empty:
                 expense_df = pd.DataFrame({
                     'Category': expense_by_cat.index,
                     'Amount': [abs(val) for val in expense_by_cat.values]
                 })
-                expense_df['Amount'] = expense_df['Amount'].apply(format_currency)
+                expense_df['Amount'] = format_currencies(expense_df['Amount'])
                 st.dataframe(expense_df, use_container_width=True, hide_index=True)
             else:
                 st.info("No expense transactions in selected period")
@@ -144,10 +151,12 @@ if not df.empty:
     # Display all transactions
     st.subheader("All Transactions")
     
-    # Format the dataframe for display
-    display_df = filtered_df.copy()
-    display_df['amount'] = display_df['amount'].apply(format_currency)
-    display_df['date'] = display_df['date'].dt.strftime('%Y-%m-%d')
+    # Format the dataframe for display, the only frame built from the filtered rows
+    display_df = df.iloc[positions]
+    display_df = display_df.assign(
+        amount=format_currencies(display_df['amount']),
+        date=display_df['date'].dt.strftime('%Y-%m-%d')
+    )
     
     # Rename columns for display
     column_rename = {
@@ -159,7 +168,8 @@ if not df.empty:
     if 'category' in display_df.columns:
         column_rename['category'] = 'Category'
     
-    display_df.rename(columns=column_rename, inplace=True)
+    display_df = display_df.rename(columns=column_rename)
+    track_memory('View Transactions: table', display_df)
     
     # Configure columns for display
     column_config = {
@@ -1,22 +1,39 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import sys
 from pathlib import Path
-from datetime import datetime
 import calendar
 
-# Add the root directory to Python path
+# Add the root directory to Python path, once as the script reruns on every interaction
 root_path = Path(__file__).parent.parent
-sys.path.append(str(root_path))
+if str(root_path) not in sys.path:
+    sys.path.append(str(root_path))
 
-from database.db_manager import (
-    get_transactions,
-    get_category_thresholds,
-    get_all_categories
+from database.db_manager import get_fixed_transactions
+from utils.helpers import format_currency, format_currencies, format_signed_currency
+from utils.budget import expenses_by_category
+from utils.caching import (
+    DATA_VERSIONS,
+    MONTHS_PER_VERSION,
+    YEARS_PER_VERSION,
+    get_cached_transactions,
+    load_transactions
+)
+from utils.aggregates import compute_yearly_overview
+from utils.shared_cache import shared_cache
+from utils.figure_cache import get_figure
+from utils.downsampling import get_chart_width, spending_trace
+from utils.simulation import build_simulation_inputs, simulate_balances
+from utils.timing import finish_page_timing, start_page_timing, timed, timed_fragment
+from utils.forecasting import (
+    MIN_MONTHS,
+    TOTAL_EXPENSES,
+    TOTAL_INCOME,
+    build_monthly_matrix,
+    fit_models,
+    forecast
 )
-from utils.helpers import format_currency
 
 st.set_page_config(
     page_title="Financial Analytics - Money Manager",
@@ -26,51 +43,66 @@ st.set_page_config(
 
 st.title("Financial Analytics 📈")
 
-# Get transactions
-df = get_transactions()
+start_page_timing("Financial Analytics")
 
-if not df.empty:
-    # Convert date to datetime
-    df['date'] = pd.to_datetime(df['date'])
-    
-    # Add month and year columns for easier filtering
-    df['month'] = df['date'].dt.month
-    df['year'] = df['date'].dt.year
-    
-    # Get all categories
-    categories = get_all_categories()
-    
-    # Sidebar filters
-    st.sidebar.header("Filters")
-    
-    # Year filter
-    years = sorted(df['year'].unique())
-    selected_year = st.sidebar.selectbox("Select Year", years, index=len(years)-1)
+chart_width = get_chart_width()
+
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS * YEARS_PER_VERSION)
+@shared_cache
+def get_available_months(data_version, year):
+    """Get the months of a year that have transactions"""
+    df = load_transactions(data_version)
+    return sorted(df[df['date'].dt.year == year]['date'].dt.month.unique())
+
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS * MONTHS_PER_VERSION)
+@shared_cache
+def compute_monthly_summary(data_version, year, month):
+    """Compute totals, category breakdown and daily expenses for one month"""
+    df = load_transactions(data_version)
+    mask = (df['date'].dt.year == year) & (df['date'].dt.month == month)
+    monthly_data = df[mask]
     
-    # Month filter
-    months = sorted(df[df['year'] == selected_year]['month'].unique())
-    selected_month = st.sidebar.selectbox(
+    return {
+        'transaction_count': len(monthly_data),
+        'income_total': monthly_data[monthly_data['type'] == 'Income']['amount'].sum(),
+        'expense_total': abs(monthly_data[monthly_data['type'] == 'Expense']['amount'].sum()),
+        'expense_by_cat': expenses_by_category(monthly_data),
+        'daily_expenses': monthly_data[
+            monthly_data['type'] == 'Expense'
+        ].groupby('date')['amount'].sum().abs()
+    }
+
+@st.fragment
+@timed_fragment("Financial Analytics: monthly")
+def monthly_section(data_version, selected_year):
+    """Render the monthly charts; changing the month only reruns this section"""
+    with timed('monthly: filtering'):
+        months = get_available_months(data_version, selected_year)
+    selected_month = st.selectbox(
         "Select Month",
         months,
         index=len(months)-1,
-        format_func=lambda x: calendar.month_name[x]
+        format_func=lambda x: calendar.month_name[x],
+        key="analytics_month"
     )
     
-    # Filter data for selected month
-    mask = (df['year'] == selected_year) & (df['month'] == selected_month)
-    monthly_data = df[mask].copy()
+    with timed('monthly: aggregation'):
+        summary = compute_monthly_summary(data_version, selected_year, selected_month)
     
-    if not monthly_data.empty:
-        # 1. Income vs Expenses Overview
-        st.subheader(f"Income vs Expenses - {calendar.month_name[selected_month]} {selected_year}")
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            # Calculate totals
-            income_total = monthly_data[monthly_data['type'] == 'Income']['amount'].sum()
-            expense_total = abs(monthly_data[monthly_data['type'] == 'Expense']['amount'].sum())
-            
-            # Create bar chart
+    if summary['transaction_count'] == 0:
+        st.info(f"No transactions found for {calendar.month_name[selected_month]} {selected_year}")
+        return
+    
+    # 1. Income vs Expenses Overview
+    st.subheader(f"Income vs Expenses - {calendar.month_name[selected_month]} {selected_year}")
+    col1, col2 = st.columns([2, 1])
+    
+    income_total = summary['income_total']
+    expense_total = summary['expense_total']
+    
+    with col1:
+        # Create bar chart
+        def build_overview():
             fig_overview = go.Figure(data=[
                 go.Bar(name='Income', x=['Income'], y=[income_total], marker_color='#2ecc71'),
                 go.Bar(name='Expenses', x=['Expenses'], y=[expense_total], marker_color='#e74c3c')
@@ -82,61 +114,79 @@ if not df.empty:
                 yaxis_title="Amount",
                 showlegend=True
             )
-            st.plotly_chart(fig_overview, use_container_width=True)
+            return fig_overview
         
-        with col2:
-            # Display metrics
-            st.metric("Total Income", format_currency(income_total))
-            st.metric("Total Expenses", format_currency(expense_total))
-            balance = income_total - expense_total
-            st.metric(
-                "Net Balance",
-                format_currency(balance),
-                delta=format_currency(balance) if balance != 0 else None,
-                delta_color="normal" if balance >= 0 else "inverse"
+        with timed('monthly: figure build'):
+            fig_overview = get_figure(
+                "analytics_overview",
+                {'year': selected_year, 'month': selected_month},
+                data_version,
+                build_overview
             )
-        
-        # 2. Expenses by Category
-        st.subheader("Expenses by Category")
-        col3, col4 = st.columns([2, 1])
-        
-        with col3:
-            # Group expenses by category
-            expense_by_cat = monthly_data[monthly_data['type'] == 'Expense'].groupby('category')['amount'].sum().abs()
-            
-            if not expense_by_cat.empty:
-                # Create pie chart
+        with timed('monthly: chart serialization'):
+            st.plotly_chart(fig_overview, use_container_width=True)
+    
+    with col2:
+        # Display metrics
+        st.metric("Total Income", format_currency(income_total))
+        st.metric("Total Expenses", format_currency(expense_total))
+        balance = income_total - expense_total
+        st.metric(
+            "Net Balance",
+            format_currency(balance),
+            delta=format_currency(balance) if balance != 0 else None,
+            delta_color="normal" if balance >= 0 else "inverse"
+        )
+    
+    # 2. Expenses by Category
+    st.subheader("Expenses by Category")
+    col3, col4 = st.columns([2, 1])
+    
+    expense_by_cat = summary['expense_by_cat']
+    
+    with col3:
+        if not expense_by_cat.empty:
+            # Create pie chart
+            def build_expenses():
+                # Imported on a figure cache miss only, loading plotly.express is slow
+                import plotly.express as px
                 fig_expenses = px.pie(
                     values=expense_by_cat.values,
                     names=expense_by_cat.index,
                     title=f"Expense Distribution - {calendar.month_name[selected_month]} {selected_year}"
                 )
                 fig_expenses.update_traces(textinfo='percent+label')
+                return fig_expenses
+            
+            with timed('monthly: figure build'):
+                fig_expenses = get_figure(
+                    "analytics_expense_pie",
+                    {'year': selected_year, 'month': selected_month},
+                    data_version,
+                    build_expenses
+                )
+            with timed('monthly: chart serialization'):
                 st.plotly_chart(fig_expenses, use_container_width=True)
-        
-        with col4:
-            # Display category breakdown table
-            if not expense_by_cat.empty:
-                st.write("Category Breakdown")
-                expense_table = pd.DataFrame({
-                    'Category': expense_by_cat.index,
-                    'Amount': expense_by_cat.values
-                }).sort_values('Amount', ascending=False)
-                expense_table['Amount'] = expense_table['Amount'].apply(format_currency)
+    
+    with col4:
+        # Display category breakdown table
+        if not expense_by_cat.empty:
+            st.write("Category Breakdown")
+            expense_table = pd.DataFrame({
+                'Category': expense_by_cat.index,
+                'Amount': expense_by_cat.values
+            }).sort_values('Amount', ascending=False)
+            expense_table['Amount'] = format_currencies(expense_table['Amount'])
+            with timed('monthly: table serialization'):
                 st.dataframe(expense_table, hide_index=True, use_container_width=True)
-        
-        # 3. Daily Spending Pattern
-        st.subheader("Daily Spending Pattern")
-        daily_expenses = monthly_data[monthly_data['type'] == 'Expense'].groupby('date')['amount'].sum().abs()
-        
+    
+    # 3. Daily Spending Pattern
+    st.subheader("Daily Spending Pattern")
+    daily_expenses = summary['daily_expenses']
+    
+    def build_daily():
         fig_daily = go.Figure()
-        fig_daily.add_trace(go.Scatter(
-            x=daily_expenses.index,
-            y=daily_expenses.values,
-            mode='lines+markers',
-            name='Daily Expenses',
-            line=dict(color='#e74c3c')
-        ))
+        fig_daily.add_trace(spending_trace(daily_expenses, 'Daily Expenses', '#e74c3c', chart_width))
         
         fig_daily.update_layout(
             title=f"Daily Spending Pattern - {calendar.month_name[selected_month]} {selected_year}",
@@ -144,38 +194,30 @@ if not df.empty:
             yaxis_title="Amount",
             height=400
         )
+        return fig_daily
+    
+    with timed('monthly: figure build'):
+        fig_daily = get_figure(
+            "analytics_daily",
+            {'year': selected_year, 'month': selected_month, 'width': chart_width},
+            data_version,
+            build_daily
+        )
+    with timed('monthly: chart serialization'):
         st.plotly_chart(fig_daily, use_container_width=True)
 
-        # 4. Yearly Overview
-        st.subheader("Yearly Overview 📅")
-        
-        # Get yearly data
-        yearly_data = df[df['year'] == selected_year].copy()
-        
-        # Calculate monthly totals
-        monthly_totals = yearly_data.groupby(['month', 'type'])['amount'].sum().unstack(fill_value=0)
-        
-        # Create month labels
-        month_labels = [calendar.month_name[m] for m in range(1, 13)]
-        
-        # Prepare data for all months (filling missing months with 0)
-        full_year_data = []
-        for month_num in range(1, 13):
-            month_name = calendar.month_name[month_num]
-            income = monthly_totals.get('Income', {}).get(month_num, 0)
-            expense = abs(monthly_totals.get('Expense', {}).get(month_num, 0))
-            net = income - expense
-            full_year_data.append({
-                'month_num': month_num,
-                'Month': month_name,
-                'Income': income,
-                'Expense': expense,
-                'Net': net
-            })
-        
-        yearly_df = pd.DataFrame(full_year_data)
-        
-        # Create the yearly overview chart
+@st.fragment
+@timed_fragment("Financial Analytics: yearly")
+def yearly_section(data_version, selected_year):
+    """Render the yearly overview and insights for the selected year"""
+    # 4. Yearly Overview
+    st.subheader("Yearly Overview 📅")
+    
+    with timed('yearly: aggregation'):
+        yearly_df = compute_yearly_overview(data_version, selected_year)
+    
+    # Create the yearly overview chart
+    def build_yearly():
         fig_yearly = go.Figure()
         
         # Add Income bars
@@ -232,133 +274,354 @@ if not df.empty:
                 x=1
             )
         )
-        
-        # Display the chart
+        return fig_yearly
+    
+    with timed('yearly: figure build'):
+        fig_yearly = get_figure(
+            "analytics_yearly",
+            {'year': selected_year},
+            data_version,
+            build_yearly
+        )
+    
+    # Display the chart
+    with timed('yearly: chart serialization'):
         st.plotly_chart(fig_yearly, use_container_width=True)
-        
-        # Display monthly breakdown table
-        st.subheader("Monthly Breakdown Table")
-        
-        display_df = yearly_df.copy()
-        display_df['Income'] = display_df['Income'].apply(format_currency)
-        display_df['Expenses'] = display_df['Expense'].apply(format_currency)
-        display_df['Net Income'] = display_df['Net'].apply(format_currency)
-        display_df = display_df[['Month', 'Income', 'Expenses', 'Net Income']]
-        
+    
+    # Display monthly breakdown table
+    st.subheader("Monthly Breakdown Table")
+    
+    display_df = yearly_df.copy()
+    display_df['Income'] = format_currencies(display_df['Income'])
+    display_df['Expenses'] = format_currencies(display_df['Expense'])
+    display_df['Net Income'] = format_currencies(display_df['Net'])
+    display_df = display_df[['Month', 'Income', 'Expenses', 'Net Income']]
+    
+    with timed('yearly: table serialization'):
         st.dataframe(
             display_df,
             use_container_width=True,
             hide_index=True
         )
+    
+    # Monthly Insights
+    st.subheader("Monthly Insights")
+    
+    col5, col6 = st.columns(2)
+    
+    with col5:
+        best_month = yearly_df.loc[yearly_df['Net'].idxmax()]
+        st.success(f"""
+        💰 Best performing month: **{best_month['Month']}**
+        - Income: {format_currency(best_month['Income'])}
+        - Expenses: {format_currency(best_month['Expense'])}
+        - Net Income: {format_currency(best_month['Net'])}
+        """)
+    
+    with col6:
+        worst_month = yearly_df.loc[yearly_df['Net'].idxmin()]
+        st.error(f"""
+        📉 Month with lowest net income: **{worst_month['Month']}**
+        - Income: {format_currency(worst_month['Income'])}
+        - Expenses: {format_currency(worst_month['Expense'])}
+        - Net Income: {format_currency(worst_month['Net'])}
+        """)
+
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS)
+@shared_cache
+def fit_forecast_models(data_version, current_month):
+    """Fit forecasting models for every category over the complete months before current_month
+
+    current_month, as 'YYYY-MM', is part of the cache key: the fit and the
+    months it forecasts move on with the calendar, not only with the data.
+    """
+    df = load_transactions(data_version)
+    return fit_models(build_monthly_matrix(df, pd.Period(current_month, 'M').to_timestamp()))
+
+@st.fragment
+@timed_fragment("Financial Analytics: forecast")
+def forecast_section(data_version):
+    """Render the income and expense forecast; changing the horizon only reruns this section"""
+    # 5. Financial Forecasting
+    st.subheader("Financial Forecasting 🔮")
+    
+    current_month = str(pd.Period.now('M'))
+    with timed('forecast: model fit'):
+        model = fit_forecast_models(data_version, current_month)
+    
+    if model is None:
+        st.info(f"At least {MIN_MONTHS} complete months of history are needed for a forecast.")
+        return
+    
+    horizon = st.slider(
+        "Forecast horizon (months)",
+        min_value=1,
+        max_value=24,
+        value=6,
+        key="forecast_horizon"
+    )
+    
+    with timed('forecast: aggregation'):
+        forecast_df = forecast(model, horizon)
+    history = model['history'].tail(24)
+    
+    def build_forecast():
+        fig_forecast = go.Figure()
         
-        # Monthly Insights
-        st.subheader("Monthly Insights")
+        series_styles = [
+            (TOTAL_INCOME, 'Income', '#2ecc71', '#27ae60', 'rgba(46, 204, 113, 0.2)'),
+            (TOTAL_EXPENSES, 'Expenses', '#e74c3c', '#c0392b', 'rgba(231, 76, 60, 0.2)')
+        ]
         
-        col5, col6 = st.columns(2)
+        for series, label, history_color, forecast_color, band_color in series_styles:
+            predicted = forecast_df[forecast_df['series'] == series]
+            
+            # Historical data
+            fig_forecast.add_trace(go.Scatter(
+                name=f'{label} (Historical)',
+                x=history.index.to_timestamp(),
+                y=history[series],
+                mode='lines+markers',
+                line=dict(color=history_color, dash='dot')
+            ))
+            
+            # Confidence band
+            fig_forecast.add_trace(go.Scatter(
+                name=f'{label} (95% band)',
+                x=list(predicted['month']) + list(predicted['month'][::-1]),
+                y=list(predicted['upper']) + list(predicted['lower'][::-1]),
+                fill='toself',
+                fillcolor=band_color,
+                line=dict(width=0),
+                hoverinfo='skip'
+            ))
+            
+            # Forecasted data
+            fig_forecast.add_trace(go.Scatter(
+                name=f'{label} (Forecast)',
+                x=predicted['month'],
+                y=predicted['forecast'],
+                mode='lines+markers',
+                line=dict(color=forecast_color, width=3)
+            ))
         
-        with col5:
-            best_month = yearly_df.loc[yearly_df['Net'].idxmax()]
-            st.success(f"""
-            💰 Best performing month: **{best_month['Month']}**
-            - Income: {format_currency(best_month['Income'])}
-            - Expenses: {format_currency(best_month['Expense'])}
-            - Net Income: {format_currency(best_month['Net'])}
-            """)
+        fig_forecast.update_layout(
+            title=f'{horizon}-Month Financial Forecast',
+            xaxis_title='Month',
+            yaxis_title='Amount',
+            height=500,
+            showlegend=True
+        )
+        return fig_forecast
+    
+    with timed('forecast: figure build'):
+        fig_forecast = get_figure(
+            "analytics_forecast",
+            {'horizon': horizon, 'month': current_month},
+            data_version,
+            build_forecast
+        )
+    
+    with timed('forecast: chart serialization'):
+        st.plotly_chart(fig_forecast, use_container_width=True)
+    
+    # Forecast insights
+    st.subheader("Forecast Insights")
+    col1, col2 = st.columns(2)
+    
+    # The forecast starts at the current month, whose total is still open
+    first_month = forecast_df['month'].min()
+    this_month = forecast_df[forecast_df['month'] == first_month].set_index('series')
+    
+    with col1:
+        # Calculate this month's forecasted values
+        this_month_income = this_month.loc[TOTAL_INCOME, 'forecast']
+        this_month_expense = this_month.loc[TOTAL_EXPENSES, 'forecast']
         
-        with col6:
-            worst_month = yearly_df.loc[yearly_df['Net'].idxmin()]
-            st.error(f"""
-            📉 Month with lowest net income: **{worst_month['Month']}**
-            - Income: {format_currency(worst_month['Income'])}
-            - Expenses: {format_currency(worst_month['Expense'])}
-            - Net Income: {format_currency(worst_month['Net'])}
-            """)
+        st.info(f"""
+        🔮 **This Month Forecast** ({first_month:%B %Y})
+        - Projected Income: {format_currency(this_month_income)}
+        - Projected Expenses: {format_currency(this_month_expense)}
+        - Projected Net: {format_signed_currency(this_month_income - this_month_expense)}
+        """)
+    
+    with col2:
+        # Expected spending per category over the whole horizon
+        category_forecast = forecast_df[forecast_df['series'].str.startswith('Expense: ')]
+        category_forecast = category_forecast.groupby('series')[['forecast', 'lower', 'upper']].sum()
+        category_forecast = category_forecast.sort_values('forecast', ascending=False).head(10)
         
-        # 5. Financial Forecasting
-        st.subheader("Financial Forecasting 🔮")
+        st.write(f"Projected Expenses by Category - {horizon} months from {first_month:%B %Y}")
+        category_table = pd.DataFrame({
+            'Category': category_forecast.index.str.replace('Expense: ', '', regex=False),
+            'Forecast': format_currencies(category_forecast['forecast']).to_numpy(),
+            'Range': [
+                f"{format_currency(low)} - {format_currency(high)}"
+                for low, high in zip(category_forecast['lower'], category_forecast['upper'])
+            ]
+        })
+        with timed('forecast: table serialization'):
+            st.dataframe(category_table, hide_index=True, use_container_width=True)
 
-        # Calculate 3-month moving averages for smoother forecasting
-        forecast_data = yearly_df.copy()
-        forecast_data['MA3_Income'] = forecast_data['Income'].rolling(window=3).mean()
-        forecast_data['MA3_Expense'] = forecast_data['Expense'].rolling(window=3).mean()
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS)
+@shared_cache
+def compute_daily_history(data_version):
+    """Compute total expenses per day over the full history"""
+    df = load_transactions(data_version)
+    expenses = df[df['type'] == 'Expense']
+    return expenses.groupby('date')['amount'].sum().abs()
 
-        # Create the forecast visualization
-        fig_forecast = go.Figure()
-
-        # Historical data
-        fig_forecast.add_trace(go.Scatter(
-            name='Income (Historical)',
-            x=forecast_data['Month'][:len(forecast_data)],
-            y=forecast_data['Income'],
-            mode='lines+markers',
-            line=dict(color='#2ecc71', dash='dot')
-        ))
-
-        fig_forecast.add_trace(go.Scatter(
-            name='Expenses (Historical)',
-            x=forecast_data['Month'][:len(forecast_data)],
-            y=forecast_data['Expense'],
-            mode='lines+markers',
-            line=dict(color='#e74c3c', dash='dot')
-        ))
+@st.fragment
+@timed_fragment("Financial Analytics: history")
+def history_section(data_version):
+    """Render daily spending over the full history, downsampled to the chart width"""
+    st.subheader("Daily Spending History 📆")
+    
+    with timed('history: aggregation'):
+        daily_history = compute_daily_history(data_version)
+    
+    if daily_history.empty:
+        st.info("No expenses recorded yet")
+        return
+    
+    def build_history():
+        fig_history = go.Figure()
+        fig_history.add_trace(spending_trace(daily_history, 'Daily Expenses', '#e74c3c', chart_width))
+        
+        fig_history.update_layout(
+            title="Daily Spending - All Years",
+            xaxis_title="Date",
+            yaxis_title="Amount",
+            xaxis=dict(rangeslider=dict(visible=True)),
+            height=450
+        )
+        return fig_history
+    
+    with timed('history: figure build'):
+        fig_history = get_figure(
+            "analytics_daily_history",
+            {'width': chart_width},
+            data_version,
+            build_history
+        )
+    with timed('history: chart serialization'):
+        st.plotly_chart(fig_history, use_container_width=True)
 
-        # Forecasted data (using moving averages)
-        fig_forecast.add_trace(go.Scatter(
-            name='Income (Forecast)',
-            x=forecast_data['Month'][len(forecast_data)-3:],
-            y=forecast_data['MA3_Income'].tail(3),
-            mode='lines',
-            line=dict(color='#27ae60', width=3)
-        ))
+# A few of the horizon and path count combinations
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS * 8)
+@shared_cache
+def run_cash_flow_projection(data_version, years, n_paths):
+    """Simulate balance percentiles from recurring and historical variable flows"""
+    df = load_transactions(data_version)
+    inputs = build_simulation_inputs(df, get_fixed_transactions())
+    return simulate_balances(inputs, years, n_paths=n_paths)
 
-        fig_forecast.add_trace(go.Scatter(
-            name='Expenses (Forecast)',
-            x=forecast_data['Month'][len(forecast_data)-3:],
-            y=forecast_data['MA3_Expense'].tail(3),
+@st.fragment
+@timed_fragment("Financial Analytics: projection")
+def projection_section(data_version):
+    """Render the Monte Carlo cash-flow projection; its controls only rerun this section"""
+    st.subheader("Cash-Flow Projection 🎲")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        years = st.slider(
+            "Projection horizon (years)",
+            min_value=1,
+            max_value=5,
+            value=2,
+            key="projection_years"
+        )
+    
+    with col2:
+        n_paths = st.selectbox(
+            "Simulated paths",
+            [1000, 5000, 10000, 20000],
+            index=1,
+            key="projection_paths"
+        )
+    
+    with st.spinner("Simulating cash flow..."), timed('projection: simulation'):
+        bands = run_cash_flow_projection(data_version, years, n_paths)
+    
+    def build_projection():
+        fig_projection = go.Figure()
+        
+        # Outer and inner percentile bands
+        for low, high, color, label in [
+            ('p5', 'p95', 'rgba(52, 152, 219, 0.15)', '5th-95th percentile'),
+            ('p25', 'p75', 'rgba(52, 152, 219, 0.3)', '25th-75th percentile')
+        ]:
+            fig_projection.add_trace(go.Scatter(
+                name=label,
+                x=list(bands.index) + list(bands.index[::-1]),
+                y=list(bands[high]) + list(bands[low][::-1]),
+                fill='toself',
+                fillcolor=color,
+                line=dict(width=0),
+                hoverinfo='skip'
+            ))
+        
+        fig_projection.add_trace(go.Scatter(
+            name='Median balance',
+            x=bands.index,
+            y=bands['p50'],
             mode='lines',
-            line=dict(color='#c0392b', width=3)
+            line=dict(color='#3498db', width=3)
         ))
-
-        fig_forecast.update_layout(
-            title='3-Month Financial Forecast',
+        
+        fig_projection.update_layout(
+            title=f'Projected Balance - next {years} year(s)',
             xaxis_title='Month',
-            yaxis_title='Amount',
+            yaxis_title='Balance',
             height=500,
             showlegend=True
         )
+        return fig_projection
+    
+    with timed('projection: figure build'):
+        fig_projection = get_figure(
+            "analytics_projection",
+            {'years': years, 'paths': n_paths},
+            data_version,
+            build_projection
+        )
+    
+    with timed('projection: chart serialization'):
+        st.plotly_chart(fig_projection, use_container_width=True)
+    
+    final = bands.iloc[-1]
+    st.info(f"""
+    🎲 **Balance in {years} year(s)** ({n_paths:,} simulated paths)
+    - Median: {format_signed_currency(final['p50'])}
+    - Likely range (25th-75th percentile): {format_signed_currency(final['p25'])} to {format_signed_currency(final['p75'])}
+    - Worst case (5th percentile): {format_signed_currency(final['p5'])}
+    """)
+    if final['p5'] < 0:
+        st.warning(f"⚠️ In the worst 5% of simulated paths the balance is overdrawn within {years} year(s)")
 
-        st.plotly_chart(fig_forecast, use_container_width=True)
-
-        # Forecast insights
-        st.subheader("Forecast Insights")
-        col1, col2 = st.columns(2)
-
-        with col1:
-            # Calculate average monthly growth rates
-            income_growth = forecast_data['Income'].pct_change().mean() * 100
-            expense_growth = forecast_data['Expense'].pct_change().mean() * 100
-            
-            st.info(f"""
-            📈 **Growth Trends**
-            - Average monthly income growth: {income_growth:.1f}%
-            - Average monthly expense growth: {expense_growth:.1f}%
-            """)
+# Get transactions
+with timed('data load'):
+    df, data_version = get_cached_transactions()
 
-        with col2:
-            # Calculate next month's forecasted values
-            next_month_income = forecast_data['MA3_Income'].iloc[-1]
-            next_month_expense = forecast_data['MA3_Expense'].iloc[-1]
-            
-            st.info(f"""
-            🔮 **Next Month Forecast**
-            - Projected Income: {format_currency(next_month_income)}
-            - Projected Expenses: {format_currency(next_month_expense)}
-            - Projected Net: {format_currency(next_month_income - next_month_expense)}
-            """)
-    else:
-        st.info(f"No transactions found for {calendar.month_name[selected_month]} {selected_year}")
+if not df.empty:
+    # Sidebar filters
+    st.sidebar.header("Filters")
+    
+    # Year filter
+    with timed('filtering'):
+        years = sorted(df['date'].dt.year.unique())
+    selected_year = st.sidebar.selectbox("Select Year", years, index=len(years)-1)
+    
+    monthly_section(data_version, selected_year)
+    yearly_section(data_version, selected_year)
+    forecast_section(data_version)
+    projection_section(data_version)
+    history_section(data_version)
 
 else:
     st.error("""
     No transactions found. Please add some transactions in the Data Entry page.
-    """)
\ No newline at end of file
+    """)
+
+finish_page_timing()
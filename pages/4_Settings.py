@@ -2,9 +2,10 @@ import streamlit as st
 import sys
 from pathlib import Path
 
-# Add the root directory to Python path
+# Add the root directory to Python path, once as the script reruns on every interaction
 root_path = Path(__file__).parent.parent
-sys.path.append(str(root_path))
+if str(root_path) not in sys.path:
+    sys.path.append(str(root_path))
 
 from database.db_manager import (
     init_settings_tables,
@@ -15,8 +16,17 @@ from database.db_manager import (
     init_custom_categories,
     get_all_categories,
     add_custom_category,
-    delete_custom_category
+    delete_custom_category,
+    get_transaction_years,
+    get_archived_years,
+    archive_year,
+    restore_year
 )
+from utils.caching import get_cached_transactions
+from utils.downsampling import CHART_WIDTH_SETTING, get_chart_width
+from utils.memory import format_bytes, object_bytes, session_memory_report
+from utils.timing import DEVELOPER_MODE_SETTING, TIMINGS_FILE_NAME
+from datetime import datetime
 
 st.set_page_config(
     page_title="Settings - Money Manager",
@@ -210,6 +220,96 @@ with tab4:
 
 # Add a section for data management
 st.subheader("Data Management")
+with st.expander("Archive Past Years"):
+    st.info("""
+    Archived years are moved to their own database file. Pages that show the
+    current year no longer read them, and yearly reports open only the year
+    they display. Archived transactions are read-only until the year is restored.
+    """)
+    
+    archived_years = get_archived_years()
+    open_years = [
+        year for year in get_transaction_years()
+        if year < datetime.now().year and year not in archived_years
+    ]
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("Archive a Year")
+        if open_years:
+            year_to_archive = st.selectbox("Year", open_years, key="archive_year")
+            if st.button("Archive Year", type="primary"):
+                moved = archive_year(year_to_archive)
+                if moved:
+                    st.success(f"Archived {moved} transactions from {year_to_archive}")
+                    st.rerun()
+        else:
+            st.write("No past years left to archive.")
+    
+    with col2:
+        st.write("Restore a Year")
+        if archived_years:
+            year_to_restore = st.selectbox("Year", archived_years, key="restore_year")
+            if st.button("Restore Year"):
+                restored = restore_year(year_to_restore)
+                if restored:
+                    st.success(f"Restored {restored} transactions from {year_to_restore}")
+                    st.rerun()
+        else:
+            st.write("No archived years.")
+
+with st.expander("Charts"):
+    chart_width = st.number_input(
+        "Chart width (pixels)",
+        min_value=300,
+        max_value=4000,
+        value=get_chart_width(),
+        step=100,
+        help="Daily spending charts draw at most two points per pixel of this width"
+    )
+    
+    if st.button("Save Chart Settings"):
+        if update_setting(CHART_WIDTH_SETTING, str(chart_width)):
+            st.success("Chart settings updated successfully!")
+            st.rerun()
+
+with st.expander("Diagnostics"):
+    st.write("Developer Mode")
+    developer_mode = st.checkbox(
+        "Show page timings",
+        value=get_setting(DEVELOPER_MODE_SETTING) == 'True',
+        help="Show the time and data layer operations of each section of the Financial Analytics and Reports pages"
+    )
+    st.caption(
+        f"Timings are also written to data/{TIMINGS_FILE_NAME.format(pid='<process id>')}, "
+        "one file per server process, whether or not they are shown."
+    )
+    
+    if st.button("Save Developer Settings"):
+        if update_setting(DEVELOPER_MODE_SETTING, str(developer_mode)):
+            st.success("Developer settings updated successfully!")
+            st.rerun()
+    
+    st.write("Memory")
+    st.caption("""
+    All sessions share one read-only copy of the transactions; each session
+    only holds what its pages built from it and its own settings.
+    """)
+    
+    # Measuring walks the session's data, so only on request
+    if st.button("Measure Memory Use"):
+        transactions_df, data_version = get_cached_transactions()
+        st.write(
+            f"Shared transactions frame (data version {data_version}): "
+            f"{len(transactions_df):,} rows, {format_bytes(object_bytes(transactions_df))}"
+        )
+        
+        report = session_memory_report()
+        st.write(f"This session: {format_bytes(int(report['Bytes'].sum()))}")
+        report['Size'] = report['Bytes'].map(format_bytes)
+        st.dataframe(report[['Item', 'Held by', 'Size']], hide_index=True, use_container_width=True)
+
 with st.expander("Export/Import Settings"):
     col1, col2 = st.columns(2)
     
@@ -1,21 +1,23 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 import sys
 from pathlib import Path
 import calendar
 
-# Add the root directory to Python path
+# Add the root directory to Python path, once as the script reruns on every interaction
 root_path = Path(__file__).parent.parent
-sys.path.append(str(root_path))
+if str(root_path) not in sys.path:
+    sys.path.append(str(root_path))
 
 from database.db_manager import (
-    get_transactions,
     get_category_thresholds,
     update_category_threshold,
-    get_all_categories
+    get_all_categories,
+    get_scheduled_transactions
 )
 from utils.helpers import format_currency
+from utils.caching import get_cached_transactions
+from utils.budget import compute_budget_status, expenses_by_category
 
 st.set_page_config(
     page_title="Budget Planning - Money Manager",
@@ -33,6 +35,7 @@ with tab1:
     
     # Get current budget/thresholds
     current_thresholds = get_category_thresholds()
+    current_limits = dict(zip(current_thresholds['category'], current_thresholds['monthly_limit']))
     
     # Create columns for better layout
     col1, col2 = st.columns([2, 1])
@@ -53,11 +56,7 @@ with tab1:
                 col_idx = i % 3
                 with budget_cols[col_idx]:
                     # Get current value safely
-                    current_value = current_thresholds[
-                        current_thresholds['category'] == category
-                    ]['monthly_limit'].iloc[0] if len(current_thresholds[
-                        current_thresholds['category'] == category
-                    ]) > 0 else 0.0
+                    current_value = current_limits.get(category, 0.0)
                     
                     budgets[category] = st.number_input(
                         f"{category}",
@@ -112,12 +111,10 @@ with tab1:
 with tab2:
     st.subheader("Budget Tracking")
     
-    # Get transactions
-    df = get_transactions()
+    # The shared read-only frame, with parsed dates
+    df, _ = get_cached_transactions()
     
     if not df.empty:
-        # Convert date to datetime
-        df['date'] = pd.to_datetime(df['date'])
         current_month = datetime.now().month
         current_year = datetime.now().year
         
@@ -143,9 +140,15 @@ with tab2:
         current_data = df[mask]
         
         # Calculate spending by category
-        category_spending = current_data[
-            current_data['type'] == 'Expense'
-        ].groupby('category')['amount'].sum().abs()
+        category_spending = expenses_by_category(current_data)
+        
+        # Recurring expenses still to be posted this month
+        days_in_month = calendar.monthrange(selected_year, selected_month)[1]
+        scheduled = get_scheduled_transactions(
+            datetime(selected_year, selected_month, 1),
+            datetime(selected_year, selected_month, days_in_month)
+        )
+        scheduled_spending = expenses_by_category(scheduled)
         
         # Get budget limits
         budget_df = get_category_thresholds()
@@ -157,62 +160,55 @@ with tab2:
         st.write(f"Budget Progress - {calendar.month_name[selected_month]} {selected_year}")
         
         if not category_spending.empty:
-            total_budget = 0
-            total_spent = 0
+            budget_status = compute_budget_status(category_spending, budget_df, categories=CATEGORIES)
+            
+            # Only show categories with budget set
+            budget_status = budget_status[budget_status['budget'] > 0]
+            total_budget = budget_status['budget'].sum()
+            total_spent = budget_status['spent'].sum()
             
-            for category in CATEGORIES:
-                budget_limit = budget_df[
-                    budget_df['category'] == category
-                ]['monthly_limit'].iloc[0] if len(budget_df[
-                    budget_df['category'] == category
-                ]) > 0 else 0.0
+            for row in budget_status.itertuples(index=False):
+                category = row.category
+                budget_limit = row.budget
+                current_spent = row.spent
                 
-                current_spent = category_spending.get(category, 0)
+                progress = min(row.percentage, 100)
                 
-                if budget_limit > 0:  # Only show categories with budget set
-                    total_budget += budget_limit
-                    total_spent += current_spent
-                    
-                    progress = min(current_spent / budget_limit * 100, 100)
-                    
-                    # Determine color based on progress
-                    color = (
-                        "normal" if progress <= 75 
-                        else "warning" if progress <= 90 
-                        else "error"
-                    )
-                    
-                    st.write(f"**{category}**")
-                    
-                    # Create progress bar
-                    progress_container = st.container()
-                    progress_container.progress(
-                        progress / 100,
-                        text=f"{progress:.1f}%"
-                    )
-                    
-                    # Display metrics
-                    col1, col2, col3 = st.columns(3)
-                    col1.metric(
-                        "Spent",
-                        format_currency(current_spent)
-                    )
-                    col2.metric(
-                        "Budget",
-                        format_currency(budget_limit)
-                    )
-                    col3.metric(
-                        "Remaining",
-                        format_currency(max(budget_limit - current_spent, 0))
+                st.write(f"**{category}**")
+                
+                # Create progress bar
+                progress_container = st.container()
+                progress_container.progress(
+                    progress / 100,
+                    text=f"{progress:.1f}%"
+                )
+                
+                # Display metrics
+                col1, col2, col3 = st.columns(3)
+                col1.metric(
+                    "Spent",
+                    format_currency(current_spent)
+                )
+                col2.metric(
+                    "Budget",
+                    format_currency(budget_limit)
+                )
+                col3.metric(
+                    "Remaining",
+                    format_currency(row.remaining)
+                )
+                
+                upcoming = scheduled_spending.get(category, 0)
+                if upcoming > 0:
+                    st.caption(f"🔁 {format_currency(upcoming)} of recurring expenses still scheduled this month")
+                
+                # Add warning if over budget
+                if row.alert_level == 'error':
+                    st.warning(
+                        f"⚠️ {category} spending is at {progress:.1f}% of budget!"
                     )
-                    
-                    # Add warning if over budget
-                    if progress > 90:
-                        st.warning(
-                            f"⚠️ {category} spending is at {progress:.1f}% of budget!"
-                        )
-                    
-                    st.divider()
+                
+                st.divider()
             
             # Display total budget summary
             st.subheader("Total Budget Summary")
@@ -1,22 +1,25 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import sys
 from pathlib import Path
 import io
 
-# Add the root directory to Python path
+# Add the root directory to Python path, once as the script reruns on every interaction
 root_path = Path(__file__).parent.parent
-sys.path.append(str(root_path))
+if str(root_path) not in sys.path:
+    sys.path.append(str(root_path))
 
 from database.db_manager import (
-    get_transactions,
     update_transaction,
     delete_transaction,
     search_transactions,
     get_all_categories
 )
-from utils.helpers import format_currency
+from utils.caching import get_cached_transactions
+from utils.helpers import format_currencies, format_transactions_for_export
+from utils.memory import track_memory
 
 st.set_page_config(
     page_title="Transaction Management - Money Manager",
@@ -54,54 +57,34 @@ with col3:
         help="Filter transactions with amount less than this value"
     )
 
-# Update where we get and prepare the dataframe
-
 # Get transactions based on search criteria
-df = search_transactions(search_term, min_amount, max_amount) if any([search_term, min_amount, max_amount]) else get_transactions()
-
-if not df.empty:
-    # Make sure we only have one ID column
-    if 'rowid' in df.columns and 'id' in df.columns:
-        df = df.drop(columns=['rowid'])
-    elif 'rowid' in df.columns:
-        df = df.rename(columns={'rowid': 'id'})
-
-    # Convert date to datetime for sorting and format display
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.sort_values('date', ascending=False)
-    
-    # Format amount for display
-    display_df = df.copy()
-    
-    # Verify we have unique column names
-    print("Column names:", display_df.columns.tolist())  # Debug print
+if any([search_term, min_amount, max_amount]):
+    df = search_transactions(search_term, min_amount, max_amount)
     
-    # Add formatted amount column
-    display_df['formatted_amount'] = display_df['amount'].apply(format_currency)
-    
-    # Add delete column if not present
-    if 'delete' not in display_df.columns:
-        display_df['delete'] = False
+    if not df.empty:
+        # Make sure we only have one ID column
+        if 'rowid' in df.columns and 'id' in df.columns:
+            df = df.drop(columns=['rowid'])
+        elif 'rowid' in df.columns:
+            df = df.rename(columns={'rowid': 'id'})
         
-    # Verify no duplicate column names
-    assert len(display_df.columns) == len(set(display_df.columns)), "Duplicate columns found!"
-
+        df['date'] = pd.to_datetime(df['date'])
+else:
+    # Shared read-only by all sessions, so it is only read from here on
+    df, _ = get_cached_transactions()
 
 # Get all categories (including custom ones)
 categories = get_all_categories()
 
 if not df.empty:
-    # Convert date to datetime for sorting and format display
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.sort_values('date', ascending=False)
-    
-    # Format amount for display
-    display_df = df.copy()
-    display_df['formatted_amount'] = display_df['amount'].apply(format_currency)
-    
-    # Add delete column if not present
-    if 'delete' not in display_df.columns:
-        display_df['delete'] = False
+    # The editor's frame, newest first, is the only copy this page makes
+    newest_first = np.argsort(df['date'].to_numpy(), kind='stable')[::-1]
+    display_df = df.iloc[newest_first]
+    display_df = display_df.assign(
+        formatted_amount=format_currencies(display_df['amount']),
+        delete=False
+    )
+    track_memory('Transaction Management: editor', display_df)
     
     # Display editable dataframe
     st.subheader("Edit Transactions")
@@ -239,10 +222,7 @@ if not df.empty:
     st.subheader("Export Transactions")
     
     # Prepare export dataframe
-    export_df = df.copy()
-    export_df['date'] = export_df['date'].dt.strftime('%Y-%m-%d')
-    export_df['amount'] = export_df['amount'].apply(format_currency)
-    export_df = export_df.drop(columns=['delete']) if 'delete' in export_df.columns else export_df
+    export_df = format_transactions_for_export(display_df.drop(columns=['formatted_amount', 'delete']))
     
     col1, col2 = st.columns(2)
     
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the root directory to Python path
+root_path = Path(__file__).parent.parent
+if str(root_path) not in sys.path:
+    sys.path.append(str(root_path))
+
+from database import core
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the data layer at a new SQLite database in a temporary directory"""
+    path = tmp_path / 'transactions.db'
+    monkeypatch.setattr(core, 'DB_PATH', path)
+    core.set_backend(None)
+    core.init_db()
+    core.init_settings_tables()
+    return path
@@ -0,0 +1,72 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from database import core
+from database.errors import StorageError
+
+def test_archiving_a_year_without_transactions_creates_no_archive(db_path):
+    core.save_transaction('2023-05-01', 'Expense', 'Groceries', -10.0, 'Market')
+
+    assert core.archive_year(2022) == 0
+
+    assert core.get_archived_years() == []
+    assert not core.get_backend().get_archive_path(2022).exists()
+
+def test_yearly_range_attaches_only_its_archive(db_path, monkeypatch):
+    for year in (2022, 2023):
+        core.save_transaction(f'{year}-05-01', 'Expense', 'Groceries', -10.0, f'Market {year}')
+        assert core.archive_year(year) == 1
+
+    backend = core.get_backend()
+    attached = []
+    connect_transactions = backend.connect_transactions
+
+    def record_years(years=None):
+        attached.append(years)
+        return connect_transactions(years)
+
+    monkeypatch.setattr(backend, 'connect_transactions', record_years)
+    df = backend.get_transactions_between('2022-01-01', '2023-01-01')
+
+    assert attached == [[2022]]
+    assert df['comment'].tolist() == ['Market 2022']
+
+def test_failed_restore_releases_the_write_lock(db_path):
+    core.save_transaction('2022-05-01', 'Expense', 'Groceries', -10.0, 'Market')
+    assert core.archive_year(2022) == 1
+
+    # A row taking the archived row's id makes the restore fail midway
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO transactions (id, date, type, category, amount, comment) "
+                     "VALUES (1, '2023-01-01', 'Expense', 'Groceries', -5.0, 'Clash')")
+    conn.close()
+
+    with pytest.raises(StorageError):
+        core.restore_year(2022)
+
+    # Another writer gets the lock without waiting
+    conn = sqlite3.connect(db_path, timeout=0.1)
+    conn.execute("UPDATE transactions SET comment = 'Clash resolved' WHERE id = 1")
+    conn.commit()
+    conn.close()
+    assert core.get_archived_years() == [2022]
+
+def test_reimporting_an_archived_year_skips_its_rows(db_path):
+    statement = pd.DataFrame({
+        'date': ['2022-05-01', '2022-05-02'],
+        'type': 'Expense',
+        'category': 'Groceries',
+        'amount': [-10.0, -20.0],
+        'comment': ['Market', 'Bakery']
+    })
+    assert core.import_transactions(statement) == (2, 0)
+    assert core.archive_year(2022) == 2
+
+    # One new row, one already archived
+    statement.loc[1, 'comment'] = 'Butcher'
+    assert core.import_transactions(statement) == (1, 1)
+
+    assert core.restore_year(2022) == 2
+    assert sorted(core.get_transactions()['comment']) == ['Bakery', 'Butcher', 'Market']
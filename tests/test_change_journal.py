@@ -0,0 +1,25 @@
+from database import core
+from moneymanager.cli import main
+
+def save_transactions(count):
+    for i in range(count):
+        core.save_transaction('2024-03-01', 'Expense', 'Groceries', 10.0 + i, f"Market {i}")
+
+def test_init_db_does_not_prune_the_journal(db_path):
+    save_transactions(5)
+    seq = core.get_change_seq()
+
+    core.init_db()
+
+    assert len(core.get_changes(0)) == seq
+
+def test_maintenance_keeps_the_latest_changes(db_path):
+    save_transactions(5)
+    seq = core.get_change_seq()
+
+    assert main(['--db', str(db_path), 'maintenance', '--keep-changes', '2']) == 0
+
+    assert core.get_change_seq() == seq
+    assert core.get_changes(0) is None
+    assert core.get_changes(seq - 2)['row_key'].tolist() == core.get_transactions()['id'].nlargest(2).sort_values().tolist()
+    assert core.prune_change_journal(2) == 0
@@ -0,0 +1,40 @@
+import pytest
+
+from database import core
+from moneymanager.cli import main
+
+HEADER = 'date,type,category,amount,comment\n'
+SHARED = '2024-03-02,Expense,Groceries,12.50,Coffee\n'
+
+def write_csv(path, rows):
+    path.write_text(HEADER + ''.join(rows))
+    return path
+
+@pytest.mark.parametrize('batch_rows', [1, 2, 50_000])
+def test_overlapping_statements_import_shared_rows_once(tmp_path, db_path, batch_rows):
+    first = write_csv(tmp_path / 'march.csv', ['2024-03-01,Expense,Groceries,40.00,Market\n', SHARED])
+    second = write_csv(tmp_path / 'march_again.csv', [SHARED, '2024-03-03,Income,Income,900.00,Salary\n'])
+
+    status = main(['--db', str(db_path), 'import', str(first), str(second),
+                   '--workers', '1', '--batch-rows', str(batch_rows)])
+
+    assert status == 0
+    transactions = core.get_transactions()
+    assert len(transactions) == 3
+    assert (transactions['comment'] == 'Coffee').sum() == 1
+
+def test_identical_rows_within_one_statement_both_import(tmp_path, db_path):
+    statement = write_csv(tmp_path / 'march.csv', [SHARED, SHARED])
+
+    assert main(['--db', str(db_path), 'import', str(statement), '--workers', '1']) == 0
+    assert main(['--db', str(db_path), 'import', str(statement), '--workers', '1']) == 0
+
+    transactions = core.get_transactions()
+    assert (transactions['comment'] == 'Coffee').sum() == 2
+
+def test_rejected_file_is_not_imported(tmp_path, db_path):
+    good = write_csv(tmp_path / 'good.csv', [SHARED])
+    bad = write_csv(tmp_path / 'bad.csv', ['2024-03-04,Expense,NoSuchCategory,5.00,x\n'])
+
+    assert main(['--db', str(db_path), 'import', str(good), str(bad), '--workers', '1']) == 1
+    assert len(core.get_transactions()) == 1
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from utils.downsampling import minmax_indices
+
+@pytest.mark.parametrize('n_out', [4, 5, 10, 101, 2400])
+def test_minmax_keeps_at_most_n_out_points_with_the_extremes(n_out):
+    y = np.random.default_rng(0).normal(size=10_000)
+
+    indices = minmax_indices(y, n_out)
+
+    assert len(indices) <= n_out
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert y[indices].min() == y.min() and y[indices].max() == y.max()
+    assert np.all(np.diff(indices) > 0)
+
+def test_minmax_keeps_short_series_whole():
+    assert minmax_indices(np.arange(5.0), 10).tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from utils.forecasting import TOTAL_EXPENSES, build_monthly_matrix, fit_models, forecast
+
+def test_forecast_starts_at_the_current_month_after_quiet_months():
+    today = pd.Timestamp('2026-10-19')
+    # Six months of expenses, then nothing since April
+    df = pd.DataFrame({
+        'date': pd.date_range('2025-11-01', periods=6, freq='MS') + pd.Timedelta(days=4),
+        'type': 'Expense',
+        'category': 'Groceries',
+        'amount': -100.0
+    })
+
+    matrix = build_monthly_matrix(df, today)
+
+    assert matrix.index[-1] == pd.Period('2026-09', 'M')
+    assert (matrix.loc[pd.Period('2026-05', 'M'):, TOTAL_EXPENSES] == 0).all()
+
+    predicted = forecast(fit_models(matrix), 3)
+    assert predicted['month'].min() == pd.Timestamp('2026-10-01')
+
+def test_current_month_is_left_out_of_the_history():
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2026-08-10', '2026-09-10', '2026-10-10']),
+        'type': 'Income',
+        'category': 'Income',
+        'amount': 1000.0
+    })
+
+    matrix = build_monthly_matrix(df, pd.Timestamp('2026-10-19'))
+
+    assert list(matrix.index.astype(str)) == ['2026-08', '2026-09']
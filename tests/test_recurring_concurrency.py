@@ -0,0 +1,79 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from database import core
+from utils.recurrence import FREQUENCIES, expand_occurrences
+
+N_SCHEDULES = 50
+N_THREADS = 8
+N_PROCESSES = 3
+
+def create_schedules():
+    """Save schedules of every frequency that started up to 90 days ago, each with its own comment"""
+    today = datetime.now().date()
+    frequencies = list(FREQUENCIES)
+    for i in range(N_SCHEDULES):
+        start_date = today - timedelta(days=(i * 7) % 90)
+        core.save_fixed_transaction(start_date.isoformat(), 'Expense', 'Utilities', -10.0 - i,
+                                    f"schedule {i}", frequencies[i % len(frequencies)])
+
+def post_due_in_threads(db_path, n_threads, start_at=None):
+    """Post the due transactions from n_threads threads released together, at start_at if given"""
+    core.DB_PATH = db_path
+    barrier = threading.Barrier(n_threads)
+    errors = []
+
+    def run():
+        barrier.wait()
+        try:
+            core.get_backend().post_due_transactions(datetime.now().strftime('%Y-%m-%d'))
+        except Exception as e:
+            errors.append(e)
+
+    # Line the processes up on the same wall-clock moment as well
+    if start_at is not None:
+        threading.Event().wait(max(start_at - datetime.now().timestamp(), 0))
+
+    threads = [threading.Thread(target=run) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+def assert_posted_once():
+    """Check the posted transactions are exactly the expanded occurrences"""
+    fixed_df = core.get_fixed_transactions()
+    expected = expand_occurrences(fixed_df, fixed_df['start_date'].min(), datetime.now())
+    posted = core.get_transactions()
+
+    posted_counts = posted.groupby(['date', 'comment']).size()
+    assert len(expected) > N_SCHEDULES
+    assert posted_counts.max() == 1
+    assert sorted(posted_counts.index) == sorted(zip(expected['date'], expected['comment']))
+
+def test_threads_post_each_occurrence_once(db_path):
+    create_schedules()
+
+    post_due_in_threads(db_path, N_THREADS)
+
+    assert_posted_once()
+
+@pytest.mark.parametrize('n_threads', [1, 4])
+def test_processes_post_each_occurrence_once(db_path, n_threads):
+    create_schedules()
+
+    with ProcessPoolExecutor(max_workers=N_PROCESSES,
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        # Long enough for the spawned processes to import the data layer
+        start_at = datetime.now().timestamp() + 3
+        futures = [pool.submit(post_due_in_threads, db_path, n_threads, start_at) for _ in range(N_PROCESSES)]
+        for future in futures:
+            future.result()
+
+    assert_posted_once()
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.timing import TIMINGS_FILE_NAME, remove_stale_timing_files
+
+@pytest.mark.skipif(os.name != 'posix', reason="stale files are only detected on POSIX")
+def test_only_files_of_stopped_processes_are_removed(tmp_path):
+    stopped = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                             capture_output=True, text=True, check=True)
+    stopped_pid = int(stopped.stdout)
+
+    names = {
+        pid: TIMINGS_FILE_NAME.format(pid=pid)
+        for pid in (stopped_pid, os.getpid(), os.getppid())
+    }
+    for name in names.values():
+        (tmp_path / name).write_text('{}\n')
+        (tmp_path / f"{name}.1").write_text('{}\n')
+    (tmp_path / 'transactions.db').write_text('')
+
+    remove_stale_timing_files(tmp_path)
+
+    remaining = {path.name for path in tmp_path.iterdir()}
+    assert names[stopped_pid] not in remaining and f"{names[stopped_pid]}.1" not in remaining
+    assert {names[os.getpid()], names[os.getppid()], 'transactions.db'} <= remaining
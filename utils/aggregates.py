@@ -0,0 +1,90 @@
+import calendar
+
+import pandas as pd
+import streamlit as st
+
+from database.db_manager import get_category_thresholds
+from utils.budget import ALERT_LEVEL, compute_budget_status, expenses_by_category
+from utils.caching import (
+    DATA_VERSIONS,
+    YEARS_PER_VERSION,
+    load_transactions,
+    load_year_transactions
+)
+from utils.shared_cache import shared_cache
+
+# Aggregates shared by several pages and precomputed by utils.warmup, which
+# is why they live here rather than in the pages
+
+# Home shows the current month
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS)
+@shared_cache
+def compute_month_stats(data_version, year, month):
+    """Compute the totals and budget alerts of one month for the Home page quick stats"""
+    df = load_transactions(data_version)
+    month_data = df[(df['date'].dt.year == year) & (df['date'].dt.month == month)]
+
+    # Categories spending at least ALERT_LEVEL percent of their budget
+    budget_alerts = []
+    budget_df = get_category_thresholds()
+    if not budget_df.empty:
+        spending = expenses_by_category(month_data)
+        status = compute_budget_status(spending, budget_df, categories=spending.index)
+        budget_alerts = status[
+            (status['budget'] > 0) & (status['percentage'] >= ALERT_LEVEL)
+        ].to_dict('records')
+
+    return {
+        'has_transactions': not df.empty,
+        'income': month_data[month_data['type'] == 'Income']['amount'].sum(),
+        'expenses': abs(month_data[month_data['type'] == 'Expense']['amount'].sum()),
+        'transaction_count': len(month_data),
+        'budget_alerts': budget_alerts
+    }
+
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS * YEARS_PER_VERSION)
+@shared_cache
+def compute_yearly_overview(data_version, year):
+    """Compute income, expenses and net income for every month of a year"""
+    df = load_transactions(data_version)
+    yearly_data = df[df['date'].dt.year == year]
+
+    # Calculate monthly totals
+    monthly_totals = yearly_data.groupby(
+        [yearly_data['date'].dt.month, 'type']
+    )['amount'].sum().unstack(fill_value=0)
+
+    # Prepare data for all months (filling missing months with 0)
+    full_year_data = []
+    for month_num in range(1, 13):
+        month_name = calendar.month_name[month_num]
+        income = monthly_totals.get('Income', {}).get(month_num, 0)
+        expense = abs(monthly_totals.get('Expense', {}).get(month_num, 0))
+        net = income - expense
+        full_year_data.append({
+            'month_num': month_num,
+            'Month': month_name,
+            'Income': income,
+            'Expense': expense,
+            'Net': net
+        })
+
+    return pd.DataFrame(full_year_data)
+
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS * YEARS_PER_VERSION)
+@shared_cache
+def compute_yearly_report(data_version, year):
+    """Filter one year of transactions and compute its summary figures"""
+    yearly_df = load_year_transactions(data_version, year)
+
+    return {
+        'transactions': yearly_df,
+        'yearly_income': yearly_df[yearly_df['type'] == 'Income']['amount'].sum(),
+        'yearly_expenses': abs(yearly_df[yearly_df['type'] == 'Expense']['amount'].sum()),
+        'monthly_data': yearly_df.groupby(
+            [yearly_df['date'].dt.month, 'type']
+        )['amount'].sum().unstack(fill_value=0).reindex(
+            columns=['Income', 'Expense'], fill_value=0
+        ),
+        'yearly_categories': expenses_by_category(yearly_df)
+    }
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+# Percentage of the monthly limit at which a category is flagged
+WARNING_LEVEL = 75
+ALERT_LEVEL = 90
+
+BUDGET_STATUS_COLUMNS = ['category', 'spent', 'budget', 'remaining', 'percentage', 'alert_level']
+
+def expenses_by_category(df):
+    """Sum absolute expense amounts per category"""
+    expenses = df[df['type'] == 'Expense']
+    return expenses.groupby('category')['amount'].sum().abs()
+
+def compute_budget_status(spending, budget_df, categories=None):
+    """Compute spent, budget, remaining, percentage and alert level for all categories at once
+
+    spending is a Series of absolute spent amounts indexed by category and
+    budget_df the frame returned by get_category_thresholds(). When a list of
+    categories is given the result follows that order, otherwise it covers every
+    category that has either spending or a budget.
+    """
+    spent = pd.DataFrame({
+        'category': pd.Series(spending.index, dtype=object).astype(str),
+        'spent': spending.to_numpy(dtype=float)
+    })
+    budgets = pd.DataFrame({
+        'category': budget_df['category'].astype(object).astype(str),
+        'budget': budget_df['monthly_limit'].to_numpy(dtype=float)
+    })
+
+    if categories is not None:
+        status = pd.DataFrame({'category': pd.Series(list(categories), dtype=object).astype(str)})
+        status = status.merge(spent, on='category', how='left')
+        status = status.merge(budgets, on='category', how='left')
+    else:
+        status = spent.merge(budgets, on='category', how='outer').sort_values('category')
+
+    spent_values = status['spent'].fillna(0.0).to_numpy(dtype=float)
+    budget_values = status['budget'].fillna(0.0).to_numpy(dtype=float)
+
+    # Avoid division by zero for categories without a budget
+    percentage = np.divide(
+        spent_values * 100,
+        budget_values,
+        out=np.zeros_like(spent_values),
+        where=budget_values > 0
+    )
+
+    status['spent'] = spent_values
+    status['budget'] = budget_values
+    status['remaining'] = np.maximum(budget_values - spent_values, 0)
+    status['percentage'] = percentage
+    status['alert_level'] = np.select(
+        [percentage > ALERT_LEVEL, percentage > WARNING_LEVEL],
+        ['error', 'warning'],
+        default='normal'
+    )
+
+    return status[BUDGET_STATUS_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,59 @@
+import streamlit as st
+import pandas as pd
+
+from database.db_manager import (
+    get_transactions,
+    get_transactions_snapshot,
+    get_transaction_years,
+    get_data_version,
+    generate_recurring_transactions
+)
+from utils.shared_cache import shared_cache
+
+# Every write makes a new data version, so caches keyed on it keep only the
+# current version and the one sessions may still be rendering, times the
+# selector values a page is expected to switch between
+DATA_VERSIONS = 2
+YEARS_PER_VERSION = 5
+MONTHS_PER_VERSION = 12
+
+@st.cache_resource(show_spinner=False, max_entries=DATA_VERSIONS)
+def load_transactions(data_version):
+    """Load all transactions with parsed dates, one frame per data version
+
+    The same frame is handed to every session instead of a copy each, so it
+    is read-only: filter it into views or index arrays and never assign to
+    it.
+    """
+    return get_transactions_snapshot()
+
+# Whole yearly frames, so fewer years are kept than for the aggregates
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS * 3)
+@shared_cache
+def load_year_transactions(data_version, year):
+    """Load one year of transactions with parsed dates, opening only that year's archive"""
+    df = get_transactions(years=[year])
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=DATA_VERSIONS)
+@shared_cache
+def load_transaction_years(data_version):
+    """Get the years that have transactions, newest first"""
+    return get_transaction_years()
+
+def refresh_data_version():
+    """Post pending recurring transactions and return the resulting data version"""
+    generate_recurring_transactions()
+    return get_data_version()
+
+def get_cached_transactions():
+    """Get all transactions, reloading only when the database has changed
+
+    Returns the shared, read-only transactions frame together with the data
+    version it was loaded for, so dependent cached computations can use it
+    as their key.
+    """
+    # Pending recurring transactions must be written before taking the version
+    data_version = refresh_data_version()
+    return load_transactions(data_version), data_version
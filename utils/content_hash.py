@@ -0,0 +1,40 @@
+import hashlib
+
+import pandas as pd
+
+def normalized_keys(df):
+    """Build the normalized "date|type|category|amount|comment|external_id" key of each row
+
+    Dates are reformatted as YYYY-MM-DD, amounts rounded to cents and comments
+    stripped, lowercased and whitespace-collapsed, so the same transaction
+    exported twice by a bank yields the same key. external_id is optional.
+    """
+    if 'external_id' in df:
+        external_id = df['external_id'].fillna('').astype(str).str.strip()
+    else:
+        external_id = pd.Series('', index=df.index)
+
+    comment = df['comment'].fillna('-').astype(str).str.strip().str.lower().str.split().str.join(' ')
+
+    return (
+        pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d') + '|'
+        + df['type'].astype(str).str.strip() + '|'
+        + df['category'].astype(str).str.strip() + '|'
+        + df['amount'].astype(float).round(2).map('{:.2f}'.format) + '|'
+        + comment + '|'
+        + external_id
+    )
+
+def content_hashes(df):
+    """Compute the content hash of every transaction row
+
+    Identical rows are told apart by their position among equal keys (first,
+    second, ...), so two genuine identical purchases on one day both import,
+    while re-importing the same statement maps onto the same hashes again.
+    """
+    keys = normalized_keys(df)
+    ordinals = keys.groupby(keys).cumcount().astype(str)
+    return [
+        hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        for key in keys + '#' + ordinals
+    ]
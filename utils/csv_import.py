@@ -0,0 +1,76 @@
+import pandas as pd
+
+from utils.content_hash import content_hashes
+
+REQUIRED_COLUMNS = ['date', 'type', 'category', 'amount', 'comment']
+
+def validate_transactions_csv(df, valid_categories):
+    """Check a transactions CSV read into a frame, returning a list of problems
+
+    An empty list means the frame can be converted with to_import_rows.
+    """
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        return [f"Missing required columns: {', '.join(missing_columns)}"]
+
+    validation_errors = []
+
+    # Check date format
+    try:
+        pd.to_datetime(df['date'])
+    except (ValueError, TypeError):
+        validation_errors.append("Date column should be in YYYY-MM-DD format")
+
+    # Check transaction types
+    invalid_types = df[~df['type'].isin(['Income', 'Expense'])]['type'].unique()
+    if len(invalid_types) > 0:
+        validation_errors.append(f"Invalid transaction types found: {', '.join(map(str, invalid_types))}")
+
+    # Check categories
+    invalid_categories = df[~df['category'].isin(valid_categories)]['category'].unique()
+    if len(invalid_categories) > 0:
+        validation_errors.append(f"Invalid categories found: {', '.join(map(str, invalid_categories))}")
+
+    # Check amounts
+    if not pd.to_numeric(df['amount'], errors='coerce').notnull().all():
+        validation_errors.append("All amounts must be valid numbers")
+
+    return validation_errors
+
+def to_import_rows(df):
+    """Convert a validated transactions CSV frame into rows for import_transactions
+
+    Amounts become negative for expenses, missing comments become '-' and
+    the optional external_id column is kept.
+    """
+    amounts = pd.to_numeric(df['amount']).abs()
+    rows = pd.DataFrame({
+        'date': pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d'),
+        'type': df['type'],
+        'category': df['category'],
+        'amount': amounts.where(df['type'] == 'Income', -amounts),
+        'comment': df['comment'].where(df['comment'].notna(), '-').astype(str)
+    })
+    if 'external_id' in df.columns:
+        rows['external_id'] = df['external_id']
+    return rows
+
+def parse_transactions_csv(path, valid_categories):
+    """Read and validate a transactions CSV file
+
+    Returns the rows to import and an empty list, or None and the problems
+    found. The rows carry the content hashes of this file alone, so rows of
+    several files can be imported in one batch and a transaction found in
+    two overlapping statements is still imported once. Only takes picklable
+    arguments, so files can be parsed in worker processes.
+    """
+    try:
+        df = pd.read_csv(path)
+    except (OSError, ValueError) as e:
+        return None, [f"Error reading CSV file: {str(e)}"]
+
+    validation_errors = validate_transactions_csv(df, valid_categories)
+    if validation_errors:
+        return None, validation_errors
+    rows = to_import_rows(df)
+    return rows.assign(content_hash=content_hashes(rows)), []
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from database import core
+from database.errors import MoneyManagerError
+
+# general_settings key of the chart width in pixels, which bounds the points drawn
+CHART_WIDTH_SETTING = 'chart_width'
+
+# Assumed plot width in pixels when none is set
+DEFAULT_CHART_WIDTH = 1200
+
+# Points per pixel kept after downsampling
+POINTS_PER_PIXEL = 2
+
+# Traces with more points than this are drawn with WebGL
+SCATTERGL_THRESHOLD = 1000
+
+def get_chart_width():
+    """Get the chart width set in the settings, DEFAULT_CHART_WIDTH when unset"""
+    try:
+        width = core.get_setting(CHART_WIDTH_SETTING)
+    except MoneyManagerError:
+        return DEFAULT_CHART_WIDTH
+    return int(width) if width else DEFAULT_CHART_WIDTH
+
+def max_points_for_width(width):
+    """Get the maximum number of points worth drawing on a chart of the given width"""
+    return int(width * POINTS_PER_PIXEL)
+
+def lttb_indices(x, y, n_out):
+    """Select n_out points with the Largest-Triangle-Three-Buckets algorithm
+
+    Returns the indices of the selected points in ascending order. The first
+    and last points are always kept. Bucket averages are computed with
+    vectorized reductions; only the final point selection walks the buckets.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Split the interior points into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+
+    # Average of every bucket, with the last point standing in after the final bucket
+    avg_x = np.append(np.add.reduceat(x[:-1], starts) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], starts) / counts, y[-1])
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = starts[i], edges[i + 1]
+        next_x, next_y = avg_x[i + 1], avg_y[i + 1]
+
+        # Twice the area of the triangle between the last selected point,
+        # each candidate in this bucket and the next bucket's average
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+def minmax_indices(y, n_out):
+    """Keep the minimum and maximum of each bucket, fully vectorized
+
+    Returns at most n_out indices of the selected points in ascending order,
+    including the first and last points.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 4:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    # The first and last points are kept apart, the interior points are split
+    # into buckets contributing two points each
+    n_buckets = (n_out - 2) // 2
+    interior = n - 2
+
+    # Assign every interior point to a bucket, then sort by (bucket, value) so
+    # the first and last entry of each bucket are its minimum and maximum
+    buckets = (np.arange(interior) * n_buckets) // interior
+    order = np.lexsort((y[1:-1], buckets)) + 1
+    boundaries = np.flatnonzero(np.diff(buckets[order - 1])) + 1
+
+    first = order[np.concatenate(([0], boundaries))]
+    last = order[np.concatenate((boundaries - 1, [interior - 1]))]
+
+    return np.unique(np.concatenate(([0, n - 1], first, last)))
+
+def downsample_series(series, max_points, method='lttb'):
+    """Downsample a Series indexed by date or number to at most max_points points"""
+    if len(series) <= max_points:
+        return series
+
+    values = series.to_numpy(dtype=float)
+
+    if method == 'minmax':
+        indices = minmax_indices(values, max_points)
+    elif method == 'lttb':
+        index = series.index
+        if isinstance(index, pd.DatetimeIndex):
+            x = index.asi8.astype(float)
+        else:
+            x = np.asarray(index, dtype=float)
+        indices = lttb_indices(x, values, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+
+    return series.iloc[indices]
+
+def spending_trace(series, name, color, width, method='lttb'):
+    """Create a line trace for a spending series, downsampled to a chart width in pixels
+
+    Short series keep their markers and use a regular Scatter trace; long
+    series switch to Scattergl so multi-year daily views stay interactive.
+    """
+    series = series.sort_index()
+    sampled = downsample_series(series, max_points_for_width(width), method)
+
+    if len(series) > SCATTERGL_THRESHOLD:
+        return go.Scattergl(
+            x=sampled.index,
+            y=sampled.values,
+            mode='lines',
+            name=name,
+            line=dict(color=color)
+        )
+
+    return go.Scatter(
+        x=sampled.index,
+        y=sampled.values,
+        mode='lines+markers',
+        name=name,
+        line=dict(color=color)
+    )
@@ -0,0 +1,43 @@
+import threading
+from collections import OrderedDict
+
+# Maximum number of figures kept per server process
+MAX_CACHED_FIGURES = 128
+
+_figures = OrderedDict()
+_lock = threading.Lock()
+
+def _make_key(chart_id, params, data_version):
+    """Build a hashable cache key from the chart id, filter params and data version"""
+    return (chart_id, tuple(sorted(params.items())), data_version)
+
+def get_figure(chart_id, params, data_version, build_figure):
+    """Return the cached figure for a chart, building it only on a cache miss
+
+    Figures are shared between all sessions of the server process, so the
+    returned figure must not be modified by the caller. The least recently used
+    figure is evicted once MAX_CACHED_FIGURES is reached.
+    """
+    key = _make_key(chart_id, params, data_version)
+
+    with _lock:
+        figure = _figures.get(key)
+        if figure is not None:
+            _figures.move_to_end(key)
+            return figure
+
+    # Build outside the lock so slow figures don't block other sessions
+    figure = build_figure()
+
+    with _lock:
+        _figures[key] = figure
+        _figures.move_to_end(key)
+        while len(_figures) > MAX_CACHED_FIGURES:
+            _figures.popitem(last=False)
+
+    return figure
+
+def clear_figure_cache():
+    """Remove all cached figures"""
+    with _lock:
+        _figures.clear()
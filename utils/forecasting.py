@@ -0,0 +1,115 @@
+from datetime import datetime
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# Minimum number of complete months needed to fit a trend
+MIN_MONTHS = 3
+
+# Month-of-year seasonality is only fitted with at least two full years
+SEASONAL_MIN_MONTHS = 24
+
+TOTAL_INCOME = 'Total Income'
+TOTAL_EXPENSES = 'Total Expenses'
+
+def build_monthly_matrix(df, today=None):
+    """Pivot transactions into a months × series matrix of absolute amounts
+
+    There is one column per "Type: Category" pair plus TOTAL_INCOME and
+    TOTAL_EXPENSES. Every month from the first with transactions up to the
+    last complete one is present, months without transactions as 0, so a
+    forecast always starts at the current month. The current (incomplete)
+    month is left out so it doesn't drag the fit down.
+    """
+    if df.empty:
+        return pd.DataFrame()
+
+    today = today or datetime.now()
+    frame = pd.DataFrame({
+        'month': pd.to_datetime(df['date']).dt.to_period('M'),
+        'series': df['type'] + ': ' + df['category'],
+        'type': df['type'],
+        'amount': df['amount']
+    })
+
+    by_category = frame.pivot_table(
+        index='month', columns='series', values='amount', aggfunc='sum', fill_value=0
+    )
+    totals = frame.pivot_table(
+        index='month', columns='type', values='amount', aggfunc='sum', fill_value=0
+    ).reindex(columns=['Income', 'Expense'], fill_value=0)
+    totals.columns = [TOTAL_INCOME, TOTAL_EXPENSES]
+
+    matrix = pd.concat([totals, by_category], axis=1).abs()
+
+    # Fill gaps, and the quiet months before this one, so every month of the history is present
+    full_range = pd.period_range(matrix.index.min(), pd.Period(today, freq='M') - 1, freq='M')
+    return matrix.reindex(full_range, fill_value=0)
+
+def _design_matrix(t, month_of_year, seasonal):
+    """Build the regression design: intercept, linear trend and optional month dummies"""
+    columns = [np.ones(len(t)), t.astype(float)]
+    if seasonal:
+        # January is the baseline month
+        dummies = (month_of_year[:, None] == np.arange(2, 13)[None, :]).astype(float)
+        columns.extend(dummies.T)
+    return np.column_stack(columns)
+
+def fit_models(matrix):
+    """Fit a trend (and seasonal) model to every series of a monthly matrix at once
+
+    All series share the same design matrix, so a single least-squares solve
+    fits every category. Returns None when there is not enough history.
+    """
+    if matrix.empty or len(matrix) < MIN_MONTHS:
+        return None
+
+    n_months = len(matrix)
+    seasonal = n_months >= SEASONAL_MIN_MONTHS
+
+    t = np.arange(n_months)
+    X = _design_matrix(t, matrix.index.month.to_numpy(), seasonal)
+    Y = matrix.to_numpy(dtype=float)
+
+    coefficients, *_ = np.linalg.lstsq(X, Y, rcond=None)
+    residuals = Y - X @ coefficients
+    dof = max(n_months - X.shape[1], 1)
+
+    return {
+        'series': list(matrix.columns),
+        'history': matrix,
+        'start': matrix.index[0],
+        'n_months': n_months,
+        'seasonal': seasonal,
+        'coefficients': coefficients,
+        'sigma': np.sqrt((residuals ** 2).sum(axis=0) / dof),
+        'xtx_inv': np.linalg.pinv(X.T @ X)
+    }
+
+def forecast(model, horizon, confidence=0.95):
+    """Forecast every series of a fitted model for the next horizon months
+
+    Returns a long frame with month, series, forecast, lower and upper
+    columns. Bounds are OLS prediction intervals at the given confidence level,
+    and all values are clipped at zero since amounts cannot be negative.
+    """
+    t = np.arange(model['n_months'], model['n_months'] + horizon)
+    months = pd.period_range(model['start'] + model['n_months'], periods=horizon, freq='M')
+    Xf = _design_matrix(t, months.month.to_numpy(), model['seasonal'])
+
+    mean = Xf @ model['coefficients']
+
+    # Leverage of each future month is shared by all series
+    leverage = np.einsum('ij,jk,ik->i', Xf, model['xtx_inv'], Xf)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * np.sqrt(1 + leverage)[:, None] * model['sigma'][None, :]
+
+    n_series = len(model['series'])
+    return pd.DataFrame({
+        'month': np.repeat(months.to_timestamp(), n_series),
+        'series': np.tile(model['series'], horizon),
+        'forecast': np.maximum(mean, 0).ravel(),
+        'lower': np.maximum(mean - half_width, 0).ravel(),
+        'upper': np.maximum(mean + half_width, 0).ravel()
+    })
@@ -1,14 +1,24 @@
-from database.db_manager import get_setting
+from database.core import get_setting
+from database.errors import MoneyManagerError
 
 def format_amount(amount, trans_type):
     """Format amount based on transaction type"""
     return amount if trans_type == "Income" else -amount
 
+def get_currency_format():
+    """Get the currency symbol and its position from the user settings"""
+    # Format with the defaults if the settings can't be read
+    try:
+        symbol = get_setting('currency_symbol') or '$'
+        position = get_setting('currency_position') or 'before'
+    except MoneyManagerError:
+        symbol, position = '$', 'before'
+    return symbol, position
+
 def format_currency(amount):
     """Format amount as currency using user settings"""
     # Get currency settings
-    symbol = get_setting('currency_symbol') or '$'
-    position = get_setting('currency_position') or 'before'
+    symbol, position = get_currency_format()
     
     # Format the number
     formatted_number = f"{abs(amount):,.2f}"
@@ -17,4 +27,30 @@ def format_currency(amount):
     if position == 'before':
         return f"{symbol}{formatted_number}"
     else:
-        return f"{formatted_number}{symbol}"
\ No newline at end of file
+        return f"{formatted_number}{symbol}"
+
+def format_signed_currency(amount):
+    """Format amount as currency with a leading '-' when it is negative, for balances"""
+    sign = '-' if amount < 0 else ''
+    return sign + format_currency(amount)
+
+def format_currencies(amounts):
+    """Format a Series of amounts as currency, reading the settings once instead of per amount"""
+    symbol, position = get_currency_format()
+    formatted_numbers = amounts.abs().map('{:,.2f}'.format)
+    
+    if position == 'before':
+        return symbol + formatted_numbers
+    else:
+        return formatted_numbers + symbol
+
+def format_transactions_for_export(df):
+    """Get transactions with text dates and formatted amounts for CSV and Excel exports
+
+    Returns a new frame and leaves df untouched, so it can be given the
+    shared transactions frame.
+    """
+    return df.assign(
+        date=df['date'].dt.strftime('%Y-%m-%d'),
+        amount=format_currencies(df['amount'])
+    )
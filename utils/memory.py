@@ -0,0 +1,53 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Session state entry with the sizes recorded by track_memory
+TRACKED_KEY = '_memory_tracked'
+
+def object_bytes(obj):
+    """Estimate the memory an object holds, counting the contents of frames, arrays and containers"""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(object_bytes(key) + object_bytes(value) for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(object_bytes(item) for item in obj)
+    return sys.getsizeof(obj)
+
+def format_bytes(n_bytes):
+    """Format a byte count as B, KB or MB"""
+    if n_bytes < 1024:
+        return f"{n_bytes} B"
+    if n_bytes < 1024 ** 2:
+        return f"{n_bytes / 1024:.1f} KB"
+    return f"{n_bytes / 1024 ** 2:.1f} MB"
+
+def track_memory(name, obj):
+    """Record the size of data a page built for this session, for the memory report"""
+    st.session_state.setdefault(TRACKED_KEY, {})[name] = object_bytes(obj)
+
+def session_memory_report():
+    """List the memory this session accounts for, largest first
+
+    Page data is what each page built for the session in its last run, the
+    filtered tables and exports; session state is kept between runs. The
+    shared transactions frame isn't included, it is held once for every
+    session.
+    """
+    rows = [
+        {'Item': name, 'Held by': 'page data', 'Bytes': size}
+        for name, size in st.session_state.get(TRACKED_KEY, {}).items()
+    ]
+    rows += [
+        {'Item': key, 'Held by': 'session state', 'Bytes': object_bytes(value)}
+        for key, value in st.session_state.items() if key != TRACKED_KEY
+    ]
+    report = pd.DataFrame(rows, columns=['Item', 'Held by', 'Bytes'])
+    return report.sort_values('Bytes', ascending=False, ignore_index=True)
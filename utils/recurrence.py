@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+OCCURRENCE_COLUMNS = ['fixed_id', 'date', 'type', 'category', 'amount', 'comment']
+
+# Step of each recurrence rule, either in days or in calendar months
+FREQUENCIES = {
+    'weekly': ('D', 7),
+    'biweekly': ('D', 14),
+    'monthly': ('M', 1),
+    'quarterly': ('M', 3),
+    'yearly': ('M', 12)
+}
+DEFAULT_FREQUENCY = 'monthly'
+
+def _schedule_arrays(fixed_df):
+    """Extract the start, end, anchor day and step of every schedule as arrays"""
+    starts = pd.to_datetime(fixed_df['start_date']).to_numpy().astype('datetime64[D]')
+    start_months = starts.astype('datetime64[M]')
+    anchor_days = (starts - start_months.astype('datetime64[D]')).astype(np.int64) + 1
+
+    if 'end_date' in fixed_df:
+        ends = pd.to_datetime(fixed_df['end_date']).to_numpy().astype('datetime64[D]')
+    else:
+        ends = np.full(len(fixed_df), np.datetime64('NaT'), dtype='datetime64[D]')
+
+    if 'frequency' in fixed_df:
+        frequencies = fixed_df['frequency'].fillna(DEFAULT_FREQUENCY)
+    else:
+        frequencies = pd.Series(DEFAULT_FREQUENCY, index=fixed_df.index)
+    unknown = set(frequencies) - set(FREQUENCIES)
+    if unknown:
+        raise ValueError(f"Unknown recurrence frequency: {', '.join(sorted(unknown))}")
+
+    monthly = frequencies.map(lambda f: FREQUENCIES[f][0] == 'M').to_numpy(dtype=bool)
+    steps = frequencies.map(lambda f: FREQUENCIES[f][1]).to_numpy(dtype=np.int64)
+
+    return starts, start_months, anchor_days, ends, monthly, steps
+
+def _occurrence_dates(starts, start_months, anchor_days, monthly, steps, k):
+    """Date of the k-th occurrence (0 = start date) of each schedule
+
+    Month-based rules keep the day of month of the start date, clamped to the
+    last day of shorter months (a schedule starting on the 31st occurs on
+    Feb 28/29, Apr 30, ...).
+    """
+    months = start_months + k * steps * monthly
+    month_starts = months.astype('datetime64[D]')
+    days_in_month = ((months + 1).astype('datetime64[D]') - month_starts).astype(np.int64)
+    month_dates = month_starts + (np.minimum(anchor_days, days_in_month) - 1)
+    day_dates = starts + k * steps * ~monthly
+    return np.where(monthly, month_dates, day_dates)
+
+def _elapsed_steps(starts, start_months, monthly, steps, dates):
+    """Number of whole steps between each schedule's start and a date, by its own unit"""
+    elapsed_days = (dates - starts).astype(np.int64)
+    elapsed_months = (dates.astype('datetime64[M]') - start_months).astype(np.int64)
+    return np.where(monthly, elapsed_months, elapsed_days) // steps
+
+def expand_occurrences(fixed_df, start_date, end_date):
+    """Compute every occurrence of the fixed transactions between two dates (inclusive)
+
+    Each schedule only contributes the steps that fall in the range, which are
+    generated for all schedules at once with a repeat/offset trick rather than
+    a per-schedule loop, so no row is materialized in the database.
+    """
+    if fixed_df.empty:
+        return pd.DataFrame(columns=OCCURRENCE_COLUMNS)
+
+    start = np.datetime64(pd.Timestamp(start_date).date(), 'D')
+    end = np.datetime64(pd.Timestamp(end_date).date(), 'D')
+    if end < start:
+        return pd.DataFrame(columns=OCCURRENCE_COLUMNS)
+
+    starts, start_months, anchor_days, ends, monthly, steps = _schedule_arrays(fixed_df)
+    range_ends = np.where(np.isnat(ends), end, np.minimum(ends, end))
+
+    # Range of step numbers that can land between start and each schedule's end;
+    # the first one may fall just before start after clamping and is filtered below
+    first = np.maximum(_elapsed_steps(starts, start_months, monthly, steps, np.full_like(starts, start)), 0)
+    last = _elapsed_steps(starts, start_months, monthly, steps, range_ends)
+    counts = np.maximum(last - first + 1, 0)
+
+    rows = np.repeat(np.arange(len(fixed_df)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    dates = _occurrence_dates(
+        starts[rows], start_months[rows], anchor_days[rows], monthly[rows], steps[rows],
+        first[rows] + offsets
+    )
+
+    valid = (dates >= starts[rows]) & (dates >= start) & (dates <= range_ends[rows])
+    rows, dates = rows[valid], dates[valid]
+
+    # Order by date, then schedule, before converting dates to strings
+    ids = fixed_df['id'].to_numpy()
+    order = np.lexsort((ids[rows], dates))
+    rows, dates = rows[order], dates[order]
+
+    return pd.DataFrame({
+        'fixed_id': ids[rows],
+        'date': np.datetime_as_string(dates, unit='D'),
+        'type': fixed_df['type'].to_numpy()[rows],
+        'category': fixed_df['category'].to_numpy()[rows],
+        'amount': fixed_df['amount'].to_numpy(dtype=float)[rows],
+        'comment': fixed_df['comment'].to_numpy()[rows]
+    })
+
+def next_due_dates(fixed_df, after_date):
+    """Get the first occurrence of each schedule strictly after a date
+
+    after_date is either a single date or one date per schedule. Returns a list
+    aligned with fixed_df holding a YYYY-MM-DD string, or None for schedules
+    whose end date has passed.
+    """
+    if fixed_df.empty:
+        return []
+
+    starts, start_months, anchor_days, ends, monthly, steps = _schedule_arrays(fixed_df)
+    after = pd.to_datetime(pd.Series(after_date, index=fixed_df.index)).to_numpy().astype('datetime64[D]')
+
+    k = np.maximum(_elapsed_steps(starts, start_months, monthly, steps, after), 0)
+    dates = _occurrence_dates(starts, start_months, anchor_days, monthly, steps, k)
+
+    # Clamping can leave the candidate on or before the date, take the next step then
+    behind = dates <= after
+    dates[behind] = _occurrence_dates(
+        starts[behind], start_months[behind], anchor_days[behind], monthly[behind], steps[behind],
+        k[behind] + 1
+    )
+
+    ended = ~np.isnat(ends) & (dates > ends)
+    strings = np.datetime_as_string(dates, unit='D').astype(object)
+    strings[ended] = None
+    return list(strings)
+
+def pending_occurrences(fixed_df, start_date, end_date):
+    """Get the occurrences in a date range that have not been posted as transactions yet
+
+    Every occurrence before a schedule's next_due_date has been posted; a
+    missing next_due_date means the schedule has ended.
+    """
+    occurrences = expand_occurrences(fixed_df, start_date, end_date)
+    if occurrences.empty:
+        return occurrences
+
+    next_due = fixed_df.set_index('id')['next_due_date']
+    due_from = occurrences['fixed_id'].map(next_due)
+    return occurrences[due_from.notna() & (occurrences['date'] >= due_from)].reset_index(drop=True)
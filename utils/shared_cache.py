@@ -0,0 +1,108 @@
+import functools
+import hashlib
+import inspect
+import pickle
+import sqlite3
+from pathlib import Path
+
+from database import core
+from database.write_queue import BUSY_TIMEOUT
+
+def get_cache_path():
+    """Get the path of the cache shared by every server process using the storage, or None"""
+    return core.get_backend().get_shared_cache_path()
+
+def _connect(cache_path):
+    """Open the shared cache, creating it on first use"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('''CREATE TABLE IF NOT EXISTS entries
+                    (name TEXT NOT NULL,
+                     args_key TEXT NOT NULL,
+                     data_version TEXT NOT NULL,
+                     value BLOB NOT NULL,
+                     PRIMARY KEY (name, args_key))''')
+    return conn
+
+def _function_name(func):
+    """Name a function by file, qualified name and a hash of its source
+
+    Pages all run as __main__, so the file tells same-named functions apart,
+    and the source hash keeps results of an older deployment from being reused.
+    """
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    source_hash = hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+    return f"{Path(func.__code__.co_filename).stem}.{func.__qualname__}.{source_hash}"
+
+def get_shared(name, args_key, data_version, compute):
+    """Return the shared result stored under name and args_key, computing it on a miss
+
+    Only a result stored for the same data version is reused. A new result
+    replaces the one of the older version, so the cache holds one entry per
+    function and arguments. When the storage isn't shared between processes,
+    or the cache can't be read or written, the result is simply computed.
+    """
+    cache_path = get_cache_path()
+    if cache_path is None:
+        return compute()
+
+    data_version = str(data_version)
+    try:
+        conn = _connect(cache_path)
+    except sqlite3.Error:
+        return compute()
+
+    try:
+        row = conn.execute(
+            "SELECT data_version, value FROM entries WHERE name = ? AND args_key = ?",
+            (name, args_key)
+        ).fetchone()
+        if row is not None and row[0] == data_version:
+            try:
+                return pickle.loads(row[1])
+            except Exception:
+                # Written by an incompatible library version, compute it again
+                pass
+
+        value = compute()
+        try:
+            conn.execute("INSERT OR REPLACE INTO entries (name, args_key, data_version, value) "
+                         "VALUES (?, ?, ?, ?)",
+                         (name, args_key, data_version, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+            pass
+        return value
+    finally:
+        conn.close()
+
+def shared_cache(func):
+    """Share a function's results between server processes through the on-disk cache
+
+    The function's first argument must be the data version its result depends
+    on; the remaining arguments must be picklable. Stack it under
+    st.cache_data, which keeps the per-process copy, so a result computed by
+    one worker is loaded by the others instead of being computed again.
+    """
+    name = _function_name(func)
+
+    @functools.wraps(func)
+    def wrapper(data_version, *args, **kwargs):
+        args_key = hashlib.blake2b(
+            pickle.dumps((args, sorted(kwargs.items()))), digest_size=16
+        ).hexdigest()
+        return get_shared(name, args_key, data_version,
+                          lambda: func(data_version, *args, **kwargs))
+
+    return wrapper
+
+def clear_shared_cache():
+    """Remove all shared results"""
+    cache_path = get_cache_path()
+    if cache_path is not None and cache_path.exists():
+        conn = _connect(cache_path)
+        conn.execute("DELETE FROM entries")
+        conn.close()
@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.recurrence import expand_occurrences
+
+# Percentiles reported for the projected balance
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Below this many paths the process pool costs more than it saves
+PARALLEL_MIN_PATHS = 2000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    """Get the shared process pool, creating it on first use
+
+    Workers are spawned rather than forked because the Streamlit server is
+    multi-threaded, and the pool is reused so the startup cost is only paid once.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+def build_simulation_inputs(transactions_df, fixed_df, today=None):
+    """Split the transaction history into recurring and variable cash flows
+
+    Rows generated from fixed transactions are recognised by their type,
+    category, amount and comment and left out of the variable history, since
+    the recurring schedule is projected separately. Returns a dict with the
+    starting balance, the months × categories matrix of variable net flows
+    over complete months, and the fixed schedules to project.
+
+    The projection starts with the current month: the balance already
+    includes its transactions up to today, so only the share of the month
+    still ahead of its variable flows is projected for it.
+    """
+    today = pd.Timestamp(today or datetime.now()).normalize()
+    current_month = pd.Period(today, freq='M')
+
+    # Only the columns needed, the given frame may be the shared one
+    df = transactions_df[['type', 'category', 'amount', 'comment']].assign(
+        month=pd.to_datetime(transactions_df['date']).dt.to_period('M')
+    )
+    start_balance = float(df['amount'].sum())
+
+    # Drop rows that were generated from a fixed transaction
+    fixed_keys = fixed_df[['type', 'category', 'amount', 'comment']].drop_duplicates()
+    matched = df.merge(fixed_keys, on=['type', 'category', 'amount', 'comment'],
+                       how='left', indicator=True)['_merge'].to_numpy() == 'both'
+    variable = df[~matched & (df['month'] < current_month)]
+
+    if variable.empty:
+        matrix = np.zeros((1, 1))
+    else:
+        pivot = variable.pivot_table(
+            index='month',
+            columns=variable['type'] + ': ' + variable['category'],
+            values='amount',
+            aggfunc='sum',
+            fill_value=0
+        )
+        full_range = pd.period_range(pivot.index.min(), current_month - 1, freq='M')
+        matrix = pivot.reindex(full_range, fill_value=0).to_numpy(dtype=float)
+
+    return {
+        'start_balance': start_balance,
+        'start_month': current_month,
+        'today': today,
+        'first_month_share': (current_month.days_in_month - today.day) / current_month.days_in_month,
+        'variable_matrix': matrix,
+        'fixed': fixed_df
+    }
+
+def fixed_monthly_flows(inputs, horizon):
+    """Sum the occurrences of fixed transactions in each of the horizon months
+
+    Occurrences up to today are already posted and in the starting balance.
+    """
+    months = pd.period_range(inputs['start_month'], periods=horizon, freq='M')
+    occurrences = expand_occurrences(
+        inputs['fixed'],
+        inputs['today'] + pd.Timedelta(days=1),
+        months[-1].end_time
+    )
+    if occurrences.empty:
+        return np.zeros(horizon)
+
+    occurrence_months = pd.to_datetime(occurrences['date']).dt.to_period('M')
+    flows = occurrences['amount'].groupby(occurrence_months).sum()
+    return flows.reindex(months, fill_value=0).to_numpy(dtype=float)
+
+def _simulate_chunk(variable_matrix, fixed_flow, start_balance, n_paths, seed, first_month_share=1.0):
+    """Simulate n_paths balance paths by bootstrapping each category's monthly history
+
+    Months are sampled one at a time, so besides the paths only an
+    n_paths × categories block of indices and values is held at once.
+    """
+    rng = np.random.default_rng(seed)
+    n_history, n_categories = variable_matrix.shape
+    horizon = len(fixed_flow)
+    columns = np.arange(n_categories, dtype=np.int32)
+
+    net = np.empty((n_paths, horizon))
+    for month in range(horizon):
+        sampled_months = rng.integers(0, n_history, size=(n_paths, n_categories), dtype=np.int32)
+        net[:, month] = variable_matrix[sampled_months, columns].sum(axis=1)
+    net[:, 0] *= first_month_share
+
+    return start_balance + np.cumsum(net + fixed_flow, axis=1)
+
+def simulate_balances(inputs, years, n_paths=5000, seed=None, workers=None):
+    """Run a Monte Carlo projection of the balance over the next years
+
+    Paths are split into one chunk per worker and simulated in parallel on the
+    shared process pool. Returns a frame indexed by month with one column per
+    percentile in PERCENTILES.
+    """
+    horizon = years * 12
+    fixed_flow = fixed_monthly_flows(inputs, horizon)
+    workers = workers or os.cpu_count() or 1
+
+    if n_paths < PARALLEL_MIN_PATHS:
+        workers = 1
+
+    chunk_sizes = [len(c) for c in np.array_split(np.arange(n_paths), workers) if len(c)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    arguments = [
+        (inputs['variable_matrix'], fixed_flow, inputs['start_balance'], size, chunk_seed,
+         inputs['first_month_share'])
+        for size, chunk_seed in zip(chunk_sizes, seeds)
+    ]
+
+    if len(arguments) == 1:
+        paths = _simulate_chunk(*arguments[0])
+    else:
+        futures = [_get_executor().submit(_simulate_chunk, *args) for args in arguments]
+        paths = np.vstack([future.result() for future in futures])
+
+    bands = np.percentile(paths, PERCENTILES, axis=0)
+    months = pd.period_range(inputs['start_month'], periods=horizon, freq='M').to_timestamp()
+
+    return pd.DataFrame(
+        bands.T,
+        index=months,
+        columns=[f'p{p}' for p in PERCENTILES]
+    )
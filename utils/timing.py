@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from database import core
+from database.errors import MoneyManagerError
+
+# general_settings key of the timing overlay, 'True' to show it
+DEVELOPER_MODE_SETTING = 'developer_mode'
+
+# Every run is appended to a rolling file next to the database as one JSON
+# line, whether or not the overlay is shown. Rotation isn't safe across
+# processes, so each server process writes a file of its own, and the files
+# of processes that are gone are removed
+TIMINGS_FILE_NAME = 'timings-{pid}.log'
+TIMINGS_FILE_BYTES = 1_000_000
+TIMINGS_FILE_BACKUPS = 5
+
+_export_logger = logging.getLogger('moneymanager.timings')
+_export_lock = threading.Lock()
+_export_pid = None
+
+# The run being timed; each run of a session's script has its own thread
+_current = threading.local()
+
+def _process_running(pid):
+    """Check whether a process is running; assumed so where that can't be checked safely"""
+    # os.kill terminates the process on Windows whatever the signal
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def remove_stale_timing_files(directory):
+    """Remove the timings files and their backups left by processes no longer running"""
+    prefix, suffix = TIMINGS_FILE_NAME.split('{pid}')
+    for path in Path(directory).glob(f"{prefix}*{suffix}*"):
+        pid = path.name[len(prefix):].split(suffix)[0]
+        if pid.isdigit() and int(pid) != os.getpid() and not _process_running(int(pid)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+def _get_export_logger():
+    """Get the logger writing this process's timings file, opening the file on first use
+
+    A forked process inherits the logger of its parent, it gets a file of
+    its own too.
+    """
+    global _export_pid
+    with _export_lock:
+        if _export_pid != os.getpid():
+            for handler in list(_export_logger.handlers):
+                _export_logger.removeHandler(handler)
+                handler.close()
+            _export_pid = os.getpid()
+
+        if not _export_logger.handlers:
+            path = Path(core.DB_PATH).parent / TIMINGS_FILE_NAME.format(pid=_export_pid)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            remove_stale_timing_files(path.parent)
+            handler = RotatingFileHandler(path, maxBytes=TIMINGS_FILE_BYTES, backupCount=TIMINGS_FILE_BACKUPS)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            _export_logger.addHandler(handler)
+            _export_logger.setLevel(logging.INFO)
+            _export_logger.propagate = False
+    return _export_logger
+
+def developer_mode_enabled():
+    """Check whether the timing overlay is switched on in the settings"""
+    try:
+        return core.get_setting(DEVELOPER_MODE_SETTING) == 'True'
+    except MoneyManagerError:
+        return False
+
+def start_page_timing(page):
+    """Start timing a run of a page, to be ended with finish_page_timing"""
+    _current.run = {
+        'page': page,
+        'start': time.perf_counter(),
+        'operations': core.get_operation_count(),
+        'sections': []
+    }
+
+@contextmanager
+def timed(section):
+    """Time a section of the running page with the data layer operations it made
+
+    Sections with the same name are added up. Outside a timed run, the
+    section just runs.
+    """
+    run = getattr(_current, 'run', None)
+    start, operations = time.perf_counter(), core.get_operation_count()
+    try:
+        yield
+    finally:
+        if run is not None:
+            run['sections'].append((
+                section,
+                (time.perf_counter() - start) * 1000,
+                core.get_operation_count() - operations
+            ))
+
+def summarize_sections(sections):
+    """Add up sections of the same name, in the order they first ran"""
+    summary = {}
+    for name, ms, operations in sections:
+        entry = summary.setdefault(name, {'section': name, 'ms': 0.0, 'db_operations': 0, 'calls': 0})
+        entry['ms'] += ms
+        entry['db_operations'] += operations
+        entry['calls'] += 1
+    return list(summary.values())
+
+def finish_page_timing(container=None):
+    """End the running page's timing, export it and show it in developer mode
+
+    The overlay goes to container, the sidebar by default. Returns the
+    recorded run, None when no run was started.
+    """
+    run = getattr(_current, 'run', None)
+    if run is None:
+        return None
+    _current.run = None
+
+    record = {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'page': run['page'],
+        'total_ms': round((time.perf_counter() - run['start']) * 1000, 1),
+        'db_operations': core.get_operation_count() - run['operations'],
+        'sections': [
+            {**entry, 'ms': round(entry['ms'], 1)} for entry in summarize_sections(run['sections'])
+        ]
+    }
+
+    try:
+        _get_export_logger().info(json.dumps(record))
+    except OSError:
+        # Timings are a diagnostic, they never break the page
+        pass
+
+    if developer_mode_enabled():
+        show_timings(record, container if container is not None else st.sidebar)
+    return record
+
+def show_timings(record, container):
+    """Show a run's sections with their wall time and data layer operations
+
+    An operation is one call into the data layer, which may run several
+    SQLite statements, or none when the in-memory backend is used.
+    """
+    sections = pd.DataFrame(record['sections'], columns=['section', 'ms', 'db_operations', 'calls'])
+    sections.columns = ['Section', 'ms', 'DB operations', 'Calls']
+    rest_ms = record['total_ms'] - sections['ms'].sum()
+
+    with container.expander(f"⏱️ {record['page']}: {record['total_ms']:,.0f} ms", expanded=True):
+        st.caption(
+            f"{record['db_operations']} DB operations in total, "
+            f"{rest_ms:,.0f} ms outside the timed sections"
+        )
+        st.dataframe(sections, hide_index=True, use_container_width=True)
+
+def timed_fragment(name):
+    """Time a fragment as a run of its own, named name, when it reruns alone
+
+    When the fragment runs as part of its page, its sections belong to the
+    page's run. When it reruns alone its overlay is shown at the end of the
+    fragment, the only place a fragment can draw. Goes under @st.fragment.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_current, 'run', None) is not None:
+                return func(*args, **kwargs)
+
+            start_page_timing(name)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                # Stopped or rerun, nothing worth reporting
+                _current.run = None
+                raise
+            finish_page_timing(container=st)
+            return result
+        return wrapper
+    return decorator
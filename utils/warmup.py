@@ -0,0 +1,62 @@
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from database import core
+
+logger = logging.getLogger(__name__)
+
+@contextmanager
+def _timed(step, timings):
+    """Record and log how long a warm-up step took"""
+    start = time.perf_counter()
+    yield
+    timings[step] = (time.perf_counter() - start) * 1000
+    logger.info("Warm-up: %s took %.0f ms", step, timings[step])
+
+def warm_up():
+    """Do the work of the first page loads before any session arrives
+
+    Runs the schema checks, journal pruning and recurring generation, loads the transactions
+    and computes the Home page quick stats and budget alerts and the yearly
+    aggregates of the latest year. Run in the server process before it
+    starts, the results stay in its Streamlit caches; run anywhere, they
+    fill the snapshot and shared cache other server processes read. Returns
+    the milliseconds each step took.
+    """
+    # Imported here, they load Streamlit and pandas
+    from utils.aggregates import compute_month_stats, compute_yearly_overview, compute_yearly_report
+    from utils.caching import load_transaction_years, load_transactions
+
+    timings = {}
+    start = time.perf_counter()
+
+    with _timed('schema checks', timings):
+        core.init_db()
+        core.init_settings_tables()
+
+    with _timed('change journal pruning', timings):
+        core.prune_change_journal()
+
+    with _timed('recurring transactions', timings):
+        core.generate_recurring_transactions()
+
+    data_version = core.get_data_version()
+    with _timed('transactions load', timings):
+        load_transactions(data_version)
+
+    now = datetime.now()
+    with _timed('quick stats and budget alerts', timings):
+        compute_month_stats(data_version, now.year, now.month)
+
+    # The analytics and reports pages open on the latest year
+    with _timed('yearly aggregates', timings):
+        years = load_transaction_years(data_version)
+        if years:
+            compute_yearly_overview(data_version, years[0])
+            compute_yearly_report(data_version, years[0])
+
+    timings['total'] = (time.perf_counter() - start) * 1000
+    logger.info("Warm-up: done in %.0f ms", timings['total'])
+    return timings